@@ -0,0 +1,47 @@
+import hashlib
+from datetime import date
+import pydantic_core
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+class ModelResponse(Response):
+    """
+    JSON response for an already validated Pydantic model.
+
+    Returning a Response from a route makes FastAPI skip its own ``response_model``
+    validation and serialization, so the model built by the route is validated once
+    and encoded straight to bytes by pydantic-core. ``response_model`` is still
+    declared on the routes for the OpenAPI schema.
+    """
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+def make_etag(request: Request, version: int) -> str:
+    """
+    Weak ETag for a GET response: the data version plus a digest of the path, the
+    normalised query and the current day (availability answers change at midnight
+    even when the data does not). Read the version before loading the data it
+    describes: a concurrent write can then only make the tag older than the body,
+    which costs a refetch, never a stale 304.
+    """
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    key = f"{request.url.path}?{query}|{date.today().isoformat()}"
+    return f'W/"{version}-{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match matches the ETag (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
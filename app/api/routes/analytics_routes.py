@@ -0,0 +1,65 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from app.core.logger.setup_logger import logger
+from app.api.responses import ModelResponse, is_not_modified, make_etag, not_modified
+from app.core.dependencies import get_async_booking_use_cases
+from app.core.exceptions import InvalidDateRangeError
+from app.core.models.analytics_model import OccupancyResponse
+from app.core.models.response_models import ErrorResponse
+from app.core.use_cases.booking_use_cases import AsyncBookingUseCases
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/occupancy", response_model=OccupancyResponse)
+async def get_occupancy(
+    request: Request,
+    bookings_use_cases: AsyncBookingUseCases = Depends(get_async_booking_use_cases),
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    peaks: int = Query(5, ge=1, le=31)
+):
+    """
+    Fleet occupancy report: the share of days each car is booked, the share of the
+    fleet booked on each day and the busiest days of a date window
+    """
+    try:
+        logger.info("API request: Occupancy report from %s to %s", start_date, end_date)
+        etag = make_etag(request, await bookings_use_cases.data_version())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        report = await bookings_use_cases.occupancy_report(start_date, end_date, peaks)
+        response = OccupancyResponse(
+            status="success",
+            data=report,
+            message=f"Occupancy of {report['car_count']} cars over {report['days']} days"
+        )
+        logger.info(
+            "API response: Occupancy report from %s to %s, fleet utilization %s",
+            start_date, end_date, report["fleet_utilization"]
+        )
+        return ModelResponse(response, headers={"ETag": etag})
+    except InvalidDateRangeError as e:
+        logger.error("Invalid date range error: %s", e)
+        error_response = ErrorResponse(
+            error_code="INVALID_DATE_RANGE",
+            message=str(e),
+            status_code=400,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code,
+            detail=error_response.model_dump()
+        )
+    except Exception as e:
+        logger.error("Unexpected error in get_occupancy: %s", e)
+        error_response = ErrorResponse(
+            error_code="INTERNAL_SERVER_ERROR",
+            message="Internal server error",
+            status_code=500,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code,
+            detail=error_response.model_dump()
+        )
@@ -1,27 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from app.core.logger.setup_logger import logger
-from app.core.dependencies import get_booking_use_cases
-from app.core.models.booking_model import BookingRequest, ListBookingsResponse, BookingResponse
-from app.core.exceptions import CarNotAvailableError, InvalidDateRangeError
-from app.core.use_cases.booking_use_cases import BookingUseCases
+from app.api.responses import ModelResponse, is_not_modified, make_etag, not_modified
+from app.core.dependencies import get_async_booking_use_cases
+from app.core.models.booking_model import (
+    BookingConflictResponse,
+    BookingRequest,
+    ListBookingsResponse,
+    BookingResponse,
+    BatchBookingRequest,
+    BatchBookingResponse,
+)
+from app.core.exceptions import (
+    BookingConflictError,
+    CarNotAvailableError,
+    InvalidCursorError,
+    InvalidDateRangeError,
+    RecordNotFoundError,
+)
+from app.core.models.pagination import BookingFilters, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.use_cases.booking_use_cases import AsyncBookingUseCases
 from app.core.models.response_models import ErrorResponse
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
 @router.get("/", response_model=ListBookingsResponse)
-def get_bookings(bookings_use_cases: BookingUseCases = Depends(get_booking_use_cases)):
-    """Get all bookings in the system."""
+async def get_bookings(
+    request: Request,
+    bookings_use_cases: AsyncBookingUseCases = Depends(get_async_booking_use_cases),
+    car_id: Optional[UUID] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    archived: bool = Query(False)
+):
+    """Get one page of active or archived bookings, optionally for one car and overlapping a date window."""
     try:
-        logger.info("API request: Get all bookings")
-        bookings = bookings_use_cases.get_all_bookings()
-        logger.info(f"API response: Retrieved {len(bookings)} bookings")
+        logger.info("API request: Get bookings (limit=%s, after=%s)", limit, after)
+        etag = make_etag(request, await bookings_use_cases.data_version())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        filters = BookingFilters(car_id=car_id, start_date=start_date, end_date=end_date)
+        page = await bookings_use_cases.list_bookings(filters, after, limit, archived)
+        bookings = page.items
+        logger.info("API response: Retrieved %s bookings", len(bookings))
         response = ListBookingsResponse(
             status="success",
             data=bookings,
             message=f"Retrieved {len(bookings)} bookings successfully",
-            total_count=len(bookings)
+            total_count=len(bookings),
+            next_cursor=page.next_cursor
+        )
+        return ModelResponse(response, headers={"ETag": etag})
+    except (InvalidCursorError, InvalidDateRangeError) as e:
+        logger.error("Invalid bookings query: %s", e)
+        error_code = "INVALID_CURSOR" if isinstance(e, InvalidCursorError) else "INVALID_DATE_RANGE"
+        error_response = ErrorResponse(
+            error_code=error_code,
+            message=str(e),
+            status_code=400,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
         )
-        return response
     except Exception as e:
         err_msg = f"Unexpected error in get_bookings: {e}"
         logger.error(err_msg)
@@ -37,25 +84,112 @@ def get_bookings(bookings_use_cases: BookingUseCases = Depends(get_booking_use_c
         )
 
 
+@router.get("/export")
+async def export_bookings(
+    bookings_use_cases: AsyncBookingUseCases = Depends(get_async_booking_use_cases),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    archived: bool = Query(False)
+):
+    """Stream every active or archived booking, optionally overlapping a date window, as NDJSON."""
+    try:
+        logger.info("API request: Export bookings from %s to %s", start_date, end_date)
+        filters = BookingFilters(start_date=start_date, end_date=end_date)
+        lines = bookings_use_cases.export_bookings(filters, archived=archived)
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+    except InvalidDateRangeError as e:
+        logger.error("Invalid date range error: %s", e)
+        error_response = ErrorResponse(
+            error_code="INVALID_DATE_RANGE",
+            message=str(e),
+            status_code=400,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
+
+
+# Declared after /export, which would otherwise be taken for a booking id.
+@router.get("/{booking_id}", response_model=BookingResponse)
+async def get_booking(
+    booking_id: UUID,
+    request: Request,
+    bookings_use_cases: AsyncBookingUseCases = Depends(get_async_booking_use_cases)
+):
+    """Get one booking, active or archived, by id."""
+    try:
+        logger.info("API request: Get booking %s", booking_id)
+        etag = make_etag(request, await bookings_use_cases.data_version())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        booking = await bookings_use_cases.get_booking(booking_id)
+        response = BookingResponse(
+            status="success",
+            data=booking,
+            message="Booking retrieved successfully"
+        )
+        return ModelResponse(response, headers={"ETag": etag})
+    except RecordNotFoundError as e:
+        logger.warning("Booking not found: %s", e)
+        error_response = ErrorResponse(
+            error_code="BOOKING_NOT_FOUND",
+            message=str(e),
+            status_code=404,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
+    except Exception as e:
+        err_msg = f"Unexpected error in get_booking: {e}"
+        logger.error(err_msg)
+        error_response = ErrorResponse(
+            error_code="INTERNAL_SERVER_ERROR",
+            message=err_msg,
+            status_code=500,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
+
+
 @router.post("/", response_model=BookingResponse)
-def create_booking(
+async def create_booking(
     booking_req: BookingRequest,
-    booking_use_cases: BookingUseCases = Depends(get_booking_use_cases)
+    booking_use_cases: AsyncBookingUseCases = Depends(get_async_booking_use_cases)
 ):
     """Create a new booking."""
     try:
         logger.info("API request: Create booking")
-        booking = booking_use_cases.create_booking(booking_req)
-        logger.info(f"API response: Created booking {booking['id']}")
+        booking = await booking_use_cases.create_booking(booking_req)
+        logger.info("API response: Created booking %s", booking['id'])
 
         response = BookingResponse(
             status="success",
             data=booking,
             message="Booking created successfully"
         )
-        return response
+        return ModelResponse(response)
+    except BookingConflictError as e:
+        logger.error("Booking creation failed: %s", e)
+
+        err_msg = f"Booking creation failed: {e}"
+
+        error_response = BookingConflictResponse(
+            error_code="BOOKING_CREATION_FAILED",
+            message=err_msg,
+            status_code=400,
+            status="failed",
+            alternatives=e.alternatives
+        )
+        raise HTTPException(status_code=400, detail=error_response.model_dump(mode="json"))
     except (CarNotAvailableError, InvalidDateRangeError) as e:
-        logger.error(f"Booking creation failed: {e}")
+        logger.error("Booking creation failed: %s", e)
 
         err_msg = f"Booking creation failed: {e}"
 
@@ -67,7 +201,7 @@ def create_booking(
         )
         raise HTTPException(status_code=400, detail=error_response.model_dump())
     except Exception as e:
-        logger.error(f"Unexpected error in create_booking: {e}")
+        logger.error("Unexpected error in create_booking: %s", e)
 
         err_msg = f"Unexpected error in create_booking: {e}"
 
@@ -77,4 +211,39 @@ def create_booking(
             status_code=500,
             status="failed"
         )
-        raise HTTPException(status_code=500, detail=error_response.model_dump())
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=error_response.model_dump())
+
+
+@router.post("/batch", response_model=BatchBookingResponse)
+async def create_bookings_batch(
+    batch_req: BatchBookingRequest,
+    booking_use_cases: AsyncBookingUseCases = Depends(get_async_booking_use_cases)
+):
+    """Create several bookings at once, reporting the outcome of each one."""
+    try:
+        logger.info("API request: Create batch of %s bookings", len(batch_req.bookings))
+        results = await booking_use_cases.create_bookings(batch_req.bookings)
+        created_count = sum(1 for result in results if result["status"] == "created")
+        failed_count = len(results) - created_count
+        logger.info("API response: Batch created %s bookings, %s failed", created_count, failed_count)
+
+        response = BatchBookingResponse(
+            status="success",
+            data=results,
+            message=f"Created {created_count} of {len(results)} bookings",
+            created_count=created_count,
+            failed_count=failed_count
+        )
+        return ModelResponse(response)
+    except Exception as e:
+        logger.error("Unexpected error in create_bookings_batch: %s", e)
+
+        err_msg = f"Unexpected error in create_bookings_batch: {e}"
+
+        error_response = ErrorResponse(
+            error_code="INTERNAL_SERVER_ERROR",
+            message=err_msg,
+            status_code=500,
+            status="failed"
+        )
+        raise HTTPException(status_code=500, detail=error_response.model_dump())
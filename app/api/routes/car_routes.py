@@ -1,33 +1,71 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
-from app.core.dependencies import get_car_use_cases
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from app.core.dependencies import get_async_car_use_cases
 from app.core.logger.setup_logger import logger
+from app.api.responses import ModelResponse, is_not_modified, make_etag, not_modified
 from datetime import date
-from app.core.exceptions import InvalidDateRangeError
+from typing import Optional
+from uuid import UUID
+from app.core.exceptions import InvalidCursorError, InvalidDateRangeError, RecordNotFoundError
 from app.core.models.response_models import ErrorResponse
-from app.core.use_cases.car_use_cases import CarUseCases
-from app.core.models.car_model import CarsListResponse, AvailableCarsResponse
+from app.core.use_cases.car_use_cases import AsyncCarUseCases, MAX_CALENDAR_DAYS
+from app.core.models.car_model import (
+    AvailabilityCalendarResponse,
+    AvailableCarsResponse,
+    CarCalendarResponse,
+    CarResponse,
+    CarsListResponse,
+    CarStatus,
+)
+from app.core.models.pagination import CarFilters, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/cars", tags=["cars"])
 
 @router.get("/", response_model=CarsListResponse)
-def get_all_cars(car_use_case: CarUseCases = Depends(get_car_use_cases)):
+async def get_all_cars(
+    request: Request,
+    car_use_case: AsyncCarUseCases = Depends(get_async_car_use_cases),
+    brand: Optional[str] = Query(None),
+    model: Optional[str] = Query(None),
+    year: Optional[int] = Query(None),
+    status: CarStatus = Query(CarStatus.AVAILABLE),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None)
+):
     """
-    Get all cars
+    Get one page of cars, optionally filtered by brand, model, year and status
     """
-    logger.info("API request: Get all cars")
+    logger.info("API request: Get cars (status=%s, limit=%s, after=%s)", status.value, limit, after)
 
     try:
-        cars = car_use_case.get_all_cars()
-        logger.info(f"API response: Retrieved {len(cars)} cars")        
+        etag = make_etag(request, await car_use_case.data_version())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        filters = CarFilters(brand=brand, model=model, year=year, status=status)
+        page = await car_use_case.list_cars(filters, after, limit)
+        cars = page.items
+        logger.info("API response: Retrieved %s cars", len(cars))        
         response = CarsListResponse(
             status="success",
             data=cars,
             message=f"Retrieved {len(cars)} cars successfully",
-            total_count=len(cars)
+            total_count=len(cars),
+            next_cursor=page.next_cursor
+        )
+        return ModelResponse(response, headers={"ETag": etag})
+    except InvalidCursorError as e:
+        logger.error("Invalid cursor error: %s", e)
+        error_response = ErrorResponse(
+            error_code="INVALID_CURSOR",
+            message=str(e),
+            status_code=400,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
         )
-        return response
     except Exception as e:
-        logger.error(f"Unexpected error in get_all_cars: {e}")
+        logger.error("Unexpected error in get_all_cars: %s", e)
         error_response = ErrorResponse(
             error_code="CARS_RETRIEVAL_ERROR",
             message="Error retrieving cars",
@@ -41,8 +79,9 @@ def get_all_cars(car_use_case: CarUseCases = Depends(get_car_use_cases)):
 
 
 @router.get("/available", response_model=AvailableCarsResponse)
-def list_available_cars(
-    car_use_case: CarUseCases = Depends(get_car_use_cases), 
+async def list_available_cars(
+    request: Request,
+    car_use_case: AsyncCarUseCases = Depends(get_async_car_use_cases), 
     target_date: date = Query(...)
 ):
     """
@@ -50,8 +89,11 @@ def list_available_cars(
     """
 
     try:
-        logger.info(f"API request: List available cars for date: {target_date}")
-        available_cars = car_use_case.get_available_cars(target_date)
+        logger.info("API request: List available cars for date: %s", target_date)
+        etag = make_etag(request, await car_use_case.data_version())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        available_cars = await car_use_case.get_available_cars(target_date)
         response = AvailableCarsResponse(
             status="success",
             data=available_cars,
@@ -59,10 +101,121 @@ def list_available_cars(
             total_count=len(available_cars)
         )
 
-        logger.info(f"API response: Retrieved {len(available_cars)} available cars for {target_date}")
-        return response
+        logger.info("API response: Retrieved %s available cars for %s", len(available_cars), target_date)
+        return ModelResponse(response, headers={"ETag": etag})
+    except InvalidDateRangeError as e:
+        logger.error("Invalid date range error: %s", e)
+        error_response = ErrorResponse(
+            error_code="INVALID_DATE_RANGE",
+            message=str(e),
+            status_code=400,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
+    except Exception as e:
+        logger.error("Unexpected error in list_available_cars: %s", e)
+        error_response = ErrorResponse(
+            error_code="INTERNAL_SERVER_ERROR",
+            message="Internal server error",
+            status_code=500,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
+
+@router.get("/available/range", response_model=AvailableCarsResponse)
+async def list_available_cars_for_range(
+    request: Request,
+    car_use_case: AsyncCarUseCases = Depends(get_async_car_use_cases),
+    start_date: date = Query(...),
+    end_date: date = Query(...)
+):
+    """
+    List cars available for every day of a date range
+    """
+
+    try:
+        logger.info("API request: List available cars from %s to %s", start_date, end_date)
+        etag = make_etag(request, await car_use_case.data_version())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        available_cars = await car_use_case.get_available_cars_for_range(start_date, end_date)
+        response = AvailableCarsResponse(
+            status="success",
+            data=available_cars,
+            message=f"Retrieved {len(available_cars)} available cars from {start_date} to {end_date}",
+            total_count=len(available_cars)
+        )
+
+        logger.info(
+            "API response: Retrieved %s available cars from %s to %s",
+            len(available_cars), start_date, end_date
+        )
+        return ModelResponse(response, headers={"ETag": etag})
+    except InvalidDateRangeError as e:
+        logger.error("Invalid date range error: %s", e)
+        error_response = ErrorResponse(
+            error_code="INVALID_DATE_RANGE",
+            message=str(e),
+            status_code=400,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
+    except Exception as e:
+        logger.error("Unexpected error in list_available_cars_for_range: %s", e)
+        error_response = ErrorResponse(
+            error_code="INTERNAL_SERVER_ERROR",
+            message="Internal server error",
+            status_code=500,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
+
+
+@router.get("/available/calendar", response_model=AvailabilityCalendarResponse)
+async def get_availability_calendar(
+    request: Request,
+    car_use_case: AsyncCarUseCases = Depends(get_async_car_use_cases),
+    start_date: date = Query(...),
+    end_date: date = Query(...)
+):
+    """
+    Free days of every bookable car over a date window, one character per day
+    """
+
+    try:
+        logger.info("API request: Availability calendar from %s to %s", start_date, end_date)
+        etag = make_etag(request, await car_use_case.data_version())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        calendar = await car_use_case.get_availability_calendar(start_date, end_date)
+        response = AvailabilityCalendarResponse(
+            status="success",
+            data=calendar,
+            message=f"Retrieved availability of {len(calendar)} cars from {start_date} to {end_date}",
+            start_date=start_date,
+            end_date=end_date,
+            total_count=len(calendar)
+        )
+
+        logger.info(
+            "API response: Retrieved availability of %s cars from %s to %s",
+            len(calendar), start_date, end_date
+        )
+        return ModelResponse(response, headers={"ETag": etag})
     except InvalidDateRangeError as e:
-        logger.error(f"Invalid date range error: {e}")
+        logger.error("Invalid date range error: %s", e)
         error_response = ErrorResponse(
             error_code="INVALID_DATE_RANGE",
             message=str(e),
@@ -74,7 +227,7 @@ def list_available_cars(
             detail=error_response.model_dump()
         )
     except Exception as e:
-        logger.error(f"Unexpected error in list_available_cars: {e}")
+        logger.error("Unexpected error in get_availability_calendar: %s", e)
         error_response = ErrorResponse(
             error_code="INTERNAL_SERVER_ERROR",
             message="Internal server error",
@@ -84,4 +237,117 @@ def list_available_cars(
         raise HTTPException(
             status_code=error_response.status_code, 
             detail=error_response.model_dump()
-        )
\ No newline at end of file
+        )
+
+
+# Declared after the static /available paths, which would otherwise be taken for a car id.
+@router.get("/{car_id}", response_model=CarResponse)
+async def get_car(
+    car_id: UUID,
+    request: Request,
+    car_use_case: AsyncCarUseCases = Depends(get_async_car_use_cases)
+):
+    """
+    Get one car by id, whatever its status
+    """
+
+    try:
+        logger.info("API request: Get car %s", car_id)
+        etag = make_etag(request, await car_use_case.data_version())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        car = await car_use_case.get_car(car_id)
+        response = CarResponse(
+            status="success",
+            data=car,
+            message="Car retrieved successfully"
+        )
+        return ModelResponse(response, headers={"ETag": etag})
+    except RecordNotFoundError as e:
+        logger.warning("Car not found: %s", e)
+        error_response = ErrorResponse(
+            error_code="CAR_NOT_FOUND",
+            message=str(e),
+            status_code=404,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
+    except Exception as e:
+        logger.error("Unexpected error in get_car: %s", e)
+        error_response = ErrorResponse(
+            error_code="INTERNAL_SERVER_ERROR",
+            message="Internal server error",
+            status_code=500,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
+
+
+@router.get("/{car_id}/calendar", response_model=CarCalendarResponse)
+async def get_car_calendar(
+    car_id: UUID,
+    request: Request,
+    car_use_case: AsyncCarUseCases = Depends(get_async_car_use_cases),
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    free_for: Optional[int] = Query(None, ge=1, le=MAX_CALENDAR_DAYS)
+):
+    """
+    Booked and free stretches of one car over a date window, and optionally the
+    first run of `free_for` free days from the start of the window
+    """
+
+    try:
+        logger.info("API request: Calendar of car %s from %s to %s", car_id, start_date, end_date)
+        etag = make_etag(request, await car_use_case.data_version())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        calendar = await car_use_case.get_car_calendar(car_id, start_date, end_date, free_for)
+        response = CarCalendarResponse(
+            status="success",
+            data=calendar,
+            message=f"Retrieved calendar of car {car_id} from {start_date} to {end_date}"
+        )
+        return ModelResponse(response, headers={"ETag": etag})
+    except InvalidDateRangeError as e:
+        logger.error("Invalid date range error: %s", e)
+        error_response = ErrorResponse(
+            error_code="INVALID_DATE_RANGE",
+            message=str(e),
+            status_code=400,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
+    except RecordNotFoundError as e:
+        logger.warning("Car not found: %s", e)
+        error_response = ErrorResponse(
+            error_code="CAR_NOT_FOUND",
+            message=str(e),
+            status_code=404,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
+    except Exception as e:
+        logger.error("Unexpected error in get_car_calendar: %s", e)
+        error_response = ErrorResponse(
+            error_code="INTERNAL_SERVER_ERROR",
+            message="Internal server error",
+            status_code=500,
+            status="failed"
+        )
+        raise HTTPException(
+            status_code=error_response.status_code, 
+            detail=error_response.model_dump()
+        )
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.core.dependencies import AppContainer, get_container
+from app.core.metrics import AVAILABILITY_CACHE, REGISTRY
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(container: AppContainer = Depends(get_container)):
+    """Metrics of this worker process in the Prometheus text format."""
+    cache = container.availability_cache
+    if cache is not None:
+        for stat, value in cache.stats().items():
+            AVAILABILITY_CACHE.set(stat, value=value)
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
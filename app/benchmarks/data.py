@@ -0,0 +1,92 @@
+"""Synthetic fleets and booking histories written straight into a storage backend."""
+import json
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+from uuid import UUID
+from app.core.models.car_model import CarStatus
+from app.infra.sharded_db import ShardedJSONDatabase
+from app.infra.sqlite_db import SQLiteDatabase, INSERT_BOOKING, INSERT_CAR
+
+MODELS = [
+    ("Toyota", "Supra", "2JZ-GTE"),
+    ("Nissan", "Skyline", "RB26DETT"),
+    ("Mazda", "RX-7", "13B-REW"),
+    ("Honda", "NSX", "C30A"),
+    ("BMW", "M3", "S54"),
+    ("Porsche", "911", "M96"),
+]
+
+# Days between the starts of consecutive bookings of one car; bookings last 1-3 days.
+BOOKING_STRIDE = 4
+
+
+def generate_cars(count: int, rng: random.Random) -> List[Dict]:
+    """Cars with random attributes; about 5% of them are in maintenance."""
+    cars = []
+    for _ in range(count):
+        brand, model, engine = rng.choice(MODELS)
+        cars.append({
+            "id": str(UUID(int=rng.getrandbits(128), version=4)),
+            "brand": brand,
+            "model": model,
+            "engine": engine,
+            "version": rng.choice(["Base", "Sport", "Touring"]),
+            "year": str(rng.randint(1990, 2024)),
+            "status": (CarStatus.MAINTENANCE if rng.random() < 0.05 else CarStatus.AVAILABLE).value,
+        })
+    return cars
+
+
+def generate_bookings(cars: List[Dict], count: int, rng: random.Random) -> List[Dict]:
+    """
+    Non-overlapping bookings spread round-robin over the cars. Each car's history is
+    centred on today, so half of it lies in the past and half in the future.
+    """
+    bookings = []
+    per_car = -(-count // max(len(cars), 1))
+    first_day = date.today() - timedelta(days=per_car * BOOKING_STRIDE // 2)
+    created_at = datetime(2024, 1, 1).isoformat()
+    for i in range(count):
+        car = cars[i % len(cars)]
+        start = first_day + timedelta(days=(i // len(cars)) * BOOKING_STRIDE)
+        bookings.append({
+            "id": str(UUID(int=rng.getrandbits(128), version=4)),
+            "car_id": car["id"],
+            "customer_name": f"Customer {i}",
+            "customer_email": f"customer{i}@example.com",
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=rng.randint(0, 2))).isoformat(),
+            "created_at": created_at,
+        })
+    return bookings
+
+
+def booking_horizon(cars: int, bookings: int) -> Tuple[date, date]:
+    """First and last day covered by generate_bookings for these sizes."""
+    per_car = -(-bookings // max(cars, 1))
+    first_day = date.today() - timedelta(days=per_car * BOOKING_STRIDE // 2)
+    return first_day, first_day + timedelta(days=per_car * BOOKING_STRIDE)
+
+
+def write_dataset(backend: str, directory: Path, cars: List[Dict], bookings: List[Dict]) -> None:
+    """Write the dataset where build_container will find it for the given backend."""
+    if backend in ("json", "journal"):
+        with open(directory / "db.json", "w") as file:
+            json.dump({"cars": cars, "bookings": bookings}, file)
+    elif backend == "sharded":
+        (directory / "db").mkdir()
+        with open(directory / "db" / "cars.json", "w") as file:
+            json.dump({"cars": cars, "bookings": []}, file)
+        ShardedJSONDatabase(str(directory / "db.json")).add_bookings(bookings)
+    elif backend == "sqlite":
+        db = SQLiteDatabase(str(directory / "db.sqlite3"), pool_size=1, seed=False)
+        try:
+            with db.transaction() as conn:
+                conn.executemany(INSERT_CAR, cars)
+                conn.executemany(INSERT_BOOKING, bookings)
+        finally:
+            db.close()
+    else:
+        raise ValueError(f"Unsupported storage backend: {backend}")
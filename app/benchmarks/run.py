@@ -0,0 +1,221 @@
+"""
+Benchmark the car and booking endpoints against synthetic data.
+
+Usage:
+    python -m app.benchmarks.run --backend json sqlite --cars 1000 --bookings 100000 --requests 500
+    python -m app.benchmarks.run --backend sqlite --cars 100000 --bookings 1000000 --compare old.json
+
+Each backend gets a fresh temporary store filled with generated cars and bookings. The
+endpoints are driven in-process through the ASGI app and the results (throughput and
+p50/p95/p99 latency per scenario) are printed and saved as JSON. Passing an earlier
+result file with --compare prints the change against it.
+"""
+import os
+
+# Benchmarks measure the request path, not log volume; set before the app is imported.
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from fastapi.testclient import TestClient
+from app.benchmarks.data import booking_horizon, generate_bookings, generate_cars, write_dataset
+from app.core.config import Settings
+from app.core.dependencies import build_container
+from app.core.models.booking_model import BookingRequest
+from app.core.models.car_model import CarStatus
+from app.main import app
+
+BACKENDS = ("json", "journal", "sharded", "sqlite")
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Throughput and latency percentiles, in milliseconds, of one scenario."""
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "requests": len(latencies),
+        "throughput_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+    }
+
+
+def measure(requests: int, call: Callable[[int], None]) -> Dict[str, float]:
+    latencies = []
+    started = time.perf_counter()
+    for i in range(requests):
+        start = time.perf_counter()
+        call(i)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def expect(response, status_code: int = 200):
+    if response.status_code != status_code:
+        raise RuntimeError(f"{response.request.method} {response.request.url} returned {response.status_code}")
+    return response
+
+
+def run_backend(backend: str, cars: int, bookings: int, requests: int, seed: int) -> Dict:
+    """Generate a dataset for one backend and run every scenario against it."""
+    rng = random.Random(seed)
+    fleet = generate_cars(cars, rng)
+    history = generate_bookings(fleet, bookings, rng)
+    bookable = [car["id"] for car in fleet if car["status"] != CarStatus.MAINTENANCE.value]
+    _, last_day = booking_horizon(cars, bookings)
+    today = date.today()
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        write_dataset(backend, Path(directory), fleet, history)
+        container = build_container(Settings(
+            storage_backend=backend,
+            db_path=str(Path(directory) / "db.json"),
+            sqlite_path=str(Path(directory) / "db.sqlite3"),
+        ))
+        previous_container = getattr(app.state, "container", None)
+        app.state.container = container
+        try:
+            client = TestClient(app)
+            # The first read loads and indexes the store; it is reported separately.
+            expect(client.get("/cars/?limit=1"))
+            load_seconds = time.perf_counter() - started
+
+            def new_booking(i: int, offset: int) -> Dict:
+                day = last_day + timedelta(days=offset + i)
+                return {
+                    "car_id": bookable[i % len(bookable)],
+                    "customer_name": "Benchmark",
+                    "customer_email": "benchmark@example.com",
+                    "start_date": day.isoformat(),
+                    "end_date": day.isoformat(),
+                }
+
+            scenarios = {
+                "GET /cars/available": lambda i: expect(client.get(
+                    f"/cars/available?target_date={(today + timedelta(days=rng.randrange(60))).isoformat()}"
+                )),
+                "GET /cars/available/range": lambda i: expect(client.get(
+                    f"/cars/available/range?start_date={(today + timedelta(days=i % 60)).isoformat()}"
+                    f"&end_date={(today + timedelta(days=i % 60 + 6)).isoformat()}"
+                )),
+                "GET /cars/available/calendar": lambda i: expect(client.get(
+                    f"/cars/available/calendar?start_date={(today + timedelta(days=i % 60)).isoformat()}"
+                    f"&end_date={(today + timedelta(days=i % 60 + 29)).isoformat()}"
+                )),
+                "GET /bookings/": lambda i: expect(client.get("/bookings/?limit=100")),
+                "GET /bookings/?car_id": lambda i: expect(client.get(
+                    f"/bookings/?car_id={rng.choice(fleet)['id']}&limit=100"
+                )),
+                "GET /analytics/occupancy": lambda i: expect(client.get(
+                    f"/analytics/occupancy?start_date={(today + timedelta(days=i % 60)).isoformat()}"
+                    f"&end_date={(today + timedelta(days=i % 60 + 29)).isoformat()}"
+                )),
+                "POST /bookings/": lambda i: expect(client.post("/bookings/", json=new_booking(i, 10))),
+                "create_booking": lambda i: container.booking_use_cases.create_booking(
+                    BookingRequest(**new_booking(i, 10 + requests + 10))
+                ),
+            }
+            results = {name: measure(requests, call) for name, call in scenarios.items()}
+        finally:
+            app.state.container = previous_container
+            close = getattr(container.db, "close", None)
+            if close is not None:
+                close()
+
+    return {
+        "backend": backend,
+        "cars": cars,
+        "bookings": bookings,
+        "load_seconds": round(load_seconds, 3),
+        "scenarios": results,
+    }
+
+
+def compare(current: List[Dict], previous: List[Dict]) -> List[str]:
+    """Lines describing the change of each metric against an earlier result file."""
+    lines = []
+    earlier = {(run["backend"], run["cars"], run["bookings"]): run for run in previous}
+    for run in current:
+        old_run = earlier.get((run["backend"], run["cars"], run["bookings"]))
+        if old_run is None:
+            lines.append(f"{run['backend']}: no earlier run with {run['cars']} cars / {run['bookings']} bookings")
+            continue
+        for name, stats in run["scenarios"].items():
+            old = old_run["scenarios"].get(name)
+            if not old:
+                continue
+            changes = ", ".join(
+                f"{metric} {_change(old[metric], stats[metric])}"
+                for metric in ("throughput_per_s", "p50_ms", "p95_ms", "p99_ms")
+            )
+            lines.append(f"{run['backend']:8} {name:28} {changes}")
+    return lines
+
+
+def _change(old: float, new: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def report(runs: List[Dict]) -> List[str]:
+    lines = [f"{'backend':8} {'scenario':28} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+    for run in runs:
+        lines.append(
+            f"{run['backend']}: {run['cars']} cars, {run['bookings']} bookings, "
+            f"loaded in {run['load_seconds']}s"
+        )
+        for name, stats in run["scenarios"].items():
+            lines.append(
+                f"{run['backend']:8} {name:28} {stats['throughput_per_s']:>10} "
+                f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}"
+            )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark the car rental API against synthetic data")
+    parser.add_argument("--backend", nargs="+", choices=BACKENDS, default=["json"])
+    parser.add_argument("--cars", type=int, default=1000)
+    parser.add_argument("--bookings", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    runs = [run_backend(backend, args.cars, args.bookings, args.requests, args.seed) for backend in args.backend]
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "runs": runs,
+    }
+
+    output = Path(args.output or f"benchmarks/results/{datetime.now():%Y%m%d-%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+
+    print("\n".join(report(runs)))
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text())
+        print(f"\nChange against {args.compare}:")
+        print("\n".join(compare(runs, previous["runs"])))
+    print(f"\nResults saved to {output}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
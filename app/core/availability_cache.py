@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class _Entry:
+    cars: List[Dict]
+    car_ids: FrozenSet[str]
+
+
+@dataclass(frozen=True)
+class BookedCar:
+    """A car just booked through this process, as needed to invalidate cached availability."""
+    car_id: str
+    start_date: date
+    end_date: date
+    status_changed: bool
+
+
+class AvailabilityCache:
+    """Bounded LRU cache of available-car lists keyed by (start_date, end_date), valid for one data version."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[date, date], _Entry]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self._writers = 0
+        self._overlapped = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, start_date: date, end_date: date, version: int) -> Optional[List[Dict]]:
+        with self._lock:
+            if version != self._version:
+                self._reset(version)
+            entry = self._entries.get((start_date, end_date))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((start_date, end_date))
+            self.hits += 1
+            return list(entry.cars)
+
+    def put(self, start_date: date, end_date: date, version: int, cars: List[Dict]) -> None:
+        """Store a result computed at `version`; results of an outdated version are dropped."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[(start_date, end_date)] = _Entry(
+                list(cars), frozenset(str(car["id"]) for car in cars)
+            )
+            self._entries.move_to_end((start_date, end_date))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def begin_write(self) -> None:
+        """Note a write starting in this process, to be ended by record_bookings or abort_write."""
+        with self._lock:
+            self._writers += 1
+            if self._writers > 1:
+                self._overlapped = True
+
+    def abort_write(self) -> None:
+        """End a write that failed part way: what it changed is unknown, so start over."""
+        with self._lock:
+            self._end_write()
+            self._reset(None)
+
+    def record_bookings(self, booked: Iterable[BookedCar], version_before: int, version_after: int) -> None:
+        """Drop the entries affected by bookings written between the two data versions."""
+        booked = list(booked)
+        with self._lock:
+            overlapped = self._overlapped
+            self._end_write()
+            if overlapped or self._version != version_before:
+                self._reset(None)
+                return
+            stale = [
+                key for key, entry in self._entries.items()
+                if any(_affects(car, key, entry) for car in booked)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            self._version = version_after
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
+
+    def _end_write(self) -> None:
+        self._writers = max(self._writers - 1, 0)
+        if self._writers == 0:
+            self._overlapped = False
+
+    def _reset(self, version: Optional[int]) -> None:
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._version = version
+
+
+def _affects(car: BookedCar, key: Tuple[date, date], entry: _Entry) -> bool:
+    if car.car_id not in entry.car_ids:
+        return False
+    start_date, end_date = key
+    overlaps = not (car.end_date < start_date or car.start_date > end_date)
+    return overlaps or car.status_changed
@@ -0,0 +1,55 @@
+from typing import Iterable, List, Tuple
+
+# (first day, last day) of a stretch of days, both included, as date ordinals.
+Span = Tuple[int, int]
+
+
+def merge_spans(spans: Iterable[Span]) -> List[Span]:
+    """Sorted, disjoint spans covering the same days; overlapping or adjacent spans are joined."""
+    merged: List[Span] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def clip_spans(spans: List[Span], first_day: int, last_day: int) -> List[Span]:
+    """The parts of the spans that fall within the window."""
+    return [
+        (max(start, first_day), min(end, last_day))
+        for start, end in spans if start <= last_day and end >= first_day
+    ]
+
+
+def free_spans(booked: List[Span], first_day: int, last_day: int) -> List[Span]:
+    """The days of the window not covered by the merged booked spans."""
+    free = []
+    day = first_day
+    for start, end in booked:
+        if start > last_day:
+            break
+        if start > day:
+            free.append((day, start - 1))
+        day = max(day, end + 1)
+    if day <= last_day:
+        free.append((day, last_day))
+    return free
+
+
+def nearest_free_windows(
+    booked: List[Span], target: int, length: int, first_day: int, last_day: int, count: int
+) -> List[Span]:
+    """
+    Up to `count` runs of `length` free days between first_day and last_day, at most one
+    per free stretch, each starting as close to `target` as its stretch allows. Nearest
+    first, the earlier one on ties.
+    """
+    candidates = []
+    for start, end in free_spans(booked, first_day, last_day):
+        if end - start + 1 >= length:
+            window_start = min(max(target, start), end - length + 1)
+            candidates.append((abs(window_start - target), window_start))
+    return [(start, start + length - 1) for _, start in sorted(candidates)[:count]]
@@ -0,0 +1,11 @@
+from functools import partial
+from typing import Callable, TypeVar
+import anyio
+from anyio import to_thread
+
+T = TypeVar("T")
+
+
+async def run_in_storage_thread(func: Callable[..., T], *args, limiter: anyio.CapacityLimiter) -> T:
+    """Run blocking storage work in a worker thread bounded by the storage limiter."""
+    return await to_thread.run_sync(partial(func, *args), limiter=limiter)
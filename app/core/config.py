@@ -0,0 +1,35 @@
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Application settings, read from environment variables."""
+    storage_backend: str = "json"
+    db_path: str = "app/data/db.json"
+    journal_compact_threshold: int = 1000
+    sqlite_path: str = "app/data/db.sqlite3"
+    sqlite_pool_size: int = 5
+    storage_threads: int = 16
+    availability_cache_size: int = 256
+    archive_interval_seconds: int = 3600
+
+
+def get_settings() -> Settings:
+    """Build settings from the environment, falling back to the defaults."""
+    return Settings(
+        storage_backend=os.getenv("STORAGE_BACKEND", Settings.storage_backend),
+        db_path=os.getenv("DB_PATH", Settings.db_path),
+        journal_compact_threshold=int(
+            os.getenv("JOURNAL_COMPACT_THRESHOLD", Settings.journal_compact_threshold)
+        ),
+        sqlite_path=os.getenv("SQLITE_PATH", Settings.sqlite_path),
+        sqlite_pool_size=int(os.getenv("SQLITE_POOL_SIZE", Settings.sqlite_pool_size)),
+        storage_threads=int(os.getenv("STORAGE_THREADS", Settings.storage_threads)),
+        availability_cache_size=int(
+            os.getenv("AVAILABILITY_CACHE_SIZE", Settings.availability_cache_size)
+        ),
+        archive_interval_seconds=int(
+            os.getenv("ARCHIVE_INTERVAL_SECONDS", Settings.archive_interval_seconds)
+        ),
+    )
@@ -1,32 +1,119 @@
+import threading
+from dataclasses import dataclass
+from typing import Optional, Union
+import anyio
 from app.infra.db import JSONDatabase
+from app.infra.journal_db import JournalJSONDatabase
+from app.infra.sharded_db import ShardedJSONDatabase
+from app.infra.sqlite_db import SQLiteDatabase
+from app.core.availability_cache import AvailabilityCache
+from app.core.config import Settings, get_settings
+from app.core.interfaces.repositories import ICarRepository, IBookingRepository
 from app.core.repositories.json_repositories import JSONCarRepository, JSONBookingRepository
-from app.core.use_cases.car_use_cases import CarUseCases
-from app.core.use_cases.booking_use_cases import BookingUseCases
-from fastapi import Depends
+from app.core.repositories.sqlite_repositories import SQLiteCarRepository, SQLiteBookingRepository
+from app.core.repositories.async_repositories import ThreadedCarRepository, ThreadedBookingRepository
+from app.core.use_cases.car_use_cases import CarUseCases, AsyncCarUseCases
+from app.core.use_cases.booking_use_cases import BookingUseCases, AsyncBookingUseCases
+from fastapi import Depends, FastAPI, Request
 
-def get_json_database():
+_container_lock = threading.Lock()
+
+
+@dataclass
+class AppContainer:
+    """Application-scoped storage, repositories and use cases."""
+    db: Union[JSONDatabase, ShardedJSONDatabase, SQLiteDatabase]
+    car_repo: ICarRepository
+    booking_repo: IBookingRepository
+    car_use_cases: CarUseCases
+    booking_use_cases: BookingUseCases
+    async_car_use_cases: AsyncCarUseCases
+    async_booking_use_cases: AsyncBookingUseCases
+    availability_cache: Optional[AvailabilityCache] = None
+
+
+def build_container(settings: Settings) -> AppContainer:
+    """Create the storage backend and everything built on top of it."""
+    if settings.storage_backend == "json":
+        db = JSONDatabase(settings.db_path)
+    elif settings.storage_backend == "journal":
+        db = JournalJSONDatabase(settings.db_path, settings.journal_compact_threshold)
+    elif settings.storage_backend == "sharded":
+        db = ShardedJSONDatabase(settings.db_path)
+    elif settings.storage_backend == "sqlite":
+        db = SQLiteDatabase(settings.sqlite_path, settings.sqlite_pool_size)
+    else:
+        raise ValueError(f"Unsupported storage backend: {settings.storage_backend}")
+
+    if isinstance(db, SQLiteDatabase):
+        car_repo, booking_repo = SQLiteCarRepository(db), SQLiteBookingRepository(db)
+    else:
+        car_repo, booking_repo = JSONCarRepository(db), JSONBookingRepository(db)
+    cache = AvailabilityCache(settings.availability_cache_size) if settings.availability_cache_size > 0 else None
+    booking_use_cases = BookingUseCases(booking_repo, car_repo, cache)
+
+    storage_limiter = anyio.CapacityLimiter(settings.storage_threads)
+    async_car_repo = ThreadedCarRepository(car_repo, storage_limiter)
+    async_booking_repo = ThreadedBookingRepository(booking_repo, storage_limiter)
+
+    return AppContainer(
+        db=db,
+        car_repo=car_repo,
+        booking_repo=booking_repo,
+        car_use_cases=CarUseCases(car_repo, booking_repo, cache),
+        booking_use_cases=booking_use_cases,
+        async_car_use_cases=AsyncCarUseCases(async_car_repo, async_booking_repo, cache),
+        async_booking_use_cases=AsyncBookingUseCases(async_booking_repo, booking_use_cases, storage_limiter),
+        availability_cache=cache,
+    )
+
+
+async def get_container(request: Request) -> AppContainer:
+    """
+    Dependency for the application container, normally built by the lifespan. Without one
+    it is built on first use in a worker thread, since building opens the storage files.
+    """
+    container = getattr(request.app.state, "container", None)
+    if container is None:
+        container = await anyio.to_thread.run_sync(_build_app_container, request.app)
+    return container
+
+
+def _build_app_container(app: FastAPI) -> AppContainer:
+    with _container_lock:
+        container = getattr(app.state, "container", None)
+        if container is None:
+            container = build_container(get_settings())
+            app.state.container = container
+    return container
+
+async def get_json_database(container: AppContainer = Depends(get_container)):
     """Dependency for JSON database"""
-    return JSONDatabase()
+    return container.db
 
-def get_car_repository(db: JSONDatabase = Depends(get_json_database)):
+async def get_car_repository(container: AppContainer = Depends(get_container)):
     """Dependency for car repository"""
-    return JSONCarRepository(db)
+    return container.car_repo
 
-def get_booking_repository(db: JSONDatabase = Depends(get_json_database)):
+async def get_booking_repository(container: AppContainer = Depends(get_container)):
     """Dependency for booking repository"""
-    return JSONBookingRepository(db)
+    return container.booking_repo
 
-def get_car_use_cases(
-    car_repo: JSONCarRepository = Depends(get_car_repository),
-    booking_repo: JSONBookingRepository = Depends(get_booking_repository)
-):
+async def get_car_use_cases(container: AppContainer = Depends(get_container)):
     """Dependency for car use cases"""
-    return CarUseCases(car_repo, booking_repo)
+    return container.car_use_cases
 
 
-def get_booking_use_cases(
-    booking_repo: JSONBookingRepository = Depends(get_booking_repository),
-    car_repo: JSONCarRepository = Depends(get_car_repository)
-):
+async def get_booking_use_cases(container: AppContainer = Depends(get_container)):
     """Dependency for booking use cases"""
-    return BookingUseCases(booking_repo, car_repo)
+    return container.booking_use_cases
+
+
+async def get_async_car_use_cases(container: AppContainer = Depends(get_container)):
+    """Dependency for async car use cases"""
+    return container.async_car_use_cases
+
+
+async def get_async_booking_use_cases(container: AppContainer = Depends(get_container)):
+    """Dependency for async booking use cases"""
+    return container.async_booking_use_cases
@@ -5,3 +5,19 @@ class InvalidDateRangeError(Exception):
 class CarNotAvailableError(Exception):
     """Exception raised when the car is not available."""
     pass
+
+class BookingConflictError(CarNotAvailableError):
+    """Exception raised when the car is already booked for overlapping dates."""
+
+    def __init__(self, message: str, alternatives=None):
+        super().__init__(message)
+        # Free date windows of the same length to offer instead, nearest first.
+        self.alternatives = alternatives or []
+
+class InvalidCursorError(Exception):
+    """Exception raised when a pagination cursor does not match any record."""
+    pass
+
+class RecordNotFoundError(Exception):
+    """Exception raised when a car or booking with the given id does not exist."""
+    pass
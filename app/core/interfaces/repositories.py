@@ -1,15 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict
+from typing import ContextManager, Iterable, List, Optional, Dict, Set, Tuple
 from uuid import UUID
 from datetime import date
+from app.core.models.pagination import BookingFilters, CarFilters
 
 class ICarRepository(ABC):
     """Interface for car data access operations"""
     
+    @abstractmethod
+    def data_version(self) -> int:
+        """Version of the stored data, increased by every write to cars or bookings."""
+        pass
+
     @abstractmethod
     def get_all(self) -> List[Dict]:
         pass
     
+    @abstractmethod
+    def find(self, filters: CarFilters, after: Optional[str], limit: int) -> List[Dict]:
+        """Up to `limit` cars matching the filters, in storage order, after the car with id `after`."""
+        pass
+
     @abstractmethod
     def get_by_id(self, car_id: UUID) -> Optional[Dict]:
         pass
@@ -18,17 +29,40 @@ class ICarRepository(ABC):
     def update_status(self, car_id: UUID, status: str) -> None:
         pass
 
+    @abstractmethod
+    def update_status_many(self, car_ids: List[UUID], status: str) -> None:
+        pass
+
 class IBookingRepository(ABC):
     """Interface for booking data access operations"""
     
+    @abstractmethod
+    def data_version(self) -> int:
+        """Version of the stored data, increased by every write to cars or bookings."""
+        pass
+
     @abstractmethod
     def get_all(self) -> List[Dict]:
         pass
     
+    @abstractmethod
+    def find(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[Dict]:
+        """Up to `limit` bookings matching the filters, in storage order, after the booking with id `after`."""
+        pass
+
     @abstractmethod
     def create(self, booking_data: Dict) -> Dict:
         pass
+
+    @abstractmethod
+    def create_many(self, bookings_data: List[Dict]) -> List[Dict]:
+        pass
     
+    @abstractmethod
+    def get_by_id(self, booking_id: UUID) -> Optional[Dict]:
+        """Booking by id, whether active or archived."""
+        pass
+
     @abstractmethod
     def get_by_date(self, target_date: date) -> List[Dict]:
         pass
@@ -36,3 +70,131 @@ class IBookingRepository(ABC):
     @abstractmethod
     def get_by_car_id(self, car_id: UUID) -> List[Dict]:
         pass
+
+    @abstractmethod
+    def get_booked_car_ids(self, start_date: date, end_date: date) -> Set[str]:
+        pass
+
+    @abstractmethod
+    def find_overlapping(self, car_id: UUID, start_date: date, end_date: date) -> Optional[Dict]:
+        pass
+
+    @abstractmethod
+    def get_booking_intervals(self, start_date: date, end_date: date) -> List[Tuple[str, int, int]]:
+        """(car id, start, end) of every booking, active or archived, overlapping the range; dates as ordinals."""
+        pass
+
+    @abstractmethod
+    def get_car_intervals(self, car_id: UUID, start_date: date, end_date: date) -> List[Tuple[int, int]]:
+        """(start, end) of the car's bookings, active or archived, overlapping the range, by start; dates as ordinals."""
+        pass
+
+    @abstractmethod
+    def archive_expired(self, before: date) -> int:
+        """Move the bookings that ended before the given day out of the active set; returns how many moved."""
+        pass
+
+    @abstractmethod
+    def find_archived(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[Dict]:
+        """Up to `limit` archived bookings matching the filters, in archiving order, after the booking with id `after`."""
+        pass
+
+    @abstractmethod
+    def get_archived(self) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    def lock_cars(self, car_ids: Iterable[UUID]) -> ContextManager[None]:
+        """Exclusive hold on the given cars' bookings, shared by every worker process."""
+        pass
+
+
+class IAsyncCarRepository(ABC):
+    """Async interface for car data access operations"""
+
+    @abstractmethod
+    async def data_version(self) -> int:
+        """Version of the stored data, increased by every write to cars or bookings."""
+        pass
+
+    @abstractmethod
+    async def get_all(self) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    async def find(self, filters: CarFilters, after: Optional[str], limit: int) -> List[Dict]:
+        """Up to `limit` cars matching the filters, in storage order, after the car with id `after`."""
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, car_id: UUID) -> Optional[Dict]:
+        pass
+
+    @abstractmethod
+    async def update_status(self, car_id: UUID, status: str) -> None:
+        pass
+
+    @abstractmethod
+    async def update_status_many(self, car_ids: List[UUID], status: str) -> None:
+        pass
+
+class IAsyncBookingRepository(ABC):
+    """Async interface for booking data access operations"""
+
+    @abstractmethod
+    async def data_version(self) -> int:
+        """Version of the stored data, increased by every write to cars or bookings."""
+        pass
+
+    @abstractmethod
+    async def get_all(self) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    async def find(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[Dict]:
+        """Up to `limit` bookings matching the filters, in storage order, after the booking with id `after`."""
+        pass
+
+    @abstractmethod
+    async def create(self, booking_data: Dict) -> Dict:
+        pass
+
+    @abstractmethod
+    async def create_many(self, bookings_data: List[Dict]) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, booking_id: UUID) -> Optional[Dict]:
+        """Booking by id, whether active or archived."""
+        pass
+
+    @abstractmethod
+    async def get_by_date(self, target_date: date) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    async def get_by_car_id(self, car_id: UUID) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    async def get_booked_car_ids(self, start_date: date, end_date: date) -> Set[str]:
+        pass
+
+    @abstractmethod
+    async def find_overlapping(self, car_id: UUID, start_date: date, end_date: date) -> Optional[Dict]:
+        pass
+
+    @abstractmethod
+    async def get_booking_intervals(self, start_date: date, end_date: date) -> List[Tuple[str, int, int]]:
+        """(car id, start, end) of every booking, active or archived, overlapping the range; dates as ordinals."""
+        pass
+
+    @abstractmethod
+    async def get_car_intervals(self, car_id: UUID, start_date: date, end_date: date) -> List[Tuple[int, int]]:
+        """(start, end) of the car's bookings, active or archived, overlapping the range, by start; dates as ordinals."""
+        pass
+
+    @abstractmethod
+    async def find_archived(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[Dict]:
+        """Up to `limit` archived bookings matching the filters, in archiving order, after the booking with id `after`."""
+        pass
@@ -1,30 +1,96 @@
+import atexit
+import copy
+import json
 import logging
-import sys
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
-def setup_logger(name: str = 'car_rental_api'):
+LOG_FILE = Path("logs/app.log")
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that only merges the message arguments on the logging thread, so
+    the record does not change if they are mutated later. Timestamps, tracebacks and
+    the final line are formatted by the listener thread that writes the file.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
 
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def setup_logger(name: str = 'car_rental_api'):
+    """
+    Configure the application logger from the environment:
+    LOG_LEVEL (default INFO), LOG_FORMAT ("text" or "json") and LOG_QUEUE (default on),
+    which hands records to a background thread instead of writing the file inline.
+    """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
     if logger.handlers:
         return logger
-    
 
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
 
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-    log_file = Path("logs/app.log")
-    log_file.parent.mkdir(parents=True, exist_ok=True)
-    
-    file_handler = logging.FileHandler(log_file)
+    file_handler = logging.FileHandler(LOG_FILE)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    if _env_flag("LOG_QUEUE", True):
+        queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+
+        def start_listener():
+            listener = QueueListener(queue_handler.queue, file_handler, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+
+        def restart_listener_in_child():
+            # A forked worker inherits the handler but not the listener thread.
+            queue_handler.queue = queue.SimpleQueue()
+            start_listener()
+
+        start_listener()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=restart_listener_in_child)
+        logger.addHandler(queue_handler)
+    else:
+        logger.addHandler(file_handler)
 
     logger.info("Logger configured successfully")
     return logger
 
 
-logger = setup_logger()
\ No newline at end of file
+logger = setup_logger()
@@ -0,0 +1,36 @@
+from datetime import date
+from typing import List
+from uuid import UUID
+from pydantic import BaseModel
+from app.core.models.response_models import BaseResponse
+
+
+class DayOccupancy(BaseModel):
+    """Booked cars on one day, and their share of the fleet"""
+    date: date
+    booked_cars: int
+    occupancy: float
+
+
+class CarUtilization(BaseModel):
+    """Booked days of one car over the report window, and their share of it"""
+    car_id: UUID
+    booked_days: int
+    utilization: float
+
+
+class OccupancyReport(BaseModel):
+    """Fleet occupancy over an inclusive date window"""
+    start_date: date
+    end_date: date
+    days: int
+    car_count: int
+    fleet_utilization: float
+    peak_days: List[DayOccupancy]
+    daily: List[DayOccupancy]
+    cars: List[CarUtilization]
+
+
+class OccupancyResponse(BaseResponse):
+    """Occupancy report response model"""
+    data: OccupancyReport
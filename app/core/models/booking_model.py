@@ -1,8 +1,17 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from uuid import UUID
 from datetime import date
-from typing import List
-from app.core.models.response_models import BaseResponse
+from typing import List, Optional
+from app.core.models.response_models import BaseResponse, ErrorResponse
+
+# Bookings accepted in one batch request; their cars are all locked while it is written.
+MAX_BATCH_SIZE = 500
+
+
+class DateWindow(BaseModel):
+    """An inclusive range of days."""
+    start_date: date
+    end_date: date
 
 
 class BaseBooking(BaseModel):
@@ -25,8 +34,35 @@ class ListBookingsResponse(BaseResponse):
     """List bookings response model."""
     data: List[Booking]
     total_count: int
+    next_cursor: Optional[str] = None
+
+
+class BookingConflictResponse(ErrorResponse):
+    """Rejected booking, with the car's nearest free windows of the same length."""
+    alternatives: List[DateWindow]
 
 
 class BookingResponse(BaseResponse):
     """Booking response model."""
     data: Booking
+
+
+class BatchBookingRequest(BaseModel):
+    """Batch booking request model."""
+    bookings: List[BookingRequest] = Field(max_length=MAX_BATCH_SIZE)
+
+
+class BatchBookingResult(BaseModel):
+    """Outcome of one booking of a batch."""
+    index: int
+    status: str
+    data: Optional[Booking] = None
+    error: Optional[str] = None
+    alternatives: Optional[List[DateWindow]] = None
+
+
+class BatchBookingResponse(BaseResponse):
+    """Batch booking response model."""
+    data: List[BatchBookingResult]
+    created_count: int
+    failed_count: int
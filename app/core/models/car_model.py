@@ -1,8 +1,10 @@
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 from enum import Enum
+from app.core.models.booking_model import DateWindow
 from app.core.models.response_models import BaseResponse
-from typing import List
+from datetime import date
+from typing import List, Optional
 
 class CarStatus(str, Enum):
     """Car status enum"""
@@ -24,12 +26,46 @@ class Car(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CarResponse(BaseResponse):
+    """Response for a single car"""
+    data: Car
+
+
 class CarsListResponse(BaseResponse):
     """Response for list of cars"""
     data: List[Car]
     total_count: int
+    next_cursor: Optional[str] = None
 
 class AvailableCarsResponse(BaseResponse):
     """Response for available cars"""
     data: List[Car]
-    total_count: int
\ No newline at end of file
+    total_count: int
+
+class CarAvailability(BaseModel):
+    """Free days of one car: one character per day of the window, "1" when the car is free"""
+    car: Car
+    free_days: str
+
+
+class AvailabilityCalendarResponse(BaseResponse):
+    """Response for the availability of every car over a date window"""
+    data: List[CarAvailability]
+    start_date: date
+    end_date: date
+    total_count: int
+
+
+class CarCalendar(BaseModel):
+    """Booked and free stretches of one car over a date window"""
+    car_id: UUID
+    start_date: date
+    end_date: date
+    booked: List[DateWindow]
+    free: List[DateWindow]
+    next_free_window: Optional[DateWindow] = None
+
+
+class CarCalendarResponse(BaseResponse):
+    """Response for the calendar of a single car"""
+    data: CarCalendar
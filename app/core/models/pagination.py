@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional
+from uuid import UUID
+from app.core.models.car_model import CarStatus
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class CarFilters:
+    """Optional filters for listing cars; unset fields match every car."""
+    brand: Optional[str] = None
+    model: Optional[str] = None
+    year: Optional[int] = None
+    status: Optional[CarStatus] = None
+
+
+@dataclass(frozen=True)
+class BookingFilters:
+    """Optional filters for listing bookings; the dates select bookings overlapping the window."""
+    car_id: Optional[UUID] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+@dataclass
+class Page:
+    """One page of records and the cursor to pass as `after` to get the next one."""
+    items: List[Dict]
+    next_cursor: Optional[str] = None
+
+    @classmethod
+    def from_lookahead(cls, items: List[Dict], limit: int) -> "Page":
+        """Build a page from up to limit + 1 records; the extra one only signals a next page."""
+        if len(items) > limit:
+            return cls(items=items[:limit], next_cursor=str(items[limit - 1]["id"]))
+        return cls(items=items)
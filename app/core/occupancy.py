@@ -0,0 +1,76 @@
+import heapq
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# (car id, first day, last day) of a booking, days as date ordinals.
+Interval = Tuple[str, int, int]
+
+
+@dataclass
+class Occupancy:
+    """Booked days per car and booked cars per day over a window of days."""
+    first_day: int
+    booked_days: List[int]
+    booked_cars: List[int]
+
+    def peak_days(self, count: int) -> List[int]:
+        """Offsets of the `count` days with the most booked cars, earliest first among ties."""
+        return heapq.nsmallest(count, range(len(self.booked_cars)), key=lambda day: (-self.booked_cars[day], day))
+
+
+def compute_occupancy(
+    car_ids: Sequence[str], intervals: Iterable[Interval], first_day: int, last_day: int
+) -> Occupancy:
+    """
+    Occupancy of the given cars between two inclusive date ordinals. A car is booked on
+    a day if any of its bookings covers it; bookings of other cars are ignored.
+
+    Each car's bookings are merged into disjoint runs, which gives its booked days, and
+    the runs are counted per day with a difference array: the cost follows the number
+    of bookings, not cars x days.
+    """
+    days = last_day - first_day + 1
+    by_car: Dict[int, List[Tuple[int, int]]] = {}
+    for row, start, stop in _clipped(car_ids, intervals, first_day, last_day):
+        by_car.setdefault(row, []).append((start, stop))
+
+    booked_days = [0] * len(car_ids)
+    bounds = [0] * (days + 1)
+    for row, runs in by_car.items():
+        runs.sort()
+        run_start, run_stop = runs[0]
+        for start, stop in runs[1:] + [(days + 1, days + 1)]:
+            if start > run_stop:
+                booked_days[row] += run_stop - run_start
+                bounds[run_start] += 1
+                bounds[run_stop] -= 1
+                run_start, run_stop = start, stop
+            else:
+                run_stop = max(run_stop, stop)
+    return Occupancy(first_day, booked_days, list(accumulate(bounds[:days])))
+
+
+def free_day_bitmaps(
+    car_ids: Sequence[str], intervals: Iterable[Interval], first_day: int, last_day: int
+) -> List[str]:
+    """
+    For each car, one character per day of the window: "1" if none of its bookings
+    covers the day, "0" otherwise. One pass over the bookings, each clearing a slice.
+    """
+    bitmaps = [bytearray(b"1" * (last_day - first_day + 1)) for _ in car_ids]
+    for row, start, stop in _clipped(car_ids, intervals, first_day, last_day):
+        bitmaps[row][start:stop] = b"0" * (stop - start)
+    return [bitmap.decode() for bitmap in bitmaps]
+
+
+def _clipped(
+    car_ids: Sequence[str], intervals: Iterable[Interval], first_day: int, last_day: int
+) -> Iterable[Tuple[int, int, int]]:
+    """(car row, first offset, offset after the last day) of each booking, clipped to the window."""
+    rows = {car_id: row for row, car_id in enumerate(car_ids)}
+    for car_id, start, end in intervals:
+        row = rows.get(car_id)
+        if row is None or start > last_day or end < first_day:
+            continue
+        yield row, max(start, first_day) - first_day, min(end, last_day) - first_day + 1
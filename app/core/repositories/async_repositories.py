@@ -0,0 +1,93 @@
+from datetime import date
+from typing import List, Optional, Set, Tuple
+from uuid import UUID
+import anyio
+from app.core.concurrency import run_in_storage_thread
+from app.core.interfaces.repositories import (
+    ICarRepository,
+    IBookingRepository,
+    IAsyncCarRepository,
+    IAsyncBookingRepository,
+)
+from app.core.models.pagination import BookingFilters, CarFilters
+
+
+class ThreadedCarRepository(IAsyncCarRepository):
+    """Async car repository running a blocking repository's calls in worker threads."""
+
+    def __init__(self, repo: ICarRepository, limiter: anyio.CapacityLimiter):
+        self.repo = repo
+        self.limiter = limiter
+
+    async def data_version(self) -> int:
+        return await run_in_storage_thread(self.repo.data_version, limiter=self.limiter)
+
+    async def get_all(self) -> List[dict]:
+        return await run_in_storage_thread(self.repo.get_all, limiter=self.limiter)
+
+    async def find(self, filters: CarFilters, after: Optional[str], limit: int) -> List[dict]:
+        return await run_in_storage_thread(self.repo.find, filters, after, limit, limiter=self.limiter)
+
+    async def get_by_id(self, car_id: UUID) -> Optional[dict]:
+        return await run_in_storage_thread(self.repo.get_by_id, car_id, limiter=self.limiter)
+
+    async def update_status(self, car_id: UUID, status: str) -> None:
+        await run_in_storage_thread(self.repo.update_status, car_id, status, limiter=self.limiter)
+
+    async def update_status_many(self, car_ids: List[UUID], status: str) -> None:
+        await run_in_storage_thread(self.repo.update_status_many, car_ids, status, limiter=self.limiter)
+
+
+class ThreadedBookingRepository(IAsyncBookingRepository):
+    """Async booking repository running a blocking repository's calls in worker threads."""
+
+    def __init__(self, repo: IBookingRepository, limiter: anyio.CapacityLimiter):
+        self.repo = repo
+        self.limiter = limiter
+
+    async def data_version(self) -> int:
+        return await run_in_storage_thread(self.repo.data_version, limiter=self.limiter)
+
+    async def get_all(self) -> List[dict]:
+        return await run_in_storage_thread(self.repo.get_all, limiter=self.limiter)
+
+    async def find(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[dict]:
+        return await run_in_storage_thread(self.repo.find, filters, after, limit, limiter=self.limiter)
+
+    async def create(self, booking_data: dict) -> dict:
+        return await run_in_storage_thread(self.repo.create, booking_data, limiter=self.limiter)
+
+    async def create_many(self, bookings_data: List[dict]) -> List[dict]:
+        return await run_in_storage_thread(self.repo.create_many, bookings_data, limiter=self.limiter)
+
+    async def get_by_id(self, booking_id: UUID) -> Optional[dict]:
+        return await run_in_storage_thread(self.repo.get_by_id, booking_id, limiter=self.limiter)
+
+    async def get_by_date(self, target_date: date) -> List[dict]:
+        return await run_in_storage_thread(self.repo.get_by_date, target_date, limiter=self.limiter)
+
+    async def get_by_car_id(self, car_id: UUID) -> List[dict]:
+        return await run_in_storage_thread(self.repo.get_by_car_id, car_id, limiter=self.limiter)
+
+    async def get_booked_car_ids(self, start_date: date, end_date: date) -> Set[str]:
+        return await run_in_storage_thread(
+            self.repo.get_booked_car_ids, start_date, end_date, limiter=self.limiter
+        )
+
+    async def find_overlapping(self, car_id: UUID, start_date: date, end_date: date) -> Optional[dict]:
+        return await run_in_storage_thread(
+            self.repo.find_overlapping, car_id, start_date, end_date, limiter=self.limiter
+        )
+
+    async def get_booking_intervals(self, start_date: date, end_date: date) -> List[Tuple[str, int, int]]:
+        return await run_in_storage_thread(
+            self.repo.get_booking_intervals, start_date, end_date, limiter=self.limiter
+        )
+
+    async def get_car_intervals(self, car_id: UUID, start_date: date, end_date: date) -> List[Tuple[int, int]]:
+        return await run_in_storage_thread(
+            self.repo.get_car_intervals, car_id, start_date, end_date, limiter=self.limiter
+        )
+
+    async def find_archived(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[dict]:
+        return await run_in_storage_thread(self.repo.find_archived, filters, after, limit, limiter=self.limiter)
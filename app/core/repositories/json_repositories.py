@@ -1,43 +1,82 @@
 from datetime import date
-from typing import List, Optional
+from typing import ContextManager, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 from app.core.interfaces.repositories import ICarRepository, IBookingRepository
+from app.core.models.pagination import BookingFilters, CarFilters
 from app.infra.db import JSONDatabase
 
 class JSONCarRepository(ICarRepository):
     def __init__(self, db: JSONDatabase):
         self.db = db
 
+    def data_version(self) -> int:
+        return self.db.data_version()
+
     def get_all(self) -> List[dict]:
         return self.db.get_all_cars()
 
+    def find(self, filters: CarFilters, after: Optional[str], limit: int) -> List[dict]:
+        return self.db.find_cars(filters, after, limit)
+
     def get_by_id(self, car_id: UUID) -> Optional[dict]:
         return self.db.get_car_by_id(car_id)
 
     def update_status(self, car_id: UUID, status: str) -> None:
         self.db.set_status_car(car_id, status)
 
+    def update_status_many(self, car_ids: List[UUID], status: str) -> None:
+        self.db.set_status_cars(car_ids, status)
+
 class JSONBookingRepository(IBookingRepository):
     def __init__(self, db: JSONDatabase):
         self.db = db
 
+    def data_version(self) -> int:
+        return self.db.data_version()
+
     def get_all(self) -> List[dict]:
         return self.db.get_all_bookings()
 
+    def find(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[dict]:
+        return self.db.find_bookings(filters, after, limit)
+
     def create(self, booking_data: dict) -> dict:
         self.db.add_booking(booking_data)
         return booking_data
 
+    def create_many(self, bookings_data: List[dict]) -> List[dict]:
+        self.db.add_bookings(bookings_data)
+        return bookings_data
+
+    def get_by_id(self, booking_id: UUID) -> Optional[dict]:
+        return self.db.get_booking_by_id(booking_id)
+
     def get_by_date(self, target_date: date) -> List[dict]:
-        all_bookings = self.get_all()
-        return [
-            booking for booking in all_bookings
-            if self._parse_date_to_str(booking['start_date']) <= self._parse_date_to_str(target_date) <= self._parse_date_to_str(booking['end_date'])
-        ]
+        return self.db.get_bookings_by_date(target_date)
 
     def get_by_car_id(self, car_id: UUID) -> List[dict]:
-        all_bookings = self.get_all()
-        return [booking for booking in all_bookings if booking['car_id'] == car_id]
+        return self.db.get_bookings_by_car_id(car_id)
+
+    def get_booked_car_ids(self, start_date: date, end_date: date) -> Set[str]:
+        return self.db.get_booked_car_ids(start_date, end_date)
+
+    def get_booking_intervals(self, start_date: date, end_date: date) -> List[Tuple[str, int, int]]:
+        return self.db.get_booking_intervals(start_date, end_date)
+
+    def get_car_intervals(self, car_id: UUID, start_date: date, end_date: date) -> List[Tuple[int, int]]:
+        return self.db.get_car_intervals(car_id, start_date, end_date)
+
+    def find_overlapping(self, car_id: UUID, start_date: date, end_date: date) -> Optional[dict]:
+        return self.db.find_overlapping_booking(car_id, start_date, end_date)
+
+    def archive_expired(self, before: date) -> int:
+        return self.db.archive_bookings(before)
+
+    def find_archived(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[dict]:
+        return self.db.find_archived_bookings(filters, after, limit)
+
+    def get_archived(self) -> List[dict]:
+        return self.db.get_archived_bookings()
 
-    def _parse_date_to_str(self, date: date) -> str:
-        return date.isoformat()
\ No newline at end of file
+    def lock_cars(self, car_ids: Iterable[UUID]) -> ContextManager[None]:
+        return self.db.lock_cars(car_ids)
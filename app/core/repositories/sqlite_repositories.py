@@ -0,0 +1,214 @@
+from datetime import date
+from typing import ContextManager, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from app.core.exceptions import InvalidCursorError
+from app.core.interfaces.repositories import ICarRepository, IBookingRepository
+from app.core.models.car_model import CarStatus
+from app.core.models.pagination import BookingFilters, CarFilters
+from app.infra.sqlite_db import SQLiteDatabase, INSERT_BOOKING
+
+CAR_COLUMNS = "id, brand, model, engine, version, year, status"
+SELECT_CARS = f"SELECT {CAR_COLUMNS} FROM cars ORDER BY rowid"
+SELECT_CAR_BY_ID = f"SELECT {CAR_COLUMNS} FROM cars WHERE id = ?"
+UPDATE_CAR_STATUS = "UPDATE cars SET status = ? WHERE id = ?"
+
+BOOKING_COLUMNS = "id, car_id, customer_name, customer_email, start_date, end_date, created_at"
+SELECT_BOOKINGS = f"SELECT {BOOKING_COLUMNS} FROM bookings ORDER BY rowid"
+SELECT_BOOKING_BY_ID = f"SELECT {BOOKING_COLUMNS} FROM bookings WHERE id = ?"
+SELECT_ARCHIVED_BOOKING_BY_ID = f"SELECT {BOOKING_COLUMNS} FROM bookings_archive WHERE id = ?"
+SELECT_BOOKINGS_BY_DATE = (
+    f"SELECT {BOOKING_COLUMNS} FROM bookings WHERE start_date <= ? AND end_date >= ? ORDER BY rowid"
+)
+SELECT_BOOKINGS_BY_CAR = (
+    f"SELECT {BOOKING_COLUMNS} FROM bookings WHERE car_id = ? ORDER BY start_date"
+)
+SELECT_BOOKED_CAR_IDS = "SELECT DISTINCT car_id FROM bookings WHERE start_date <= ? AND end_date >= ?"
+# Date ordinals computed by SQLite: julianday() of day 1 of year 1 is 1721425.5.
+BOOKING_INTERVALS = (
+    "SELECT car_id, CAST(julianday(start_date) - 1721424.5 AS INTEGER), "
+    "CAST(julianday(end_date) - 1721424.5 AS INTEGER) FROM {table} WHERE start_date <= ? AND end_date >= ?"
+)
+CAR_INTERVALS = (
+    "SELECT CAST(julianday(start_date) - 1721424.5 AS INTEGER), "
+    "CAST(julianday(end_date) - 1721424.5 AS INTEGER) FROM {table} "
+    "WHERE car_id = ? AND start_date <= ? AND end_date >= ?"
+)
+SELECT_EXPIRED_BOOKING = "SELECT 1 FROM bookings WHERE end_date < ? LIMIT 1"
+ARCHIVE_EXPIRED_BOOKINGS = (
+    f"INSERT OR IGNORE INTO bookings_archive ({BOOKING_COLUMNS}) "
+    f"SELECT {BOOKING_COLUMNS} FROM bookings WHERE end_date < ? ORDER BY rowid"
+)
+DELETE_EXPIRED_BOOKINGS = "DELETE FROM bookings WHERE end_date < ?"
+SELECT_ARCHIVED_BOOKINGS = f"SELECT {BOOKING_COLUMNS} FROM bookings_archive ORDER BY rowid"
+SELECT_OVERLAPPING_BOOKING = (
+    f"SELECT {BOOKING_COLUMNS} FROM bookings "
+    "WHERE car_id = ? AND start_date <= ? AND end_date >= ? LIMIT 1"
+)
+
+
+def _find_query(
+    table: str, columns: str, conditions: List[str], params: list, after: Optional[str], limit: int
+) -> Tuple[str, list]:
+    """Build a keyset-paginated SELECT: rows matching all conditions, after the row with id `after`."""
+    if after is not None:
+        conditions = conditions + [f"rowid > (SELECT rowid FROM {table} WHERE id = ?)"]
+        params = params + [after]
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    return f"SELECT {columns} FROM {table} {where}ORDER BY rowid LIMIT ?", params + [limit]
+
+
+def _check_cursor(conn, table: str, after: Optional[str]) -> None:
+    if after is not None and conn.execute(f"SELECT 1 FROM {table} WHERE id = ?", (after,)).fetchone() is None:
+        raise InvalidCursorError(f"Unknown cursor: {after}")
+
+
+def _booking_params(booking: dict) -> dict:
+    """Convert a booking to the string columns stored in SQLite."""
+    return {
+        "id": str(booking["id"]),
+        "car_id": str(booking["car_id"]),
+        "customer_name": booking["customer_name"],
+        "customer_email": booking["customer_email"],
+        "start_date": str(booking["start_date"]),
+        "end_date": str(booking["end_date"]),
+        "created_at": booking.get("created_at"),
+    }
+
+
+class SQLiteCarRepository(ICarRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    def data_version(self) -> int:
+        return self.db.data_version()
+
+    def get_all(self) -> List[dict]:
+        with self.db.connection() as conn:
+            return [dict(row) for row in conn.execute(SELECT_CARS)]
+
+    def find(self, filters: CarFilters, after: Optional[str], limit: int) -> List[dict]:
+        conditions, params = [], []
+        for column in ("brand", "model", "year", "status"):
+            value = getattr(filters, column)
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value.value if isinstance(value, CarStatus) else value)
+        query, params = _find_query("cars", CAR_COLUMNS, conditions, params, after, limit)
+        with self.db.connection() as conn:
+            _check_cursor(conn, "cars", after)
+            return [dict(row) for row in conn.execute(query, params)]
+
+    def get_by_id(self, car_id: UUID) -> Optional[dict]:
+        with self.db.connection() as conn:
+            row = conn.execute(SELECT_CAR_BY_ID, (str(car_id),)).fetchone()
+        return dict(row) if row else None
+
+    def update_status(self, car_id: UUID, status: str) -> None:
+        self.update_status_many([car_id], status)
+
+    def update_status_many(self, car_ids: List[UUID], status: str) -> None:
+        status_value = CarStatus(status).value
+        with self.db.transaction() as conn:
+            conn.executemany(UPDATE_CAR_STATUS, [(status_value, str(car_id)) for car_id in car_ids])
+
+
+class SQLiteBookingRepository(IBookingRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    def data_version(self) -> int:
+        return self.db.data_version()
+
+    def get_all(self) -> List[dict]:
+        with self.db.connection() as conn:
+            return [dict(row) for row in conn.execute(SELECT_BOOKINGS)]
+
+    def find(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[dict]:
+        return self._find("bookings", filters, after, limit)
+
+    def find_archived(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[dict]:
+        return self._find("bookings_archive", filters, after, limit)
+
+    def _find(self, table: str, filters: BookingFilters, after: Optional[str], limit: int) -> List[dict]:
+        conditions, params = [], []
+        if filters.car_id is not None:
+            conditions.append("car_id = ?")
+            params.append(str(filters.car_id))
+        if filters.end_date is not None:
+            conditions.append("start_date <= ?")
+            params.append(filters.end_date.isoformat())
+        if filters.start_date is not None:
+            conditions.append("end_date >= ?")
+            params.append(filters.start_date.isoformat())
+        query, params = _find_query(table, BOOKING_COLUMNS, conditions, params, after, limit)
+        with self.db.connection() as conn:
+            _check_cursor(conn, table, after)
+            return [dict(row) for row in conn.execute(query, params)]
+
+    def create(self, booking_data: dict) -> dict:
+        self.create_many([booking_data])
+        return booking_data
+
+    def create_many(self, bookings_data: List[dict]) -> List[dict]:
+        with self.db.transaction() as conn:
+            conn.executemany(INSERT_BOOKING, [_booking_params(booking) for booking in bookings_data])
+        return bookings_data
+
+    def get_by_id(self, booking_id: UUID) -> Optional[dict]:
+        with self.db.connection() as conn:
+            row = conn.execute(SELECT_BOOKING_BY_ID, (str(booking_id),)).fetchone()
+            if row is None:
+                row = conn.execute(SELECT_ARCHIVED_BOOKING_BY_ID, (str(booking_id),)).fetchone()
+        return dict(row) if row else None
+
+    def get_by_date(self, target_date: date) -> List[dict]:
+        day = target_date.isoformat()
+        with self.db.connection() as conn:
+            return [dict(row) for row in conn.execute(SELECT_BOOKINGS_BY_DATE, (day, day))]
+
+    def get_by_car_id(self, car_id: UUID) -> List[dict]:
+        with self.db.connection() as conn:
+            return [dict(row) for row in conn.execute(SELECT_BOOKINGS_BY_CAR, (str(car_id),))]
+
+    def get_booked_car_ids(self, start_date: date, end_date: date) -> Set[str]:
+        with self.db.connection() as conn:
+            rows = conn.execute(SELECT_BOOKED_CAR_IDS, (end_date.isoformat(), start_date.isoformat()))
+            return {row["car_id"] for row in rows}
+
+    def get_booking_intervals(self, start_date: date, end_date: date) -> List[Tuple[str, int, int]]:
+        tables = ["bookings", "bookings_archive"] if start_date < date.today() else ["bookings"]
+        query = " UNION ALL ".join(BOOKING_INTERVALS.format(table=table) for table in tables)
+        params = (end_date.isoformat(), start_date.isoformat()) * len(tables)
+        with self.db.connection() as conn:
+            return [tuple(row) for row in conn.execute(query, params)]
+
+    def get_car_intervals(self, car_id: UUID, start_date: date, end_date: date) -> List[Tuple[int, int]]:
+        tables = ["bookings", "bookings_archive"] if start_date < date.today() else ["bookings"]
+        query = " UNION ALL ".join(CAR_INTERVALS.format(table=table) for table in tables) + " ORDER BY 1"
+        params = (str(car_id), end_date.isoformat(), start_date.isoformat()) * len(tables)
+        with self.db.connection() as conn:
+            return [tuple(row) for row in conn.execute(query, params)]
+
+    def find_overlapping(self, car_id: UUID, start_date: date, end_date: date) -> Optional[dict]:
+        with self.db.connection() as conn:
+            row = conn.execute(
+                SELECT_OVERLAPPING_BOOKING,
+                (str(car_id), end_date.isoformat(), start_date.isoformat())
+            ).fetchone()
+        return dict(row) if row else None
+
+    def archive_expired(self, before: date) -> int:
+        cutoff = before.isoformat()
+        with self.db.connection() as conn:
+            if conn.execute(SELECT_EXPIRED_BOOKING, (cutoff,)).fetchone() is None:
+                return 0
+        with self.db.transaction() as conn:
+            conn.execute(ARCHIVE_EXPIRED_BOOKINGS, (cutoff,))
+            return conn.execute(DELETE_EXPIRED_BOOKINGS, (cutoff,)).rowcount
+
+    def get_archived(self) -> List[dict]:
+        with self.db.connection() as conn:
+            return [dict(row) for row in conn.execute(SELECT_ARCHIVED_BOOKINGS)]
+
+    def lock_cars(self, car_ids: Iterable[UUID]) -> ContextManager[None]:
+        return self.db.lock_cars(car_ids)
@@ -1,21 +1,168 @@
-from app.core.interfaces.repositories import IBookingRepository, ICarRepository
+import json
+from contextlib import contextmanager
+import anyio
+from app.core.availability_cache import AvailabilityCache, BookedCar
+from app.core.interfaces.repositories import IBookingRepository, ICarRepository, IAsyncBookingRepository
+from app.core.concurrency import run_in_storage_thread
 from app.core.models.booking_model import BookingRequest
-from app.core.exceptions import CarNotAvailableError, InvalidDateRangeError
-from typing import List, Dict
+from app.core.exceptions import (
+    BookingConflictError,
+    CarNotAvailableError,
+    InvalidCursorError,
+    InvalidDateRangeError,
+    RecordNotFoundError,
+)
+from app.core.metrics import BOOKING_ATTEMPTS
+from app.core.car_calendar import merge_spans, nearest_free_windows
+from app.core.occupancy import Occupancy, compute_occupancy
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Dict, Optional, Tuple
 from app.core.models.car_model import CarStatus
+from app.core.models.pagination import BookingFilters, Page
 from app.core.logger.setup_logger import logger
 from uuid import uuid4, UUID
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+
+EXPORT_BATCH_SIZE = 500
+# Longest booking accepted, in days. Storage costs grow with a booking's span (one
+# shard per month in the sharded backend, one index entry per day in the JSON ones).
+MAX_BOOKING_DAYS = 366
+MAX_REPORT_DAYS = 731
+ALTERNATIVE_COUNT = 3
+ALTERNATIVE_SEARCH_DAYS = 90
+
+
+def _failure_outcome(error: Exception) -> str:
+    return "conflict" if isinstance(error, BookingConflictError) else "rejected"
+
+
+def _found(booking: Optional[Dict], booking_id: UUID) -> Dict:
+    if booking is None:
+        raise RecordNotFoundError(f"Booking with ID {booking_id} was not found")
+    return booking
+
+
+def _validate_filter_window(filters: BookingFilters) -> None:
+    if filters.start_date and filters.end_date and filters.start_date > filters.end_date:
+        raise InvalidDateRangeError(
+            f"Start date ({filters.start_date}) cannot be after end date ({filters.end_date})"
+        )
+
+
+def _share(part: int, whole: int) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+
+def _occupancy_report(start_date: date, end_date: date, car_ids: List[str], occupancy: Occupancy, peaks: int) -> Dict:
+    days = len(occupancy.booked_cars)
+
+    def day(offset: int) -> Dict:
+        booked = occupancy.booked_cars[offset]
+        return {
+            "date": date.fromordinal(occupancy.first_day + offset),
+            "booked_cars": booked,
+            "occupancy": _share(booked, len(car_ids)),
+        }
+
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "days": days,
+        "car_count": len(car_ids),
+        "fleet_utilization": _share(sum(occupancy.booked_days), len(car_ids) * days),
+        "peak_days": [day(offset) for offset in occupancy.peak_days(peaks)],
+        "daily": [day(offset) for offset in range(days)],
+        "cars": [
+            {"car_id": car_id, "booked_days": booked, "utilization": _share(booked, days)}
+            for car_id, booked in zip(car_ids, occupancy.booked_days)
+        ],
+    }
+
+
+class _ExportCursor:
+    """Where an export stands, resumable after archiving removes the booking it stopped at."""
+
+    def __init__(self):
+        self.after: Optional[str] = None
+        self._live: List[Tuple[str, str]] = []
+
+    def advance(self, bookings: List[Dict]) -> None:
+        for booking in bookings:
+            end_date = str(booking["end_date"])
+            while self._live and self._live[-1][0] <= end_date:
+                self._live.pop()
+            self._live.append((end_date, str(booking["id"])))
+        self.after = str(bookings[-1]["id"])
+
+    def resume(self) -> Optional[str]:
+        """The last exported booking archiving cannot have removed; None to restart."""
+        today = date.today().isoformat()
+        while self._live and self._live[-1][0] < today:
+            self._live.pop()
+        self.after = self._live[-1][1] if self._live else None
+        return self.after
+
 
 class BookingUseCases:
-    def __init__(self, booking_repo: IBookingRepository, car_repo: ICarRepository):
+    def __init__(
+        self,
+        booking_repo: IBookingRepository,
+        car_repo: ICarRepository,
+        cache: Optional[AvailabilityCache] = None
+    ):
         self.booking_repo = booking_repo
         self.car_repo = car_repo
+        self.cache = cache
+
+    def data_version(self) -> int:
+        return self.booking_repo.data_version()
 
     def get_all_bookings(self) -> List[Dict]:
         """Get all bookings"""
         return self.booking_repo.get_all()
 
+    def get_booking(self, booking_id: UUID) -> Dict:
+        """Get one booking, active or archived, by id"""
+        return _found(self.booking_repo.get_by_id(booking_id), booking_id)
+
+    def list_bookings(
+        self, filters: BookingFilters, after: Optional[str], limit: int, archived: bool = False
+    ) -> Page:
+        """One page of active (or archived) bookings matching the filters, starting after the booking with id `after`."""
+        _validate_filter_window(filters)
+        find = self.booking_repo.find_archived if archived else self.booking_repo.find
+        return Page.from_lookahead(find(filters, after, limit + 1), limit)
+
+    def occupancy_report(self, start_date: date, end_date: date, peaks: int = 5) -> Dict:
+        """
+        Utilization of every car, occupancy of the fleet on each day and the `peaks`
+        busiest days between start_date and end_date, inclusive, archived bookings included.
+        """
+        if start_date > end_date:
+            raise InvalidDateRangeError(
+                f"Start date ({start_date}) cannot be after end date ({end_date})"
+            )
+        if (end_date - start_date).days >= MAX_REPORT_DAYS:
+            raise InvalidDateRangeError(f"Reports cover at most {MAX_REPORT_DAYS} days")
+
+        car_ids = [str(car["id"]) for car in self.car_repo.get_all()]
+        intervals = self.booking_repo.get_booking_intervals(start_date, end_date)
+        occupancy = compute_occupancy(car_ids, intervals, start_date.toordinal(), end_date.toordinal())
+        return _occupancy_report(start_date, end_date, car_ids, occupancy, peaks)
+
+    def archive_expired_bookings(self, before: Optional[date] = None) -> int:
+        """
+        Move bookings that ended before `before` (default: today) out of the active set.
+        New bookings cannot start in the past, so these can never conflict with one again.
+        """
+        before = before or date.today()
+        # Availability is only ever asked for today onwards, which archived bookings do
+        # not cover: cached results stay valid and are carried over to the new version.
+        with self._cache_write():
+            archived = self.booking_repo.archive_expired(before)
+        if archived:
+            logger.info("Archived %s bookings that ended before %s", archived, before)
+        return archived
+
     def validate_booking_dates(self, start_date: date, end_date: date) -> None:
         """Validate booking dates with descriptive error messages"""
         today = date.today()
@@ -30,102 +177,319 @@ class BookingUseCases:
                 f"Start date ({start_date}) cannot be after end date ({end_date})"
             )
 
+        if (end_date - start_date).days >= MAX_BOOKING_DAYS:
+            raise InvalidDateRangeError(
+                f"Bookings can last at most {MAX_BOOKING_DAYS} days. "
+                f"Selected dates: {start_date} to {end_date}"
+            )
+
     def is_car_booked(self, car_id: UUID, start_date: date, end_date: date) -> bool:
         """Check if a car is already booked for the given date range"""
-        bookings = self.booking_repo.get_by_car_id(car_id)
-        
-        for booking in bookings:
-            try:
-                existing_start = date.fromisoformat(booking['start_date'])
-                existing_end = date.fromisoformat(booking['end_date'])
-                
-                if not (end_date < existing_start or start_date > existing_end):
-                    logger.info(
-                        f"Car {car_id} has overlapping booking: "
-                        f"{existing_start} to {existing_end} conflicts with "
-                        f"{start_date} to {end_date}"
-                    )
-                    return True
-                    
-            except (ValueError, KeyError) as e:
-                logger.warning(f"Invalid booking data format: {e}")
-                continue
-        
+        booking = self.booking_repo.find_overlapping(car_id, start_date, end_date)
+
+        if booking:
+            logger.info(
+                "Car %s has overlapping booking: %s to %s conflicts with %s to %s",
+                car_id, booking['start_date'], booking['end_date'], start_date, end_date
+            )
+            return True
+
         return False
 
-    def _check_car_availability(self, car_id: UUID) -> None:
+    def _check_car_availability(self, car_id: UUID) -> Dict:
         """Check if car exists and is available with descriptive errors"""
         car = self.car_repo.get_by_id(car_id)
         
         if not car:
-            logger.warning(f"Car {car_id} not found in database")
+            logger.warning("Car %s not found in database", car_id)
             raise CarNotAvailableError(f"Car with ID {car_id} was not found")
         
-        if car['status'] != CarStatus.AVAILABLE:
+        if car['status'] == CarStatus.MAINTENANCE:
             current_status = car['status']
-            logger.info(f"Car {car_id} is not available. Current status: {current_status}")
+            logger.info("Car %s is not available. Current status: %s", car_id, current_status)
             raise CarNotAvailableError(
                 f"Car with ID {car_id} is not available. Current status: {current_status}"
             )
 
+        return car
+
     def is_car_available_for_dates(self, car_id: UUID, start_date: date, end_date: date) -> bool:
         """Check if car is available for the specific date range"""
 
         if self.is_car_booked(car_id, start_date, end_date):
             logger.info(
-                f"Car {car_id} is already booked for the selected dates: "
-                f"{start_date} to {end_date}"
+                "Car %s is already booked for the selected dates: %s to %s",
+                car_id, start_date, end_date
             )
             return False
         
         return True
 
+    def alternative_windows(self, car_id: UUID, start_date: date, end_date: date) -> List[Dict]:
+        """
+        Free windows of the car as long as the requested one, nearest to it first, from
+        today onwards and within ALTERNATIVE_SEARCH_DAYS of the requested dates.
+        """
+        length = (end_date - start_date).days + 1
+        first_day = max(date.today(), start_date - timedelta(days=ALTERNATIVE_SEARCH_DAYS))
+        last_day = date.fromordinal(min(end_date.toordinal() + ALTERNATIVE_SEARCH_DAYS, date.max.toordinal()))
+        booked = merge_spans(self.booking_repo.get_car_intervals(car_id, first_day, last_day))
+        windows = nearest_free_windows(
+            booked, start_date.toordinal(), length, first_day.toordinal(), last_day.toordinal(), ALTERNATIVE_COUNT
+        )
+        return [{"start_date": date.fromordinal(start), "end_date": date.fromordinal(end)} for start, end in windows]
+
+    def _validate_booking_request(self, booking_req: BookingRequest) -> Dict:
+        """Run every check a booking request must pass against stored data; returns the car"""
+        car = self._check_car_availability(booking_req.car_id)
+        logger.info("Car %s status validation passed", booking_req.car_id)
+
+        self.validate_booking_dates(booking_req.start_date, booking_req.end_date)
+        logger.info("Booking date validation passed")
+
+        if not self.is_car_available_for_dates(booking_req.car_id, booking_req.start_date, booking_req.end_date):
+            alternatives = self.alternative_windows(booking_req.car_id, booking_req.start_date, booking_req.end_date)
+            nearest = (
+                f". Nearest free dates: {alternatives[0]['start_date']} to {alternatives[0]['end_date']}"
+                if alternatives else ""
+            )
+            raise BookingConflictError(
+                f"Car {booking_req.car_id} is already booked for the selected dates: "
+                f"{booking_req.start_date} to {booking_req.end_date}{nearest}",
+                alternatives
+            )
+        logger.info("Car availability for dates validation passed")
+        return car
+
+    @contextmanager
+    def _cache_write(self) -> Iterator[List[BookedCar]]:
+        """
+        Wrap a write so the availability cache learns what it touched: the body adds the
+        cars it booked to the yielded list, reported once the write is done. A write
+        that fails part way clears the cache instead.
+        """
+        if self.cache is None:
+            yield []
+            return
+        self.cache.begin_write()
+        try:
+            version_before = self.booking_repo.data_version()
+            booked: List[BookedCar] = []
+            yield booked
+        except BaseException:
+            self.cache.abort_write()
+            raise
+        self.cache.record_bookings(booked, version_before, self.booking_repo.data_version())
+
+    def _build_booking_data(self, booking_req: BookingRequest) -> Dict:
+        booking_data = booking_req.model_dump()
+        booking_data['id'] = uuid4()
+        booking_data['created_at'] = datetime.now().isoformat()
+        return booking_data
+
     def create_booking(self, booking_req: BookingRequest) -> Dict:
         """Create a new booking with comprehensive validation"""
         try:
             logger.info(
-                f"Starting booking creation for car {booking_req.car_id} "
-                f"from {booking_req.start_date} to {booking_req.end_date}"
+                "Starting booking creation for car %s from %s to %s",
+                booking_req.car_id, booking_req.start_date, booking_req.end_date
             )
             
-            self._check_car_availability(booking_req.car_id)
-            logger.info(f"Car {booking_req.car_id} status validation passed")
-            
-            self.validate_booking_dates(booking_req.start_date, booking_req.end_date)
-            logger.info("Booking date validation passed")
-            
-            if not self.is_car_available_for_dates(booking_req.car_id, booking_req.start_date, booking_req.end_date):
-                raise CarNotAvailableError(
-                    f"Car {booking_req.car_id} is already booked for the selected dates: "
-                    f"{booking_req.start_date} to {booking_req.end_date}"
-                )
-            logger.info("Car availability for dates validation passed")
-            
-            booking_data = booking_req.model_dump()
-            booking_data['id'] = uuid4()
-            booking_data['created_at'] = datetime.now().isoformat()
-            
-            logger.info(f"Creating booking with ID: {booking_data['id']}")
-            
-            created_booking = self.booking_repo.create(booking_data)
-            
-            self.car_repo.update_status(booking_req.car_id, CarStatus.RESERVED)
-            logger.info(f"Car {booking_req.car_id} status updated to {CarStatus.RESERVED}")
+            with self.booking_repo.lock_cars([booking_req.car_id]):
+                car = self._validate_booking_request(booking_req)
+
+                booking_data = self._build_booking_data(booking_req)
+
+                logger.info("Creating booking with ID: %s", booking_data['id'])
+
+                with self._cache_write() as booked:
+                    created_booking = self.booking_repo.create(booking_data)
+
+                    self.car_repo.update_status(booking_req.car_id, CarStatus.RESERVED)
+                    logger.info("Car %s status updated to %s", booking_req.car_id, CarStatus.RESERVED)
+
+                    booked.append(BookedCar(
+                        str(booking_req.car_id), booking_req.start_date, booking_req.end_date,
+                        status_changed=car['status'] != CarStatus.RESERVED
+                    ))
             
             logger.info(
-                f"Booking {created_booking['id']} created successfully for "
-                f"car {booking_req.car_id} from {booking_req.start_date} to {booking_req.end_date}"
+                "Booking %s created successfully for car %s from %s to %s",
+                created_booking['id'], booking_req.car_id, booking_req.start_date, booking_req.end_date
             )
-            
+            BOOKING_ATTEMPTS.inc("created")
+
             return created_booking
             
         except (CarNotAvailableError, InvalidDateRangeError) as e:
-            logger.error(f"Booking creation failed: {str(e)}")
+            BOOKING_ATTEMPTS.inc(_failure_outcome(e))
+            logger.error("Booking creation failed: %s", e)
             raise
         except Exception as e:
+            BOOKING_ATTEMPTS.inc("error")
             logger.error(
-                f"Unexpected error in create_booking: {str(e)}", 
+                "Unexpected error in create_booking: %s", e,
                 exc_info=True,
                 extra={'car_id': booking_req.car_id if 'booking_req' in locals() else 'unknown'}
             )
-            raise
\ No newline at end of file
+            raise
+
+    def create_bookings(self, booking_reqs: List[BookingRequest]) -> List[Dict]:
+        """
+        Create a batch of bookings, validating each one against stored data and
+        against the bookings accepted earlier in the same batch. Accepted bookings
+        are committed together; the result lists the outcome of every request.
+        """
+        logger.info("Starting batch booking creation for %s bookings", len(booking_reqs))
+
+        results: List[Dict] = []
+        accepted: List[Dict] = []
+        booked: List[BookedCar] = []
+        accepted_by_car: Dict[UUID, List[Tuple[int, BookingRequest]]] = {}
+
+        with self.booking_repo.lock_cars({booking_req.car_id for booking_req in booking_reqs}):
+            for index, booking_req in enumerate(booking_reqs):
+                try:
+                    car = self._validate_booking_request(booking_req)
+
+                    for other_index, other in accepted_by_car.get(booking_req.car_id, []):
+                        if not (booking_req.end_date < other.start_date or booking_req.start_date > other.end_date):
+                            raise BookingConflictError(
+                                f"Car {booking_req.car_id} is already booked for the selected dates: "
+                                f"{booking_req.start_date} to {booking_req.end_date} "
+                                f"(conflicts with booking {other_index} of this batch)"
+                            )
+
+                    booking_data = self._build_booking_data(booking_req)
+                    accepted.append(booking_data)
+                    accepted_by_car.setdefault(booking_req.car_id, []).append((index, booking_req))
+                    booked.append(BookedCar(
+                        str(booking_req.car_id), booking_req.start_date, booking_req.end_date,
+                        status_changed=car['status'] != CarStatus.RESERVED
+                    ))
+                    results.append({"index": index, "status": "created", "data": booking_data})
+                except (CarNotAvailableError, InvalidDateRangeError) as e:
+                    BOOKING_ATTEMPTS.inc(_failure_outcome(e))
+                    logger.error("Booking %s of batch rejected: %s", index, e)
+                    results.append({
+                        "index": index,
+                        "status": "failed",
+                        "error": str(e),
+                        "alternatives": getattr(e, "alternatives", None) or None,
+                    })
+
+            if accepted:
+                with self._cache_write() as written:
+                    self.booking_repo.create_many(accepted)
+                    self.car_repo.update_status_many(list(accepted_by_car), CarStatus.RESERVED)
+                    written.extend(booked)
+                BOOKING_ATTEMPTS.inc("created", amount=len(accepted))
+
+        logger.info(
+            "Batch booking finished: %s created, %s failed",
+            len(accepted), len(booking_reqs) - len(accepted)
+        )
+        return results
+
+
+class AsyncBookingUseCases:
+    """
+    Async counterpart of BookingUseCases. Reads await the async repository; booking
+    creation runs the blocking BookingUseCases in a worker thread, because its
+    check-then-write holds per-car locks that must not be taken on the event loop.
+    """
+
+    def __init__(
+        self,
+        booking_repo: IAsyncBookingRepository,
+        booking_use_cases: BookingUseCases,
+        limiter: anyio.CapacityLimiter
+    ):
+        self.booking_repo = booking_repo
+        self.booking_use_cases = booking_use_cases
+        self.limiter = limiter
+
+    async def data_version(self) -> int:
+        return await self.booking_repo.data_version()
+
+    async def get_all_bookings(self) -> List[Dict]:
+        """Get all bookings"""
+        return await self.booking_repo.get_all()
+
+    async def get_booking(self, booking_id: UUID) -> Dict:
+        """Get one booking, active or archived, by id"""
+        return _found(await self.booking_repo.get_by_id(booking_id), booking_id)
+
+    async def list_bookings(
+        self, filters: BookingFilters, after: Optional[str], limit: int, archived: bool = False
+    ) -> Page:
+        """One page of active (or archived) bookings matching the filters, starting after the booking with id `after`."""
+        _validate_filter_window(filters)
+        find = self.booking_repo.find_archived if archived else self.booking_repo.find
+        return Page.from_lookahead(await find(filters, after, limit + 1), limit)
+
+    def export_bookings(
+        self, filters: BookingFilters, batch_size: int = EXPORT_BATCH_SIZE, archived: bool = False
+    ) -> AsyncIterator[bytes]:
+        """
+        NDJSON lines of every active (or archived) booking matching the filters. The
+        filters are checked up front; the bookings are then read one cursor page at a
+        time while the lines are consumed, so memory stays bounded by the batch size.
+        """
+        _validate_filter_window(filters)
+        find = self.booking_repo.find_archived if archived else self.booking_repo.find
+        return self._export_pages(find, filters, batch_size)
+
+    async def _export_pages(
+        self, find: Callable[..., Awaitable[List[Dict]]], filters: BookingFilters, batch_size: int
+    ) -> AsyncIterator[bytes]:
+        cursor = _ExportCursor()
+        while True:
+            try:
+                bookings = await find(filters, cursor.after, batch_size)
+            except InvalidCursorError:
+                # Only active bookings are ever moved away: the archive only grows.
+                logger.info("Export cursor %s was archived, resuming from %s", cursor.after, cursor.resume())
+                bookings = await find(filters, cursor.after, batch_size)
+            if not bookings:
+                return
+            yield "".join(
+                json.dumps(booking, default=str, separators=(",", ":")) + "\n" for booking in bookings
+            ).encode()
+            if len(bookings) < batch_size:
+                return
+            cursor.advance(bookings)
+
+    async def occupancy_report(self, start_date: date, end_date: date, peaks: int = 5) -> Dict:
+        """Fleet occupancy between two dates, computed in a worker thread off the event loop"""
+        return await run_in_storage_thread(
+            self.booking_use_cases.occupancy_report, start_date, end_date, peaks, limiter=self.limiter
+        )
+
+    async def archive_expired_bookings(self, before: Optional[date] = None) -> int:
+        """Move bookings that ended before `before` (default: today) out of the active set"""
+        return await run_in_storage_thread(
+            self.booking_use_cases.archive_expired_bookings, before, limiter=self.limiter
+        )
+
+    async def create_booking(self, booking_req: BookingRequest) -> Dict:
+        """Create a new booking with comprehensive validation"""
+        return await run_in_storage_thread(
+            self.booking_use_cases.create_booking, booking_req, limiter=self.limiter
+        )
+
+    async def create_bookings(self, booking_reqs: List[BookingRequest]) -> List[Dict]:
+        """Create a batch of bookings, reporting the outcome of each one"""
+        return await run_in_storage_thread(
+            self.booking_use_cases.create_bookings, booking_reqs, limiter=self.limiter
+        )
+
+
+async def archive_periodically(booking_use_cases: AsyncBookingUseCases, interval_seconds: float) -> None:
+    """Archive expired bookings right away and then every `interval_seconds`, until cancelled."""
+    while True:
+        try:
+            await booking_use_cases.archive_expired_bookings()
+        except Exception as e:
+            logger.error("Archiving expired bookings failed: %s", e, exc_info=True)
+        await anyio.sleep(interval_seconds)
@@ -1,33 +1,261 @@
-from app.core.interfaces.repositories import ICarRepository
-from app.core.exceptions import InvalidDateRangeError
+from app.core.availability_cache import AvailabilityCache
+from app.core.interfaces.repositories import ICarRepository, IAsyncCarRepository
+from app.core.exceptions import InvalidDateRangeError, RecordNotFoundError
 from app.core.logger.setup_logger import logger
-from datetime import date
-from typing import List, Dict
-from app.core.interfaces.repositories import IBookingRepository
+from datetime import date, timedelta
+from uuid import UUID
+from typing import Awaitable, Callable, List, Dict, Optional, Set, Tuple
+from app.core.interfaces.repositories import IBookingRepository, IAsyncBookingRepository
 from app.core.models.car_model import CarStatus
+from app.core.models.pagination import CarFilters, Page
+from app.core.car_calendar import Span, clip_spans, free_spans, merge_spans, nearest_free_windows
+from app.core.occupancy import free_day_bitmaps
+
+MAX_CALENDAR_DAYS = 366
+
+
+def _validate_availability_dates(start_date: date, end_date: date) -> None:
+    if start_date < date.today():
+        raise InvalidDateRangeError("Cannot check availability for past dates")
+
+    if start_date > end_date:
+        raise InvalidDateRangeError(
+            f"Start date ({start_date}) cannot be after end date ({end_date})"
+        )
+
+
+def _validate_calendar_dates(start_date: date, end_date: date) -> None:
+    _validate_availability_dates(start_date, end_date)
+    if (end_date - start_date).days >= MAX_CALENDAR_DAYS:
+        raise InvalidDateRangeError(f"Availability calendars cover at most {MAX_CALENDAR_DAYS} days")
+
+
+def _availability_calendar(
+    cars: List[Dict], intervals: List[Tuple[str, int, int]], start_date: date, end_date: date
+) -> List[Dict]:
+    bookable = [car for car in cars if car['status'] != CarStatus.MAINTENANCE]
+    bitmaps = free_day_bitmaps(
+        [str(car['id']) for car in bookable], intervals, start_date.toordinal(), end_date.toordinal()
+    )
+    return [{"car": car, "free_days": bitmap} for car, bitmap in zip(bookable, bitmaps)]
+
+
+def _windows(spans: List[Span]) -> List[Dict]:
+    return [{"start_date": date.fromordinal(start), "end_date": date.fromordinal(end)} for start, end in spans]
+
+
+def _calendar_search_end(start_date: date, end_date: date, free_for: Optional[int]) -> date:
+    """Last day to read bookings for: the window, or further when searching for a free window."""
+    if free_for is None:
+        return end_date
+    search_end = min(start_date.toordinal() + MAX_CALENDAR_DAYS + free_for - 2, date.max.toordinal())
+    return max(end_date, date.fromordinal(search_end))
+
+
+def _car_calendar(
+    car: Dict, intervals: List[Span], start_date: date, end_date: date, free_for: Optional[int]
+) -> Dict:
+    """
+    Merged booked and free stretches of the car over the window and, when `free_for` is
+    given, the first run of that many free days starting within MAX_CALENDAR_DAYS of
+    start_date. A car in maintenance has no free days.
+    """
+    first_day, last_day = start_date.toordinal(), end_date.toordinal()
+    booked = merge_spans(intervals)
+    bookable = car['status'] != CarStatus.MAINTENANCE
+    calendar = {
+        "car_id": car['id'],
+        "start_date": start_date,
+        "end_date": end_date,
+        "booked": _windows(clip_spans(booked, first_day, last_day)),
+        "free": _windows(free_spans(booked, first_day, last_day)) if bookable else [],
+        "next_free_window": None,
+    }
+    if free_for is not None and bookable:
+        search_end = _calendar_search_end(start_date, end_date, free_for).toordinal()
+        windows = _windows(nearest_free_windows(booked, first_day, free_for, first_day, search_end, 1))
+        calendar["next_free_window"] = windows[0] if windows else None
+    return calendar
+
+
+def _found(car: Optional[Dict], car_id: UUID) -> Dict:
+    if car is None:
+        raise RecordNotFoundError(f"Car with ID {car_id} was not found")
+    return car
+
+
+def _listed_cars(cars: List[Dict]) -> List[Dict]:
+    return [car for car in cars if car['status'] == CarStatus.AVAILABLE]
+
+
+def _cars_not_booked(cars: List[Dict], booked_car_ids: Set[str]) -> List[Dict]:
+    return [
+        car for car in cars
+        if car['id'] not in booked_car_ids and car['status'] != CarStatus.MAINTENANCE
+    ]
+
 
 class CarUseCases:
-    def __init__(self, car_repo: ICarRepository, booking_repo: IBookingRepository):
+    def __init__(
+        self,
+        car_repo: ICarRepository,
+        booking_repo: IBookingRepository,
+        cache: Optional[AvailabilityCache] = None
+    ):
         self.car_repo = car_repo
         self.booking_repo = booking_repo
+        self.cache = cache
+
+    def data_version(self) -> int:
+        return self.car_repo.data_version()
 
     def get_all_cars(self) -> List[Dict]:
-        return[car for car in self.car_repo.get_all() if car['status'] == CarStatus.AVAILABLE] 
+        return _listed_cars(self.car_repo.get_all())
+
+    def get_car(self, car_id: UUID) -> Dict:
+        """Get one car by id, whatever its status"""
+        return _found(self.car_repo.get_by_id(car_id), car_id)
+
+    def list_cars(self, filters: CarFilters, after: Optional[str], limit: int) -> Page:
+        """One page of cars matching the filters, starting after the car with id `after`."""
+        return Page.from_lookahead(self.car_repo.find(filters, after, limit + 1), limit)
+
+    def get_car_calendar(
+        self, car_id: UUID, start_date: date, end_date: date, free_for: Optional[int] = None
+    ) -> Dict:
+        """Booked and free stretches of one car, optionally with its next run of `free_for` free days"""
+        _validate_calendar_dates(start_date, end_date)
+        car = _found(self.car_repo.get_by_id(car_id), car_id)
+        intervals = self.booking_repo.get_car_intervals(
+            car_id, start_date, _calendar_search_end(start_date, end_date, free_for)
+        )
+        return _car_calendar(car, intervals, start_date, end_date, free_for)
 
     def get_available_cars(self, target_date: date):
-        logger.info(f"Getting available cars for {target_date}")
-        
-        if target_date < date.today():
-            raise InvalidDateRangeError("Cannot check availability for past dates")
+        logger.info("Getting available cars for %s", target_date)
         
-        all_cars = self.car_repo.get_all()
-        bookings = self.booking_repo.get_all()
-         
-        booked_car_ids = {booking['car_id'] for booking in bookings}
-        
-        available_cars = [
-            car for car in all_cars 
-            if car['id'] not in booked_car_ids and car['status'] == CarStatus.AVAILABLE
-        ]
-        
-        return available_cars
\ No newline at end of file
+        _validate_availability_dates(target_date, target_date)
+
+        return self._available_cars(
+            target_date, target_date,
+            lambda: self.booking_repo.get_booked_car_ids(target_date, target_date)
+        )
+
+    def get_available_cars_for_range(self, start_date: date, end_date: date) -> List[Dict]:
+        """Cars that are free on every day from start_date to end_date, inclusive."""
+        logger.info("Getting available cars from %s to %s", start_date, end_date)
+
+        _validate_availability_dates(start_date, end_date)
+
+        return self._available_cars(
+            start_date, end_date,
+            lambda: self.booking_repo.get_booked_car_ids(start_date, end_date)
+        )
+
+    def get_availability_calendar(self, start_date: date, end_date: date) -> List[Dict]:
+        """Free days of every bookable car over the window, from one read of the bookings overlapping it."""
+        logger.info("Getting availability calendar from %s to %s", start_date, end_date)
+
+        _validate_calendar_dates(start_date, end_date)
+
+        return _availability_calendar(
+            self.car_repo.get_all(), self.booking_repo.get_booking_intervals(start_date, end_date),
+            start_date, end_date
+        )
+
+    def _available_cars(
+        self, start_date: date, end_date: date, booked_car_ids: Callable[[], Set[str]]
+    ) -> List[Dict]:
+        if self.cache is None:
+            return _cars_not_booked(self.car_repo.get_all(), booked_car_ids())
+
+        version = self.car_repo.data_version()
+        cars = self.cache.get(start_date, end_date, version)
+        if cars is None:
+            cars = _cars_not_booked(self.car_repo.get_all(), booked_car_ids())
+            self.cache.put(start_date, end_date, version, cars)
+        return cars
+
+
+class AsyncCarUseCases:
+    """Async counterpart of CarUseCases, awaiting storage instead of blocking on it."""
+
+    def __init__(
+        self,
+        car_repo: IAsyncCarRepository,
+        booking_repo: IAsyncBookingRepository,
+        cache: Optional[AvailabilityCache] = None
+    ):
+        self.car_repo = car_repo
+        self.booking_repo = booking_repo
+        self.cache = cache
+
+    async def data_version(self) -> int:
+        return await self.car_repo.data_version()
+
+    async def get_all_cars(self) -> List[Dict]:
+        return _listed_cars(await self.car_repo.get_all())
+
+    async def get_car(self, car_id: UUID) -> Dict:
+        """Get one car by id, whatever its status"""
+        return _found(await self.car_repo.get_by_id(car_id), car_id)
+
+    async def list_cars(self, filters: CarFilters, after: Optional[str], limit: int) -> Page:
+        """One page of cars matching the filters, starting after the car with id `after`."""
+        return Page.from_lookahead(await self.car_repo.find(filters, after, limit + 1), limit)
+
+    async def get_car_calendar(
+        self, car_id: UUID, start_date: date, end_date: date, free_for: Optional[int] = None
+    ) -> Dict:
+        """Booked and free stretches of one car, optionally with its next run of `free_for` free days"""
+        _validate_calendar_dates(start_date, end_date)
+        car = _found(await self.car_repo.get_by_id(car_id), car_id)
+        intervals = await self.booking_repo.get_car_intervals(
+            car_id, start_date, _calendar_search_end(start_date, end_date, free_for)
+        )
+        return _car_calendar(car, intervals, start_date, end_date, free_for)
+
+    async def get_available_cars(self, target_date: date) -> List[Dict]:
+        logger.info("Getting available cars for %s", target_date)
+
+        _validate_availability_dates(target_date, target_date)
+
+        return await self._available_cars(
+            target_date, target_date,
+            lambda: self.booking_repo.get_booked_car_ids(target_date, target_date)
+        )
+
+    async def get_available_cars_for_range(self, start_date: date, end_date: date) -> List[Dict]:
+        """Cars that are free on every day from start_date to end_date, inclusive."""
+        logger.info("Getting available cars from %s to %s", start_date, end_date)
+
+        _validate_availability_dates(start_date, end_date)
+
+        return await self._available_cars(
+            start_date, end_date,
+            lambda: self.booking_repo.get_booked_car_ids(start_date, end_date)
+        )
+
+    async def get_availability_calendar(self, start_date: date, end_date: date) -> List[Dict]:
+        """Free days of every bookable car over the window, from one read of the bookings overlapping it."""
+        logger.info("Getting availability calendar from %s to %s", start_date, end_date)
+
+        _validate_calendar_dates(start_date, end_date)
+
+        return _availability_calendar(
+            await self.car_repo.get_all(), await self.booking_repo.get_booking_intervals(start_date, end_date),
+            start_date, end_date
+        )
+
+    async def _available_cars(
+        self, start_date: date, end_date: date, booked_car_ids: Callable[[], Awaitable[Set[str]]]
+    ) -> List[Dict]:
+        if self.cache is None:
+            return _cars_not_booked(await self.car_repo.get_all(), await booked_car_ids())
+
+        version = await self.car_repo.data_version()
+        cars = self.cache.get(start_date, end_date, version)
+        if cars is None:
+            cars = _cars_not_booked(await self.car_repo.get_all(), await booked_car_ids())
+            self.cache.put(start_date, end_date, version, cars)
+        return cars
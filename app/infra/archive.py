@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from app.core.exceptions import InvalidCursorError
+from app.core.logger.setup_logger import logger
+from app.core.metrics import STORAGE_BYTES, storage_operation
+from app.core.models.pagination import BookingFilters
+from app.infra.records import BookingRecord, json_default
+
+
+class BookingArchive:
+    """
+    Bookings moved out of the working set of a JSON database, kept in a file of their own.
+
+    Nothing on the booking or availability paths reads the archive: it is only loaded
+    when historical bookings are asked for, and then cached until the file changes.
+    Appends are made by the owning database while it holds its write lock.
+    """
+
+    def __init__(self, file_path: Path, metrics_backend: str = "json"):
+        self.file_path = Path(file_path)
+        self.metrics_backend = metrics_backend
+        self._lock = threading.RLock()
+        self._bookings: Optional[List[BookingRecord]] = None
+        self._positions: Dict[str, int] = {}
+        self._key: Optional[Tuple[int, int, int]] = None
+
+    def _stat_key(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load(self) -> List[BookingRecord]:
+        key = self._stat_key()
+        with self._lock:
+            if self._bookings is None or key != self._key:
+                bookings = []
+                if key is not None:
+                    with storage_operation(self.metrics_backend, "read_archive"):
+                        with open(self.file_path, "rb") as file:
+                            bookings = json.load(file).get("bookings", [])
+                            STORAGE_BYTES.inc(self.metrics_backend, "read_archive", amount=file.tell())
+                self._bookings = [BookingRecord.from_dict(booking) for booking in bookings]
+                self._positions = {booking.id: position for position, booking in enumerate(self._bookings)}
+                self._key = key
+            return self._bookings
+
+    def append(self, bookings: List[BookingRecord]) -> int:
+        """
+        Add bookings to the archive, skipping those already in it, so an archiving run
+        interrupted before the working set was rewritten can safely be repeated.
+        """
+        with self._lock:
+            archived = self._load()
+            new = [booking for booking in bookings if booking.id not in self._positions]
+            if not new:
+                return 0
+            payload = json.dumps({"bookings": archived + new}, indent=4, default=json_default).encode()
+            tmp_path = self.file_path.with_suffix(".tmp")
+            try:
+                with storage_operation(self.metrics_backend, "write_archive"):
+                    with open(tmp_path, "wb") as file:
+                        file.write(payload)
+                        file.flush()
+                        os.fsync(file.fileno())
+                    os.replace(tmp_path, self.file_path)
+            except Exception as e:
+                logger.error("Error writing booking archive: %s", e)
+                self._bookings = None
+                raise
+            STORAGE_BYTES.inc(self.metrics_backend, "write_archive", amount=len(payload))
+            self._bookings = None
+            return len(new)
+
+    def get_by_id(self, booking_id: str) -> Optional[Dict]:
+        with self._lock:
+            bookings = self._load()
+            position = self._positions.get(booking_id)
+            return bookings[position].to_dict() if position is not None else None
+
+    def get_all(self) -> List[Dict]:
+        with self._lock:
+            return [booking.to_dict() for booking in self._load()]
+
+    def intervals(self, start_date: date, end_date: date) -> List[Tuple[str, int, int]]:
+        """(car id, start, end) ordinals of the archived bookings overlapping the inclusive range."""
+        window_start, window_end = start_date.toordinal(), end_date.toordinal()
+        with self._lock:
+            return [
+                (booking.car_id, booking.start, booking.end)
+                for booking in self._load()
+                if booking.start is not None and booking.start <= window_end and booking.end >= window_start
+            ]
+
+    def find(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[Dict]:
+        """Archived bookings matching the filters, in archiving order, after the booking with id `after`."""
+        with self._lock:
+            bookings = self._load()
+            if after is not None and after not in self._positions:
+                raise InvalidCursorError(f"Unknown cursor: {after}")
+            first = self._positions[after] + 1 if after is not None else 0
+            car_id = str(filters.car_id) if filters.car_id is not None else None
+            window_start = filters.start_date.toordinal() if filters.start_date else None
+            window_end = filters.end_date.toordinal() if filters.end_date else None
+
+            result = []
+            for position in range(first, len(bookings)):
+                booking = bookings[position]
+                if car_id is not None and booking.car_id != car_id:
+                    continue
+                if window_start is not None or window_end is not None:
+                    if booking.start is None:
+                        continue
+                    if window_end is not None and booking.start > window_end:
+                        continue
+                    if window_start is not None and booking.end < window_start:
+                        continue
+                result.append(booking.to_dict())
+                if len(result) == limit:
+                    break
+            return result
@@ -1,178 +1,401 @@
 import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
 from app.core.logger.setup_logger import logger
 from pathlib import Path
-from typing import Dict, List, Any
-from uuid import uuid4, UUID
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set, Tuple
+from uuid import UUID
+from datetime import date
+from app.core.exceptions import InvalidCursorError
 from app.core.models.car_model import CarStatus
+from app.core.models.pagination import CarFilters, BookingFilters
+from app.infra.seed import initial_cars
+from app.infra.archive import BookingArchive
+from app.infra.indexes import CarIntervalIndex, DailyBookingIndex, PositionIndex, positions_after
+from app.infra.records import BookingRecord, CarRecord, json_default
+from app.infra.locks import CarLocks, FileLock
+from app.core.metrics import STORAGE_BYTES, storage_operation
+
+CAR_FILTER_FIELDS = ("brand", "model", "year", "status")
 
 
 class JSONDatabase:
+    metrics_backend = "json"
+
     def __init__(self, file_path: str = "app/data/db.json"):
-        self.file_path = Path(file_path)
+        self._init_state(file_path)
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
-        self._ensure_file_exists()
+        self._write_lock = FileLock(self.file_path.with_suffix(".lock"))
+        self.car_locks = CarLocks(self.file_path.with_suffix(".locks"))
+        with self._writing():
+            self._ensure_file_exists()
+
+    def _init_state(self, file_path: str) -> None:
+        """In-memory state only: nothing on disk is created, opened or locked."""
+        self.file_path = Path(file_path)
+        self._lock = threading.RLock()
+        self._snapshot: Optional[Dict[str, List[Any]]] = None
+        self._snapshot_key: Optional[Tuple[int, int, int]] = None
+        self._cars_by_id: Dict[str, CarRecord] = {}
+        self._car_positions: Dict[str, int] = {}
+        self._car_fields = PositionIndex()
+        self._booking_positions: Dict[str, int] = {}
+        self._bookings_by_car = PositionIndex()
+        self._intervals = CarIntervalIndex()
+        self._days = DailyBookingIndex()
+        self.archive = BookingArchive(self.file_path.with_suffix(".archive.json"), self.metrics_backend)
 
     def _ensure_file_exists(self):
         """Create a new file if it doesn't exist"""
         if not self.file_path.exists():
             initial_data = {
-                "cars": [
-                    {
-                        "id": uuid4(),
-                        "brand": "Toyota",
-                        "model": "Chaser",
-                        "engine": "JZX100 1JZ-GTE",
-                        "version": "Tourer V",
-                        "year": "1998",
-                        "status": CarStatus.AVAILABLE,
-                    },
-                    {
-                        "id": uuid4(),
-                        "brand": "Toyota",
-                        "model": "Supra",
-                        "engine": "2JZ-GTE",
-                        "version": "MK4",
-                        "year": "1996",
-                        "status": CarStatus.AVAILABLE,
-                    },
-                    {
-                        "id": uuid4(),
-                        "brand": "BMW",
-                        "model": "M3",
-                        "engine": "S54B32",
-                        "version": "E46",
-                        "year": 2003,
-                        "status": CarStatus.MAINTENANCE,
-                    },
-                    {
-                        "id": uuid4(),
-                        "brand": "Nissan",
-                        "model": "Skyline GT-R",
-                        "engine": "RB26DETT",
-                        "version": "R34",
-                        "year": "1999",
-                        "status": CarStatus.RESERVED,
-                    },
-                    {
-                        "id": uuid4(),
-                        "brand": "Mazda",
-                        "model": "RX-7",
-                        "engine": "13B-REW",
-                        "version": "FD3S",
-                        "year": "1998",
-                        "status": CarStatus.AVAILABLE,
-                    },
-                    {
-                        "id": uuid4(),
-                        "brand": "Honda",
-                        "model": "NSX",
-                        "engine": "C30A",
-                        "version": "Type R",
-                        "year": "1992",
-                        "status": CarStatus.MAINTENANCE,
-                    },
-                    {
-                        "id": uuid4(),
-                        "brand": "Subaru",
-                        "model": "Impreza WRX STI",
-                        "engine": "EJ207",
-                        "version": "GDBC",
-                        "year": "2005",
-                        "status": CarStatus.AVAILABLE,
-                    },
-                    {
-                        "id": uuid4(),
-                        "brand": "Mitsubishi",
-                        "model": "Lancer Evolution",
-                        "engine": "4G63T",
-                        "version": "IX",
-                        "year": "2005",
-                        "status": CarStatus.RESERVED,
-                    },
-                    {
-                        "id": uuid4(),
-                        "brand": "Nissan",
-                        "model": "Silvia",
-                        "engine": "SR20DET",
-                        "version": "S15",
-                        "year": "1999",
-                        "status": CarStatus.AVAILABLE,
-                    },
-                    {
-                        "id": uuid4(),
-                        "brand": "Toyota",
-                        "model": "MR2",
-                        "engine": "3S-GTE",
-                        "version": "SW20",
-                        "year": "1993",
-                        "status": CarStatus.MAINTENANCE,
-                    },
-                    {
-                        "id": uuid4(),
-                        "brand": "Honda",
-                        "model": "Civic Type R",
-                        "engine": "K20A",
-                        "version": "EP3",
-                        "year": "2004",
-                        "status": CarStatus.AVAILABLE,
-                    },
-                    {
-                        "id": uuid4(),
-                        "brand": "Nissan",
-                        "model": "350Z",
-                        "engine": "VQ35DE",
-                        "version": "Z33",
-                        "year": "2005",
-                        "status": CarStatus.AVAILABLE,
-                    },
-                ],
+                "cars": initial_cars(),
                 "bookings": [],
             }
             self._write_data(initial_data)
-            logger.info(f"Created new database file at {self.file_path}")
+            logger.info("Created new database file at %s", self.file_path)
 
     def _read_data(self) -> Dict[str, List[Any]]:
         try:
-            with open(self.file_path, "r") as file:
-                return json.load(file)
+            with storage_operation(self.metrics_backend, "read_file"):
+                with open(self.file_path, "rb") as file:
+                    data = json.load(file)
+                    STORAGE_BYTES.inc(self.metrics_backend, "read_file", amount=file.tell())
+                return data
         except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.error(f"Error reading database file: {e}. Returning empty data.")
+            logger.error("Error reading database file: %s. Returning empty data.", e)
             return {"cars": [], "bookings": []}
 
     def _write_data(self, data: Dict[str, List[Any]]):
+        """Write the document atomically, so readers in other processes never see a partial file."""
+        tmp_path = self.file_path.with_suffix(".tmp")
         try:
-            with open(self.file_path, "w") as file:
-                json.dump(data, file, indent=4, default=str)
+            with storage_operation(self.metrics_backend, "write_file"):
+                payload = json.dumps(data, indent=4, default=json_default).encode()
+                with open(tmp_path, "wb") as file:
+                    file.write(payload)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(tmp_path, self.file_path)
+            STORAGE_BYTES.inc(self.metrics_backend, "write_file", amount=len(payload))
         except Exception as e:
-            logger.error(f"Error writing to database file: {e}")
+            logger.error("Error writing to database file: %s", e)
+            raise
+
+    def _stat_key(self) -> Optional[Tuple[int, int, int]]:
+        """Fingerprint of the file on disk used to detect external changes."""
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """
+        Hold the cross-process write lock, then the in-process one. Writers reload the
+        snapshot under this lock, so changes made by other workers are never overwritten.
+        """
+        with self._write_lock, self._lock:
+            yield
+
+    def _load_snapshot(self) -> Dict[str, List[Any]]:
+        """Return the parsed document, re-reading the file only when it changed on disk."""
+        key = self._stat_key()
+        with self._lock:
+            if self._snapshot is None or key != self._snapshot_key:
+                self._set_snapshot(self._read_data(), key)
+            return self._snapshot
+
+    def _set_snapshot(self, data: Dict[str, List[Any]], key: Optional[Tuple[int, int, int]]) -> None:
+        """Load the parsed document into records, so dates are parsed and ids interned only once."""
+        data["cars"] = [CarRecord.from_dict(car) for car in data.get("cars", [])]
+        data["bookings"] = [BookingRecord.from_dict(booking) for booking in data.get("bookings", [])]
+        self._snapshot = data
+        self._snapshot_key = key
+        self._cars_by_id = {car.id: car for car in data["cars"]}
+        self._car_positions = {car.id: position for position, car in enumerate(data["cars"])}
+        self._car_fields.clear()
+        for position, car in enumerate(data["cars"]):
+            for field in CAR_FILTER_FIELDS:
+                self._car_fields.add((field, str(getattr(car, field))), position)
+        self._index_bookings(data["bookings"])
+
+    def _index_bookings(self, bookings: List[BookingRecord]) -> None:
+        self._booking_positions = {}
+        self._bookings_by_car.clear()
+        self._intervals.clear()
+        self._days.clear()
+        for position, booking in enumerate(bookings):
+            self._index_booking(position, booking)
+
+    def _index_booking(self, position: int, booking: BookingRecord) -> None:
+        self._booking_positions[booking.id] = position
+        self._bookings_by_car.add(booking.car_id, position)
+        self._intervals.add(booking)
+        self._days.add(position, booking)
+
+    def _commit(self, data: Dict[str, List[Any]]) -> None:
+        """Persist the snapshot and refresh the cached fingerprint."""
+        try:
+            self._write_data(data)
+        except Exception:
+            self._snapshot = None
             raise
+        self._snapshot_key = self._stat_key()
+
+    def _apply_changes(self, changes: List[Dict[str, Any]]) -> None:
+        """Apply changes to the cached snapshot and persist them in a single write."""
+        if not changes:
+            return
+        with self._writing():
+            data = self._load_snapshot()
+            for change in changes:
+                self._apply_to_snapshot(data, change)
+            self._persist(data, changes)
+
+    def _apply_to_snapshot(self, data: Dict[str, List[Any]], change: Dict[str, Any]) -> None:
+        # Every applied change bumps the data version, so a journal replay in another
+        # process arrives at the same version as the process that made the change.
+        data["version"] = data.get("version", 0) + 1
+        if change["op"] == "add_booking":
+            booking = change["booking"]
+            if not isinstance(booking, BookingRecord):
+                booking = BookingRecord.from_dict(booking)
+            data["bookings"].append(booking)
+            self._index_booking(len(data["bookings"]) - 1, booking)
+        elif change["op"] == "set_status_car":
+            car = self._cars_by_id.get(change["car_id"])
+            if car is not None:
+                position = self._car_positions[change["car_id"]]
+                self._car_fields.remove(("status", str(car.status)), position)
+                car.status = sys.intern(change["status"])
+                self._car_fields.add(("status", str(car.status)), position)
+        elif change["op"] == "archive_bookings":
+            cutoff = date.fromisoformat(change["before"]).toordinal()
+            data["bookings"] = [
+                booking for booking in data["bookings"] if booking.end is None or booking.end >= cutoff
+            ]
+            self._index_bookings(data["bookings"])
+        else:
+            raise ValueError(f"Unknown change operation: {change['op']}")
+
+    def _persist(self, data: Dict[str, List[Any]], changes: List[Dict[str, Any]]) -> None:
+        """Write changes to disk; the whole document is rewritten."""
+        self._commit(data)
+
+    def lock_cars(self, car_ids: Iterable[UUID]):
+        """Context manager serializing booking writes for the given cars across workers."""
+        return self.car_locks.hold(car_ids)
+
+    def data_version(self) -> int:
+        """Number of changes applied to the data so far; it only ever grows."""
+        with self._lock:
+            return self._load_snapshot().get("version", 0)
+
+    # Records never leave the database: callers get dicts built from them, so they can
+    # neither mutate the snapshot nor depend on how it is held in memory.
 
     def get_all_cars(self) -> List[Dict]:
-        data = self._read_data()
-        return data.get("cars", [])
+        with self._lock:
+            return [car.to_dict() for car in self._load_snapshot()["cars"]]
 
-    def get_car_by_id(self, car_id: UUID) -> Dict:
-        data = self._read_data()
-        for car in data.get("cars", []):
-            if car["id"] == str(car_id):
-                return car
-        return None
+    def get_car_by_id(self, car_id: UUID) -> Optional[Dict]:
+        with self._lock:
+            self._load_snapshot()
+            car = self._cars_by_id.get(str(car_id))
+            return car.to_dict() if car is not None else None
 
     def get_all_bookings(self) -> List[Dict]:
-        data = self._read_data()
-        return data.get("bookings", [])
+        with self._lock:
+            return [booking.to_dict() for booking in self._load_snapshot()["bookings"]]
+
+    def get_booking_by_id(self, booking_id: UUID) -> Optional[Dict]:
+        """Active booking by id, falling back to the archive for bookings moved out of it."""
+        with self._lock:
+            bookings = self._load_snapshot()["bookings"]
+            position = self._booking_positions.get(str(booking_id))
+            if position is not None:
+                return bookings[position].to_dict()
+        return self.archive.get_by_id(str(booking_id))
+
+    def get_bookings_by_car_id(self, car_id: UUID) -> List[Dict]:
+        with self._lock:
+            self._load_snapshot()
+            return [booking.to_dict() for booking in self._intervals.bookings_for(car_id)]
+
+    def get_bookings_by_date(self, target_date: date) -> List[Dict]:
+        with self._lock:
+            bookings = self._load_snapshot()["bookings"]
+            return [bookings[position].to_dict() for position in self._days.positions_on(target_date)]
+
+    def get_booked_car_ids(self, start_date: date, end_date: date) -> Set[str]:
+        with self._lock:
+            bookings = self._load_snapshot()["bookings"]
+            return {
+                bookings[position].car_id
+                for position in self._days.positions_between(start_date, end_date)
+            }
+
+    def get_booking_intervals(self, start_date: date, end_date: date) -> List[Tuple[str, int, int]]:
+        """
+        (car id, start, end) ordinals of the bookings overlapping the inclusive range. The
+        archive only holds bookings that ended in the past, so it is read for past ranges only.
+        """
+        with self._lock:
+            bookings = self._load_snapshot()["bookings"]
+            intervals = [
+                (booking.car_id, booking.start, booking.end)
+                for booking in map(bookings.__getitem__, self._days.positions_within(start_date, end_date))
+            ]
+        if start_date < date.today():
+            intervals.extend(self.archive.intervals(start_date, end_date))
+        return intervals
+
+    def get_car_intervals(self, car_id: UUID, start_date: date, end_date: date) -> List[Tuple[int, int]]:
+        """(start, end) ordinals of the car's bookings overlapping the inclusive range, by start."""
+        with self._lock:
+            self._load_snapshot()
+            intervals = self._intervals.intervals_between(car_id, start_date.toordinal(), end_date.toordinal())
+        if start_date < date.today():
+            intervals = sorted(intervals + [
+                (start, end) for archived_car_id, start, end in self.archive.intervals(start_date, end_date)
+                if archived_car_id == str(car_id)
+            ])
+        return intervals
+
+    @staticmethod
+    def _cursor_position(positions: Dict[str, int], after: Optional[str]) -> int:
+        if after is None:
+            return -1
+        if after not in positions:
+            raise InvalidCursorError(f"Unknown cursor: {after}")
+        return positions[after]
+
+    def find_cars(self, filters: CarFilters, after: Optional[str], limit: int) -> List[Dict]:
+        """
+        Cars matching the filters, in storage order, after the car with id `after`. The
+        smallest matching attribute index drives the scan, so a page only visits the cars
+        of that index following the cursor.
+        """
+        with self._lock:
+            cars = self._load_snapshot()["cars"]
+            after_position = self._cursor_position(self._car_positions, after)
+            criteria = [
+                (field, str(getattr(value, "value", value)))
+                for field, value in ((field, getattr(filters, field)) for field in CAR_FILTER_FIELDS)
+                if value is not None
+            ]
+            if criteria:
+                driver = min((self._car_fields.positions(criterion) for criterion in criteria), key=len)
+            else:
+                driver = range(len(cars))
+
+            result = []
+            for position in positions_after(driver, after_position):
+                car = cars[position]
+                if all(str(getattr(car, field)) == value for field, value in criteria):
+                    result.append(car.to_dict())
+                    if len(result) == limit:
+                        break
+            return result
+
+    def find_bookings(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[Dict]:
+        """
+        Bookings matching the filters, in insertion order, after the booking with id
+        `after`. The per-car index drives car filters and the per-day index drives date
+        windows, so a page never scans bookings outside them.
+        """
+        with self._lock:
+            bookings = self._load_snapshot()["bookings"]
+            after_position = self._cursor_position(self._booking_positions, after)
+            window_start = (filters.start_date or date.min).toordinal()
+            window_end = (filters.end_date or date.max).toordinal()
+            has_window = filters.start_date is not None or filters.end_date is not None
+            check_window = False
+
+            if filters.car_id is not None:
+                car_positions = self._bookings_by_car.positions(str(filters.car_id))
+                candidates = positions_after(car_positions, after_position)
+                check_window = has_window
+            elif has_window:
+                candidates = self._days.positions_between(
+                    filters.start_date or date.min, filters.end_date or date.max, after_position
+                )
+            else:
+                candidates = positions_after(range(len(bookings)), after_position)
+
+            result = []
+            for position in candidates:
+                booking = bookings[position]
+                if check_window and (
+                    booking.start is None or booking.start > window_end or booking.end < window_start
+                ):
+                    continue
+                result.append(booking.to_dict())
+                if len(result) == limit:
+                    break
+            return result
+
+    def find_overlapping_booking(self, car_id: UUID, start_date: date, end_date: date) -> Optional[Dict]:
+        with self._lock:
+            self._load_snapshot()
+            booking = self._intervals.find_overlapping(car_id, start_date, end_date)
+            return booking.to_dict() if booking is not None else None
 
     def add_booking(self, booking: Dict) -> None:
-        data = self._read_data()
-        data["bookings"].append(booking)
-        self._write_data(data)
-        logger.info(f"New booking added: {booking['id']}")
+        self.add_bookings([booking])
+
+    def add_bookings(self, bookings: List[Dict]) -> None:
+        self._apply_changes([
+            {"op": "add_booking", "booking": BookingRecord.from_dict(booking)}
+            for booking in bookings
+        ])
+        for booking in bookings:
+            logger.info("New booking added: %s", booking['id'])
 
     def set_status_car(self, car_id: UUID, status: CarStatus) -> None:
-        data = self._read_data()
-        for car in data.get("cars", []):
-            if car["id"] == str(car_id):
-                car["status"] = status.value
-                self._write_data(data)
-                logger.info(f"Car {car_id} status updated to {status.value}")
-                return
+        self.set_status_cars([car_id], status)
+
+    def set_status_cars(self, car_ids: List[UUID], status: CarStatus) -> None:
+        """Update the status of several cars at once, skipping unknown cars and no-op updates."""
+        with self._writing():
+            self._load_snapshot()
+            changed = []
+            for car_id in dict.fromkeys(str(car_id) for car_id in car_ids):
+                car = self._cars_by_id.get(car_id)
+                if car is not None and car.status != status.value:
+                    changed.append(car_id)
+            self._apply_changes([
+                {"op": "set_status_car", "car_id": car_id, "status": status.value}
+                for car_id in changed
+            ])
+        for car_id in changed:
+            logger.info("Car %s status updated to %s", car_id, status.value)
+
+    def archive_bookings(self, before: date) -> int:
+        """
+        Move the bookings that ended before the given day to the archive file. They are
+        written to the archive first and then dropped from the working set in one change,
+        so a crash in between leaves copies that the next run skips, never a lost booking.
+        """
+        with self._writing():
+            cutoff = before.toordinal()
+            expired = [
+                booking for booking in self._load_snapshot()["bookings"]
+                if booking.end is not None and booking.end < cutoff
+            ]
+            if not expired:
+                return 0
+            self.archive.append(expired)
+            self._apply_changes([{"op": "archive_bookings", "before": before.isoformat()}])
+        logger.info("Archived %s bookings that ended before %s", len(expired), before)
+        return len(expired)
+
+    def get_archived_bookings(self) -> List[Dict]:
+        return self.archive.get_all()
+
+    def find_archived_bookings(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[Dict]:
+        return self.archive.find(filters, after, limit)
@@ -0,0 +1,200 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from app.infra.records import BookingRecord
+
+
+class _CarIntervals:
+    """Bookings of one car sorted by start date, stored as date ordinals."""
+    __slots__ = ("starts", "ends", "bookings", "disjoint")
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.bookings: List[BookingRecord] = []
+        self.disjoint = True
+
+
+class CarIntervalIndex:
+    """Per-car index of booking intervals, sorted by start so an overlap check is a bisect."""
+
+    def __init__(self):
+        self._cars: Dict[str, _CarIntervals] = {}
+
+    def clear(self) -> None:
+        self._cars.clear()
+
+    def add(self, booking: BookingRecord) -> None:
+        if booking.start is None or booking.car_id is None:
+            return
+        start, end = booking.start, booking.end
+
+        intervals = self._cars.get(booking.car_id)
+        if intervals is None:
+            intervals = self._cars[booking.car_id] = _CarIntervals()
+
+        i = bisect_right(intervals.starts, start)
+        if (i > 0 and intervals.ends[i - 1] >= start) or (
+            i < len(intervals.starts) and intervals.starts[i] <= end
+        ):
+            intervals.disjoint = False
+        intervals.starts.insert(i, start)
+        intervals.ends.insert(i, end)
+        intervals.bookings.insert(i, booking)
+
+    def find_overlapping(self, car_id: str, start_date: date, end_date: date) -> Optional[BookingRecord]:
+        """Return a booking of the car overlapping the inclusive date range, if any."""
+        intervals = self._cars.get(str(car_id))
+        if intervals is None:
+            return None
+
+        start, end = start_date.toordinal(), end_date.toordinal()
+        i = bisect_right(intervals.starts, end)
+        if intervals.disjoint:
+            if i > 0 and intervals.ends[i - 1] >= start:
+                return intervals.bookings[i - 1]
+            return None
+
+        for j in range(i - 1, -1, -1):
+            if intervals.ends[j] >= start:
+                return intervals.bookings[j]
+        return None
+
+    def intervals_between(self, car_id: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """(start, end) ordinals of the car's bookings overlapping the inclusive range, by start."""
+        intervals = self._cars.get(str(car_id))
+        if intervals is None:
+            return []
+
+        last = bisect_right(intervals.starts, end)
+        if intervals.disjoint:
+            first = bisect_left(intervals.ends, start, 0, last)
+            return list(zip(intervals.starts[first:last], intervals.ends[first:last]))
+        return [
+            (intervals.starts[j], intervals.ends[j])
+            for j in range(last) if intervals.ends[j] >= start
+        ]
+
+    def bookings_for(self, car_id: str) -> List[BookingRecord]:
+        intervals = self._cars.get(str(car_id))
+        return list(intervals.bookings) if intervals else []
+
+
+def positions_after(positions: Sequence[int], after: int) -> Iterator[int]:
+    """Iterate an ascending sequence of positions starting after the given one."""
+    for i in range(bisect_right(positions, after), len(positions)):
+        yield positions[i]
+
+
+class PositionIndex:
+    """
+    Secondary index mapping a key to the ascending positions of the records having it.
+
+    Positions are indexes into an append-only record list, so they double as a stable
+    ordering for cursor pagination.
+    """
+
+    def __init__(self):
+        self._keys: Dict[Any, List[int]] = {}
+
+    def clear(self) -> None:
+        self._keys.clear()
+
+    def add(self, key: Any, position: int) -> None:
+        positions = self._keys.setdefault(key, [])
+        if not positions or positions[-1] < position:
+            positions.append(position)
+        else:
+            insort(positions, position)
+
+    def remove(self, key: Any, position: int) -> None:
+        positions = self._keys.get(key)
+        if not positions:
+            return
+        i = bisect_left(positions, position)
+        if i < len(positions) and positions[i] == position:
+            del positions[i]
+
+    def positions(self, key: Any) -> List[int]:
+        return self._keys.get(key, [])
+
+
+# Bookings spanning more days than this are kept as intervals rather than one entry per
+# day: the API refuses longer bookings, but data loaded from disk may still hold some.
+MAX_INDEXED_DAYS = 366
+
+
+class DailyBookingIndex:
+    """
+    Positions of the bookings covering each day, keyed by date ordinal. Bookings longer
+    than MAX_INDEXED_DAYS are kept aside as (position, start, end) and checked per query.
+    """
+
+    def __init__(self):
+        self._days: Dict[int, List[int]] = {}
+        self._long: List[Tuple[int, int, int]] = []
+        self.first_day: Optional[int] = None
+        self.last_day: Optional[int] = None
+
+    def clear(self) -> None:
+        self._days.clear()
+        self._long.clear()
+        self.first_day = self.last_day = None
+
+    def add(self, position: int, booking: BookingRecord) -> None:
+        if booking.start is None:
+            return
+        start, end = booking.start, booking.end
+        if end - start >= MAX_INDEXED_DAYS:
+            insort(self._long, (position, start, end))
+            return
+
+        for day in range(start, end + 1):
+            self._days.setdefault(day, []).append(position)
+        self.first_day = start if self.first_day is None else min(self.first_day, start)
+        self.last_day = end if self.last_day is None else max(self.last_day, end)
+
+    def _long_positions(self, start: int, end: int, after: int = -1) -> List[int]:
+        """Ascending positions of the long bookings overlapping the range, after the given position."""
+        return [
+            position for position, long_start, long_end in self._long
+            if position > after and long_start <= end and long_end >= start
+        ]
+
+    def _day_range(self, start_date: date, end_date: date) -> range:
+        if self.first_day is None:
+            return range(0)
+        return range(max(start_date.toordinal(), self.first_day), min(end_date.toordinal(), self.last_day) + 1)
+
+    def positions_on(self, target_date: date) -> List[int]:
+        day = target_date.toordinal()
+        positions = self._days.get(day, [])
+        if not self._long:
+            return list(positions)
+        return list(heapq.merge(positions, self._long_positions(day, day)))
+
+    def positions_within(self, start_date: date, end_date: date) -> Set[int]:
+        """Unordered positions of the bookings covering any day of the inclusive range."""
+        positions = set().union(*(self._days[day] for day in self._day_range(start_date, end_date) if day in self._days))
+        if self._long:
+            positions.update(self._long_positions(start_date.toordinal(), end_date.toordinal()))
+        return positions
+
+    def positions_between(self, start_date: date, end_date: date, after: int = -1) -> Iterator[int]:
+        """
+        Ascending, de-duplicated positions of bookings covering any day of the inclusive
+        range, starting after the given position. The per-day lists are merged lazily,
+        so reading a page only touches the entries it returns.
+        """
+        day_lists = [
+            positions_after(self._days[day], after)
+            for day in self._day_range(start_date, end_date) if day in self._days
+        ]
+        if self._long:
+            day_lists.append(self._long_positions(start_date.toordinal(), end_date.toordinal(), after))
+        last = None
+        for position in heapq.merge(*day_lists):
+            if position != last:
+                yield position
+                last = position
@@ -0,0 +1,163 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from app.core.logger.setup_logger import logger
+from app.core.metrics import STORAGE_BYTES, storage_operation
+from app.infra.db import JSONDatabase
+from app.infra.records import json_default
+
+
+class JournalJSONDatabase(JSONDatabase):
+    """
+    JSON database that appends changes to a journal instead of rewriting the document.
+
+    Every write appends one JSON record per line to ``<db>.journal``. Once the journal
+    holds ``compact_threshold`` records it is folded into the snapshot file and replaced by
+    a new, empty journal file. Records carry a sequence number and the snapshot stores the
+    last one it contains, so replaying a journal that was not replaced after a compaction
+    is harmless. Readers remember which journal file their offset belongs to and start
+    over from the snapshot once it has been replaced.
+    """
+    metrics_backend = "journal"
+
+    def __init__(self, file_path: str = "app/data/db.json", compact_threshold: int = 1000):
+        self.compact_threshold = compact_threshold
+        super().__init__(file_path)
+        self._recover_journal()
+
+    def _init_state(self, file_path: str) -> None:
+        super()._init_state(file_path)
+        self.journal_path = self.file_path.with_suffix(".journal")
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._journal_inode: Optional[int] = None
+        self._seq = 0
+
+    def _journal_stat(self) -> Tuple[Optional[int], int]:
+        """Inode and size of the journal file, (None, 0) if there is none yet."""
+        try:
+            stat = self.journal_path.stat()
+        except FileNotFoundError:
+            return None, 0
+        return stat.st_ino, stat.st_size
+
+    def _load_snapshot(self) -> Dict[str, List[Any]]:
+        """Return the cached document, replaying journal records appended since the last read."""
+        key = self._stat_key()
+        with self._lock:
+            if self._snapshot is None or key != self._snapshot_key:
+                self._set_snapshot(self._read_data(), key)
+                self._replay_journal()
+            elif self._journal_stat() != (self._journal_inode, self._journal_offset):
+                self._replay_journal()
+            return self._snapshot
+
+    def _set_snapshot(self, data: Dict[str, List[Any]], key: Optional[Tuple[int, int, int]]) -> None:
+        super()._set_snapshot(data, key)
+        self._seq = data.get("journal_seq", 0)
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._journal_inode = None
+
+    def _replay_journal(self) -> None:
+        """Apply complete journal lines past the current offset; a partial last line is left alone."""
+        try:
+            with storage_operation(self.metrics_backend, "read_journal"):
+                with open(self.journal_path, "rb") as file:
+                    stat = os.fstat(file.fileno())
+                    if self._journal_inode not in (None, stat.st_ino) or stat.st_size < self._journal_offset:
+                        # Compacted since the last read: the snapshot on disk already holds
+                        # everything the replaced journal did, and this journal follows it.
+                        self._set_snapshot(self._read_data(), self._stat_key())
+                    self._journal_inode = stat.st_ino
+                    file.seek(self._journal_offset)
+                    chunk = file.read()
+        except FileNotFoundError:
+            return
+        STORAGE_BYTES.inc(self.metrics_backend, "read_journal", amount=len(chunk))
+
+        lines = chunk.split(b"\n")
+        lines.pop()
+        for line in lines:
+            self._journal_offset += len(line) + 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping corrupt journal record at offset %s", self._journal_offset)
+                continue
+            self._journal_records += 1
+            if record["seq"] <= self._seq:
+                continue
+            self._apply_to_snapshot(self._snapshot, record)
+            self._seq = record["seq"]
+
+    def _recover_journal(self) -> None:
+        """Drop a torn trailing record left behind by a crash during an append."""
+        with self._writing():
+            self._load_snapshot()
+            _, size = self._journal_stat()
+            if size > self._journal_offset:
+                logger.warning(
+                    "Discarding %s bytes of incomplete journal record in %s",
+                    size - self._journal_offset, self.journal_path
+                )
+                with open(self.journal_path, "r+b") as file:
+                    file.truncate(self._journal_offset)
+
+    def _persist(self, data: Dict[str, List[Any]], changes: List[Dict[str, Any]]) -> None:
+        """Append the changes to the journal, compacting once it grows past the threshold."""
+        lines = []
+        for change in changes:
+            self._seq += 1
+            record = {"seq": self._seq, **change}
+            lines.append(json.dumps(record, default=json_default, separators=(",", ":")) + "\n")
+        payload = "".join(lines).encode()
+        try:
+            with storage_operation(self.metrics_backend, "append_journal"):
+                with open(self.journal_path, "ab") as file:
+                    file.truncate(self._journal_offset)
+                    file.write(payload)
+                    file.flush()
+                    os.fsync(file.fileno())
+                    self._journal_inode = os.fstat(file.fileno()).st_ino
+        except Exception as e:
+            self._snapshot = None
+            logger.error("Error appending to journal file: %s", e)
+            raise
+
+        STORAGE_BYTES.inc(self.metrics_backend, "append_journal", amount=len(payload))
+        self._journal_offset += len(payload)
+        self._journal_records += len(changes)
+        if self._journal_records >= self.compact_threshold:
+            self.compact()
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot file and swap in an empty journal."""
+        with self._writing():
+            data = self._load_snapshot()
+            data["journal_seq"] = self._seq
+            self._commit(data)
+            # A new file rather than truncating in place: a reader that loaded between
+            # the two steps holds an offset into the old journal, which it can tell apart.
+            tmp_path = self.journal_path.with_suffix(".journal.tmp")
+            with open(tmp_path, "wb") as file:
+                os.fsync(file.fileno())
+                inode = os.fstat(file.fileno()).st_ino
+            os.replace(tmp_path, self.journal_path)
+            self._journal_offset = 0
+            self._journal_records = 0
+            self._journal_inode = inode
+        logger.info("Compacted journal into %s at sequence %s", self.file_path, self._seq)
+
+
+def read_snapshot(file_path: str) -> Dict[str, List[Any]]:
+    """
+    The document of a journal database with its journal replayed, read the way a worker
+    reads it but without locking, creating files or dropping a torn last record.
+    """
+    reader = JournalJSONDatabase.__new__(JournalJSONDatabase)
+    reader._init_state(file_path)
+    return reader._load_snapshot()
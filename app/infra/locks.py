@@ -0,0 +1,77 @@
+import os
+import threading
+import zlib
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only coordinate threads of the current process
+    fcntl = None
+
+
+class FileLock:
+    """
+    Reentrant exclusive lock shared by the threads of this process and, through
+    ``flock`` on a lock file, by every other process using the same path.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class CarLocks:
+    """
+    Car locks striped over a fixed number of FileLocks, so writes for different cars
+    rarely wait for each other while a batch never holds more than `stripes` files open.
+    """
+
+    def __init__(self, directory: Path, stripes: int = 64):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._locks = [FileLock(self.directory / f"{stripe}.lock") for stripe in range(stripes)]
+
+    def _stripe(self, car_id: str) -> int:
+        # crc32 rather than hash(): every process must map a car to the same stripe.
+        return zlib.crc32(car_id.encode()) % len(self._locks)
+
+    @contextmanager
+    def hold(self, car_ids: Iterable) -> Iterator[None]:
+        """Hold the locks of all given cars, taken in stripe order to avoid deadlocks."""
+        with ExitStack() as stack:
+            for stripe in sorted({self._stripe(str(car_id)) for car_id in car_ids}):
+                stack.enter_context(self._locks[stripe])
+            yield
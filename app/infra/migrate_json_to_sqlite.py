@@ -0,0 +1,93 @@
+"""
+Import an existing JSON database into SQLite.
+
+Usage:
+    python -m app.infra.migrate_json_to_sqlite --json-path app/data/db.json --sqlite-path app/data/db.sqlite3
+
+Cars are upserted by id and bookings already present in the target are left untouched,
+so the import can be re-run safely. A journal next to the JSON file is replayed in
+memory; the source files are only read, never locked, repaired or rewritten. Bookings
+whose dates cannot be parsed are skipped and counted.
+"""
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.logger.setup_logger import logger
+from app.infra.archive import BookingArchive
+from app.infra.journal_db import read_snapshot
+from app.infra.records import BookingRecord
+from app.infra.sqlite_db import SQLiteDatabase, INSERT_CAR
+
+INSERT_BOOKING_IF_MISSING = """
+INSERT OR IGNORE INTO bookings (id, car_id, customer_name, customer_email, start_date, end_date, created_at)
+VALUES (:id, :car_id, :customer_name, :customer_email, :start_date, :end_date, :created_at)
+"""
+INSERT_ARCHIVED_BOOKING_IF_MISSING = INSERT_BOOKING_IF_MISSING.replace("INTO bookings", "INTO bookings_archive")
+
+
+def read_source(json_path: str) -> Tuple[List[Dict[str, Any]], List[BookingRecord], List[BookingRecord]]:
+    """Cars, bookings and archived bookings of a JSON database, with its journal applied; read-only."""
+    data = read_snapshot(json_path)
+    archived = BookingArchive(Path(json_path).with_suffix(".archive.json")).get_all()
+    return (
+        [car.to_dict() for car in data["cars"]],
+        data["bookings"],
+        [BookingRecord.from_dict(booking) for booking in archived],
+    )
+
+
+def _importable(bookings: List[BookingRecord], json_path: str) -> List[Dict[str, Any]]:
+    """Rows for the bookings that have dates; the others are logged and left out."""
+    rows = []
+    for booking in bookings:
+        if booking.start is None:
+            logger.warning("Skipping booking %s from %s: its dates cannot be parsed", booking.id, json_path)
+            continue
+        rows.append({"created_at": None, **booking.to_dict()})
+    return rows
+
+
+def migrate(json_path: str, sqlite_path: str) -> Tuple[int, int, int]:
+    """
+    Copy cars and bookings from the JSON database; returns the number of cars and
+    bookings imported and of bookings skipped for unparseable dates.
+    """
+    if not Path(json_path).exists():
+        raise FileNotFoundError(f"JSON database not found: {json_path}")
+
+    cars, bookings, archived = read_source(json_path)
+    booking_rows = _importable(bookings, json_path)
+    archived_rows = _importable(archived, json_path)
+    imported = len(booking_rows) + len(archived_rows)
+    skipped = len(bookings) + len(archived) - imported
+
+    target = SQLiteDatabase(sqlite_path, seed=False)
+    try:
+        with target.transaction() as conn:
+            conn.executemany(INSERT_CAR, cars)
+            conn.executemany(INSERT_BOOKING_IF_MISSING, booking_rows)
+            conn.executemany(INSERT_ARCHIVED_BOOKING_IF_MISSING, archived_rows)
+    finally:
+        target.close()
+
+    logger.info(
+        "Migrated %s cars and %s bookings (%s archived, %s skipped) from %s to %s",
+        len(cars), imported, len(archived_rows), skipped, json_path, sqlite_path
+    )
+    return len(cars), imported, skipped
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import a JSON car rental database into SQLite")
+    parser.add_argument("--json-path", default="app/data/db.json")
+    parser.add_argument("--sqlite-path", default="app/data/db.sqlite3")
+    args = parser.parse_args(argv)
+
+    cars, bookings, skipped = migrate(args.json_path, args.sqlite_path)
+    print(f"Imported {cars} cars and {bookings} bookings into {args.sqlite_path}")
+    if skipped:
+        print(f"Skipped {skipped} bookings whose dates could not be parsed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import sys
+from datetime import date
+from typing import Any, Dict, Optional
+from app.core.logger.setup_logger import logger
+
+
+def _ordinal(value: Any) -> int:
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(value).toordinal()
+
+
+def _intern(value: Any) -> Optional[str]:
+    return None if value is None else sys.intern(str(value))
+
+
+class CarRecord:
+    """
+    A car as held in memory by the JSON backends. The id and status are interned, so
+    the bookings and indexes referring to a car share a single string object.
+    """
+    __slots__ = ("id", "brand", "model", "engine", "version", "year", "status", "extra")
+    FIELDS = ("id", "brand", "model", "engine", "version", "year", "status")
+
+    def __init__(self, id, brand, model, engine, version, year, status, extra=None):
+        self.id = id
+        self.brand = brand
+        self.model = model
+        self.engine = engine
+        self.version = version
+        self.year = year
+        self.status = status
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CarRecord":
+        status = data.get("status")
+        extra = {key: value for key, value in data.items() if key not in cls.FIELDS}
+        return cls(
+            _intern(data.get("id")),
+            data.get("brand"),
+            data.get("model"),
+            data.get("engine"),
+            data.get("version"),
+            data.get("year"),
+            _intern(getattr(status, "value", status)),
+            extra or None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        car = {
+            "id": self.id,
+            "brand": self.brand,
+            "model": self.model,
+            "engine": self.engine,
+            "version": self.version,
+            "year": self.year,
+            "status": self.status,
+        }
+        if self.extra:
+            car.update(self.extra)
+        return car
+
+
+class BookingRecord:
+    """
+    A booking as held in memory by the JSON backends: dates are kept as ordinals, parsed
+    once when the record is loaded, and the car id is interned. A booking whose dates
+    cannot be parsed keeps them as they were, with `start` and `end` set to None.
+    """
+    __slots__ = ("id", "car_id", "customer_name", "customer_email", "start", "end", "created_at", "extra")
+    FIELDS = ("car_id", "customer_name", "customer_email", "start_date", "end_date", "id", "created_at")
+
+    def __init__(self, id, car_id, customer_name, customer_email, start, end, created_at=None, extra=None):
+        self.id = id
+        self.car_id = car_id
+        self.customer_name = customer_name
+        self.customer_email = customer_email
+        self.start = start
+        self.end = end
+        self.created_at = created_at
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BookingRecord":
+        extra = {key: value for key, value in data.items() if key not in cls.FIELDS}
+        try:
+            start, end = _ordinal(data["start_date"]), _ordinal(data["end_date"])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning("Invalid booking data format: %s", e)
+            start = end = None
+            extra.update(
+                (key, data[key]) for key in ("start_date", "end_date") if key in data
+            )
+        created_at = data.get("created_at")
+        return cls(
+            str(data.get("id")),
+            _intern(data.get("car_id")),
+            data.get("customer_name"),
+            data.get("customer_email"),
+            start,
+            end,
+            None if created_at is None else str(created_at),
+            extra or None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        booking = {
+            "car_id": self.car_id,
+            "customer_name": self.customer_name,
+            "customer_email": self.customer_email,
+        }
+        if self.start is not None:
+            booking["start_date"] = date.fromordinal(self.start).isoformat()
+            booking["end_date"] = date.fromordinal(self.end).isoformat()
+        booking["id"] = self.id
+        if self.created_at is not None:
+            booking["created_at"] = self.created_at
+        if self.extra:
+            booking.update(self.extra)
+        return booking
+
+
+def json_default(value: Any) -> Any:
+    """`default` hook for json.dumps, writing records in their stored dict form."""
+    if isinstance(value, (CarRecord, BookingRecord)):
+        return value.to_dict()
+    return str(value)
@@ -0,0 +1,117 @@
+from typing import Dict, List
+from uuid import uuid4
+from app.core.models.car_model import CarStatus
+
+
+def initial_cars() -> List[Dict]:
+    """Fleet used to seed a new, empty database."""
+    return [
+        {
+            "id": uuid4(),
+            "brand": "Toyota",
+            "model": "Chaser",
+            "engine": "JZX100 1JZ-GTE",
+            "version": "Tourer V",
+            "year": "1998",
+            "status": CarStatus.AVAILABLE,
+        },
+        {
+            "id": uuid4(),
+            "brand": "Toyota",
+            "model": "Supra",
+            "engine": "2JZ-GTE",
+            "version": "MK4",
+            "year": "1996",
+            "status": CarStatus.AVAILABLE,
+        },
+        {
+            "id": uuid4(),
+            "brand": "BMW",
+            "model": "M3",
+            "engine": "S54B32",
+            "version": "E46",
+            "year": 2003,
+            "status": CarStatus.MAINTENANCE,
+        },
+        {
+            "id": uuid4(),
+            "brand": "Nissan",
+            "model": "Skyline GT-R",
+            "engine": "RB26DETT",
+            "version": "R34",
+            "year": "1999",
+            "status": CarStatus.RESERVED,
+        },
+        {
+            "id": uuid4(),
+            "brand": "Mazda",
+            "model": "RX-7",
+            "engine": "13B-REW",
+            "version": "FD3S",
+            "year": "1998",
+            "status": CarStatus.AVAILABLE,
+        },
+        {
+            "id": uuid4(),
+            "brand": "Honda",
+            "model": "NSX",
+            "engine": "C30A",
+            "version": "Type R",
+            "year": "1992",
+            "status": CarStatus.MAINTENANCE,
+        },
+        {
+            "id": uuid4(),
+            "brand": "Subaru",
+            "model": "Impreza WRX STI",
+            "engine": "EJ207",
+            "version": "GDBC",
+            "year": "2005",
+            "status": CarStatus.AVAILABLE,
+        },
+        {
+            "id": uuid4(),
+            "brand": "Mitsubishi",
+            "model": "Lancer Evolution",
+            "engine": "4G63T",
+            "version": "IX",
+            "year": "2005",
+            "status": CarStatus.RESERVED,
+        },
+        {
+            "id": uuid4(),
+            "brand": "Nissan",
+            "model": "Silvia",
+            "engine": "SR20DET",
+            "version": "S15",
+            "year": "1999",
+            "status": CarStatus.AVAILABLE,
+        },
+        {
+            "id": uuid4(),
+            "brand": "Toyota",
+            "model": "MR2",
+            "engine": "3S-GTE",
+            "version": "SW20",
+            "year": "1993",
+            "status": CarStatus.MAINTENANCE,
+        },
+        {
+            "id": uuid4(),
+            "brand": "Honda",
+            "model": "Civic Type R",
+            "engine": "K20A",
+            "version": "EP3",
+            "year": "2004",
+            "status": CarStatus.AVAILABLE,
+        },
+        {
+            "id": uuid4(),
+            "brand": "Nissan",
+            "model": "350Z",
+            "engine": "VQ35DE",
+            "version": "Z33",
+            "year": "2005",
+            "status": CarStatus.AVAILABLE,
+        },
+    ]
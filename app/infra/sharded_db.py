@@ -0,0 +1,475 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+from app.core.exceptions import InvalidCursorError
+from app.core.logger.setup_logger import logger
+from app.core.metrics import STORAGE_BYTES, storage_operation
+from app.core.models.car_model import CarStatus
+from app.core.models.pagination import BookingFilters, CarFilters
+from app.infra.archive import BookingArchive
+from app.infra.db import JSONDatabase
+from app.infra.indexes import CarIntervalIndex, DailyBookingIndex, PositionIndex, positions_after
+from app.infra.locks import FileLock
+from app.infra.records import BookingRecord, json_default
+
+StatKey = Tuple[int, int, int]
+
+# Date ranges spanning more months than this are matched against the shard files on
+# disk instead of probing every month, most of which would have no shard.
+MAX_PROBED_MONTHS = 24
+
+
+def month_key(ordinal: int) -> str:
+    day = date.fromordinal(ordinal)
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def months_between(start: int, end: int) -> List[str]:
+    """Keys of the months covering the inclusive range of date ordinals."""
+    first, last = date.fromordinal(start), date.fromordinal(end)
+    year, month = first.year, first.month
+    months = []
+    while (year, month) <= (last.year, last.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _stat_key(path: Path) -> Optional[StatKey]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _write_atomically(path: Path, payload: bytes) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class _ShardState:
+    """The bookings of one month shard and their indexes; replaced as a whole, never mutated."""
+    __slots__ = ("bookings", "positions", "by_car", "intervals", "days")
+
+    def __init__(self, bookings: List[BookingRecord]):
+        self.bookings = bookings
+        self.positions: Dict[str, int] = {}
+        self.by_car = PositionIndex()
+        self.intervals = CarIntervalIndex()
+        self.days = DailyBookingIndex()
+        for position, booking in enumerate(bookings):
+            self.positions[booking.id] = position
+            self.by_car.add(booking.car_id, position)
+            self.intervals.add(booking)
+            self.days.add(position, booking)
+
+
+class _Shard:
+    __slots__ = ("month", "path", "file_lock", "key", "state")
+
+    def __init__(self, month: str, path: Path):
+        self.month = month
+        self.path = path
+        self.file_lock = FileLock(path.with_suffix(".lock"))
+        self.key: Optional[StatKey] = None
+        self.state: Optional[_ShardState] = None
+
+
+class ShardedJSONDatabase:
+    """
+    JSON storage that keeps cars in one document and bookings in one file per month.
+
+    Layout, next to the configured database path (``app/data/db.json`` gives ``app/data/db/``):
+    ``cars.json`` for the cars, ``bookings/<YYYY-MM>.json`` for the bookings and
+    ``version.json`` for the booking data version. A booking is stored in the shard of
+    every month its dates span, so a write rewrites only those shards under their own
+    locks, and an availability or conflict check for some dates only opens the shards
+    of their months: any booking overlapping those dates has a day in one of them.
+    Listings visit each booking once, in the first shard of the listing that holds it.
+
+    A write first records its bookings in ``pending/``, and removes that record once every
+    shard holds them. Pending writes left by a crash or an error are completed on startup
+    and whenever cars are locked for a write, before anything is checked against them.
+    """
+    metrics_backend = "sharded"
+
+    def __init__(self, file_path: str = "app/data/db.json"):
+        self.directory = Path(file_path).with_suffix("")
+        self.shard_dir = self.directory / "bookings"
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        self.pending_dir = self.directory / "pending"
+        self.pending_dir.mkdir(exist_ok=True)
+        self.cars = JSONDatabase(str(self.directory / "cars.json"))
+        self.cars.metrics_backend = self.metrics_backend
+        self.car_locks = self.cars.car_locks
+        self.archive = BookingArchive(self.directory / "archive.json", self.metrics_backend)
+        self._archive_lock = FileLock(self.directory / "archive.lock")
+        self._version_path = self.directory / "version.json"
+        self._version_lock = FileLock(self.directory / "version.lock")
+        self._version: Tuple[Optional[StatKey], int] = (None, 0)
+        self._lock = threading.RLock()
+        self._shards: Dict[str, _Shard] = {}
+        # Month of each booking seen so far, and the shard states that went into it.
+        self._months_by_id: Dict[str, str] = {}
+        self._indexed: Dict[str, _ShardState] = {}
+        self._complete_pending_writes()
+
+    # Shards
+
+    def _shard(self, month: str) -> _Shard:
+        with self._lock:
+            shard = self._shards.get(month)
+            if shard is None:
+                shard = self._shards[month] = _Shard(month, self.shard_dir / f"{month}.json")
+            return shard
+
+    def _state(self, month: str) -> _ShardState:
+        """Indexed bookings of a month, re-read only when its file changed on disk."""
+        shard = self._shard(month)
+        key = _stat_key(shard.path)
+        with self._lock:
+            if shard.state is None or key != shard.key:
+                shard.state = _ShardState(self._read_shard(shard) if key is not None else [])
+                shard.key = key
+            return shard.state
+
+    def _read_shard(self, shard: _Shard) -> List[BookingRecord]:
+        try:
+            with storage_operation(self.metrics_backend, "read_shard"):
+                with open(shard.path, "rb") as file:
+                    bookings = json.load(file).get("bookings", [])
+                    STORAGE_BYTES.inc(self.metrics_backend, "read_shard", amount=file.tell())
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            logger.error("Error reading booking shard %s: %s", shard.path, e)
+            return []
+        return [BookingRecord.from_dict(booking) for booking in bookings]
+
+    def _write_shard(self, shard: _Shard, bookings: List[BookingRecord]) -> None:
+        """Replace the shard's bookings on disk and in memory; the caller holds the shard's file lock."""
+        try:
+            with storage_operation(self.metrics_backend, "write_shard"):
+                if bookings:
+                    payload = json.dumps({"bookings": bookings}, indent=4, default=json_default).encode()
+                    _write_atomically(shard.path, payload)
+                    STORAGE_BYTES.inc(self.metrics_backend, "write_shard", amount=len(payload))
+                elif shard.path.exists():
+                    shard.path.unlink()
+        except Exception as e:
+            logger.error("Error writing booking shard %s: %s", shard.path, e)
+            with self._lock:
+                shard.state = None
+            raise
+        state = _ShardState(bookings)
+        with self._lock:
+            shard.state, shard.key = state, _stat_key(shard.path)
+
+    def _existing_months(self) -> List[str]:
+        return sorted(path.stem for path in self.shard_dir.glob("*.json"))
+
+    def _months_for(self, start_date: date, end_date: date) -> List[str]:
+        """Months to open for a date range; long ranges only list the shards that exist."""
+        first, last = month_key(start_date.toordinal()), month_key(end_date.toordinal())
+        if (end_date.year - start_date.year) * 12 + end_date.month - start_date.month < MAX_PROBED_MONTHS:
+            return months_between(start_date.toordinal(), end_date.toordinal())
+        return [month for month in self._existing_months() if first <= month <= last]
+
+    # Versioning
+
+    def _booking_version(self) -> int:
+        key = _stat_key(self._version_path)
+        with self._lock:
+            if key is not None and key != self._version[0]:
+                with open(self._version_path) as file:
+                    self._version = (key, json.load(file)["version"])
+            return self._version[1]
+
+    def _bump_version(self) -> None:
+        with self._version_lock:
+            version = self._booking_version() + 1
+            _write_atomically(self._version_path, json.dumps({"version": version}).encode())
+
+    def data_version(self) -> int:
+        """Car changes plus booking changes; both only ever grow, and so does their sum."""
+        return self.cars.data_version() + self._booking_version()
+
+    @contextmanager
+    def lock_cars(self, car_ids: Iterable[UUID]) -> Iterator[None]:
+        """Context manager serializing booking writes for the given cars across workers."""
+        with self.car_locks.hold(car_ids):
+            self._complete_pending_writes()
+            yield
+
+    # Cars
+
+    def get_all_cars(self) -> List[Dict]:
+        return self.cars.get_all_cars()
+
+    def get_car_by_id(self, car_id: UUID) -> Optional[Dict]:
+        return self.cars.get_car_by_id(car_id)
+
+    def find_cars(self, filters: CarFilters, after: Optional[str], limit: int) -> List[Dict]:
+        return self.cars.find_cars(filters, after, limit)
+
+    def set_status_car(self, car_id: UUID, status: CarStatus) -> None:
+        self.cars.set_status_car(car_id, status)
+
+    def set_status_cars(self, car_ids: List[UUID], status: CarStatus) -> None:
+        self.cars.set_status_cars(car_ids, status)
+
+    # Bookings
+
+    def _scan(self, months: List[str]) -> Iterator[Tuple[str, int, BookingRecord]]:
+        """
+        Each booking of the given ascending months once, as (month, position, booking),
+        taken from the first of those months whose shard holds it.
+        """
+        first = months[0] if months else None
+        for month in months:
+            state = self._state(month)
+            for position, booking in enumerate(state.bookings):
+                if self._listed_in(booking, month, first):
+                    yield month, position, booking
+
+    @staticmethod
+    def _listed_in(booking: BookingRecord, month: str, first_month: str) -> bool:
+        if booking.start is None:
+            return True
+        return max(month_key(booking.start), first_month) == month
+
+    def get_all_bookings(self) -> List[Dict]:
+        return [booking.to_dict() for _, _, booking in self._scan(self._existing_months())]
+
+    def get_booking_by_id(self, booking_id: UUID) -> Optional[Dict]:
+        """
+        Booking by id from the shard the id index points to, falling back to the archive.
+        An id the index does not know yet brings it up to date with the shards changed
+        on disk, which only re-reads those.
+        """
+        booking_id = str(booking_id)
+        booking = self._indexed_booking(booking_id)
+        if booking is None:
+            self._update_id_index()
+            booking = self._indexed_booking(booking_id)
+        if booking is not None:
+            return booking.to_dict()
+        return self.archive.get_by_id(booking_id)
+
+    def _indexed_booking(self, booking_id: str) -> Optional[BookingRecord]:
+        with self._lock:
+            month = self._months_by_id.get(booking_id)
+            if month is None:
+                return None
+            state = self._state(month)
+            position = state.positions.get(booking_id)
+            if position is None:
+                del self._months_by_id[booking_id]
+                return None
+            return state.bookings[position]
+
+    def _update_id_index(self) -> None:
+        with self._lock:
+            months = self._existing_months()
+            for month in set(self._indexed) - set(months):
+                del self._indexed[month]
+            for month in months:
+                state = self._state(month)
+                if self._indexed.get(month) is not state:
+                    for booking in state.bookings:
+                        self._months_by_id.setdefault(booking.id, month)
+                    self._indexed[month] = state
+
+    def get_bookings_by_car_id(self, car_id: UUID) -> List[Dict]:
+        bookings: Dict[str, BookingRecord] = {}
+        for month in self._existing_months():
+            for booking in self._state(month).intervals.bookings_for(str(car_id)):
+                bookings.setdefault(booking.id, booking)
+        return [booking.to_dict() for booking in sorted(bookings.values(), key=lambda b: b.start)]
+
+    def get_bookings_by_date(self, target_date: date) -> List[Dict]:
+        state = self._state(month_key(target_date.toordinal()))
+        return [state.bookings[position].to_dict() for position in state.days.positions_on(target_date)]
+
+    def get_booked_car_ids(self, start_date: date, end_date: date) -> Set[str]:
+        booked = set()
+        for month in self._months_for(start_date, end_date):
+            state = self._state(month)
+            booked.update(
+                state.bookings[position].car_id
+                for position in state.days.positions_between(start_date, end_date)
+            )
+        return booked
+
+    def get_booking_intervals(self, start_date: date, end_date: date) -> List[Tuple[str, int, int]]:
+        """(car id, start, end) ordinals of the bookings overlapping the range, archived ones included."""
+        months = self._months_for(start_date, end_date)
+        intervals = []
+        for month in months:
+            state = self._state(month)
+            for position in state.days.positions_within(start_date, end_date):
+                booking = state.bookings[position]
+                if self._listed_in(booking, month, months[0]):
+                    intervals.append((booking.car_id, booking.start, booking.end))
+        if start_date < date.today():
+            intervals.extend(self.archive.intervals(start_date, end_date))
+        return intervals
+
+    def get_car_intervals(self, car_id: UUID, start_date: date, end_date: date) -> List[Tuple[int, int]]:
+        """(start, end) ordinals of the car's bookings overlapping the range, by start, archived ones included."""
+        start, end = start_date.toordinal(), end_date.toordinal()
+        intervals = set()
+        for month in self._months_for(start_date, end_date):
+            intervals.update(self._state(month).intervals.intervals_between(car_id, start, end))
+        if start_date < date.today():
+            intervals.update(
+                (start, end) for archived_car_id, start, end in self.archive.intervals(start_date, end_date)
+                if archived_car_id == str(car_id)
+            )
+        return sorted(intervals)
+
+    def find_overlapping_booking(self, car_id: UUID, start_date: date, end_date: date) -> Optional[Dict]:
+        for month in self._months_for(start_date, end_date):
+            booking = self._state(month).intervals.find_overlapping(car_id, start_date, end_date)
+            if booking is not None:
+                return booking.to_dict()
+        return None
+
+    def find_bookings(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[Dict]:
+        """
+        Bookings matching the filters, shard by shard and in insertion order within a
+        shard, after the booking with id `after`. A date window only opens the shards
+        of its months; a car filter uses each shard's per-car positions.
+        """
+        months = self._existing_months()
+        if filters.start_date is not None:
+            months = [month for month in months if month >= month_key(filters.start_date.toordinal())]
+        if filters.end_date is not None:
+            months = [month for month in months if month <= month_key(filters.end_date.toordinal())]
+        if not months:
+            if after is not None:
+                raise InvalidCursorError(f"Unknown cursor: {after}")
+            return []
+        first = months[0]
+        window_start = (filters.start_date or date.min).toordinal()
+        window_end = (filters.end_date or date.max).toordinal()
+        car_id = str(filters.car_id) if filters.car_id is not None else None
+
+        cursor = self._cursor(months, first, after)
+        result = []
+        for month in months:
+            if cursor is not None and month < cursor[0]:
+                continue
+            state = self._state(month)
+            after_position = cursor[1] if cursor is not None and month == cursor[0] else -1
+            if car_id is not None:
+                candidates = positions_after(state.by_car.positions(car_id), after_position)
+            else:
+                candidates = range(after_position + 1, len(state.bookings))
+            for position in candidates:
+                booking = state.bookings[position]
+                if not self._listed_in(booking, month, first):
+                    continue
+                if booking.start is not None and (booking.start > window_end or booking.end < window_start):
+                    continue
+                result.append(booking.to_dict())
+                if len(result) == limit:
+                    return result
+        return result
+
+    def _cursor(self, months: List[str], first: str, after: Optional[str]) -> Optional[Tuple[str, int]]:
+        """(month, position) at which the booking `after` was listed under the same months."""
+        if after is None:
+            return None
+        for month in months:
+            state = self._state(month)
+            position = state.positions.get(after)
+            if position is not None and self._listed_in(state.bookings[position], month, first):
+                return month, position
+        raise InvalidCursorError(f"Unknown cursor: {after}")
+
+    def add_booking(self, booking: Dict) -> None:
+        self.add_bookings([booking])
+
+    def add_bookings(self, bookings: List[Dict]) -> None:
+        """Append the bookings to the shard of every month they span, each shard written once."""
+        records = [BookingRecord.from_dict(booking) for booking in bookings]
+        for record in records:
+            if record.start is None:
+                raise ValueError(f"Booking {record.id} has invalid dates")
+
+        pending = self.pending_dir / f"{uuid4()}.json"
+        _write_atomically(pending, json.dumps({"bookings": records}, default=json_default).encode())
+        self._write_to_shards(records)
+        self._bump_version()
+        pending.unlink(missing_ok=True)
+        for booking in bookings:
+            logger.info("New booking added: %s", booking['id'])
+
+    def _write_to_shards(self, records: List[BookingRecord]) -> None:
+        """Add the bookings to the shards of their months that do not hold them yet."""
+        by_month: Dict[str, List[BookingRecord]] = {}
+        for record in records:
+            for month in months_between(record.start, record.end):
+                by_month.setdefault(month, []).append(record)
+
+        for month in sorted(by_month):
+            shard = self._shard(month)
+            with shard.file_lock:
+                state = self._state(month)
+                missing = [record for record in by_month[month] if record.id not in state.positions]
+                if missing:
+                    self._write_shard(shard, state.bookings + missing)
+        with self._lock:
+            for record in records:
+                self._months_by_id[record.id] = month_key(record.start)
+
+    def _complete_pending_writes(self) -> None:
+        """Finish the writes recorded in pending/; adding a booking twice is a no-op."""
+        for pending in sorted(self.pending_dir.glob("*.json")):
+            try:
+                with open(pending, "rb") as file:
+                    bookings = json.load(file)["bookings"]
+            except FileNotFoundError:
+                continue
+            logger.warning("Completing pending booking write %s", pending.name)
+            self._write_to_shards([BookingRecord.from_dict(booking) for booking in bookings])
+            self._bump_version()
+            pending.unlink(missing_ok=True)
+
+    def archive_bookings(self, before: date) -> int:
+        """Move the bookings that ended before the given day from their shards to the archive."""
+        cutoff = before.toordinal()
+        archived: Set[str] = set()
+        with self._archive_lock:
+            for month in self._existing_months():
+                if month > month_key(cutoff):
+                    break
+                shard = self._shard(month)
+                with shard.file_lock:
+                    bookings = self._state(month).bookings
+                    expired = [b for b in bookings if b.end is not None and b.end < cutoff]
+                    if not expired:
+                        continue
+                    self.archive.append(expired)
+                    self._write_shard(shard, [b for b in bookings if b.end is None or b.end >= cutoff])
+                    archived.update(booking.id for booking in expired)
+            if archived:
+                self._bump_version()
+        if archived:
+            logger.info("Archived %s bookings that ended before %s", len(archived), before)
+        return len(archived)
+
+    def get_archived_bookings(self) -> List[Dict]:
+        return self.archive.get_all()
+
+    def find_archived_bookings(self, filters: BookingFilters, after: Optional[str], limit: int) -> List[Dict]:
+        return self.archive.find(filters, after, limit)
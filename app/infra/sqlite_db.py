@@ -0,0 +1,157 @@
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+from uuid import UUID
+from app.core.logger.setup_logger import logger
+from app.core.metrics import storage_operation
+from app.infra.locks import CarLocks
+from app.infra.seed import initial_cars
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cars (
+    id TEXT PRIMARY KEY,
+    brand TEXT NOT NULL,
+    model TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    version TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    status TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS bookings (
+    id TEXT PRIMARY KEY,
+    car_id TEXT NOT NULL,
+    customer_name TEXT NOT NULL,
+    customer_email TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS bookings_archive (
+    id TEXT PRIMARY KEY,
+    car_id TEXT NOT NULL,
+    customer_name TEXT NOT NULL,
+    customer_email TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0);
+
+CREATE INDEX IF NOT EXISTS idx_cars_status ON cars (status);
+CREATE INDEX IF NOT EXISTS idx_cars_brand_model ON cars (brand, model);
+CREATE INDEX IF NOT EXISTS idx_cars_year ON cars (year);
+CREATE INDEX IF NOT EXISTS idx_bookings_car_id ON bookings (car_id);
+CREATE INDEX IF NOT EXISTS idx_bookings_car_dates ON bookings (car_id, start_date, end_date);
+CREATE INDEX IF NOT EXISTS idx_bookings_dates ON bookings (start_date, end_date);
+CREATE INDEX IF NOT EXISTS idx_bookings_end_date ON bookings (end_date);
+CREATE INDEX IF NOT EXISTS idx_bookings_archive_car_id ON bookings_archive (car_id);
+"""
+
+INSERT_CAR = """
+INSERT OR REPLACE INTO cars (id, brand, model, engine, version, year, status)
+VALUES (:id, :brand, :model, :engine, :version, :year, :status)
+"""
+
+BUMP_DATA_VERSION = "UPDATE meta SET value = value + 1 WHERE key = 'data_version'"
+SELECT_DATA_VERSION = "SELECT value FROM meta WHERE key = 'data_version'"
+
+INSERT_BOOKING = """
+INSERT INTO bookings (id, car_id, customer_name, customer_email, start_date, end_date, created_at)
+VALUES (:id, :car_id, :customer_name, :customer_email, :start_date, :end_date, :created_at)
+"""
+
+
+class SQLiteDatabase:
+    """
+    SQLite storage in WAL mode with a small pool of reusable connections.
+
+    Connections run in autocommit mode; writes go through ``transaction()``, which takes
+    the write lock up front (BEGIN IMMEDIATE) so a read-check-write sequence cannot
+    interleave with another writer. Each connection keeps its own compiled-statement
+    cache, so queries defined as module constants are only prepared once per connection.
+    """
+
+    def __init__(self, file_path: str = "app/data/db.sqlite3", pool_size: int = 5, seed: bool = True):
+        self.file_path = Path(file_path)
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.car_locks = CarLocks(self.file_path.with_suffix(".locks"))
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        self._ensure_schema(seed)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.file_path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_schema(self, seed: bool) -> None:
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+        if not seed:
+            return
+        with self.transaction() as conn:
+            if conn.execute("SELECT 1 FROM cars LIMIT 1").fetchone() is None:
+                conn.executemany(INSERT_CAR, [
+                    {**car, "id": str(car["id"]), "status": car["status"].value}
+                    for car in initial_cars()
+                ])
+                logger.info("Created new database file at %s", self.file_path)
+
+    @contextmanager
+    def _borrow(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection from the pool."""
+        with storage_operation("sqlite", "read"), self._borrow() as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection and run the block in a write transaction that bumps the data version."""
+        with storage_operation("sqlite", "write"), self._borrow() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute(BUMP_DATA_VERSION)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def data_version(self) -> int:
+        """Number of write transactions committed so far; it only ever grows."""
+        with self.connection() as conn:
+            return conn.execute(SELECT_DATA_VERSION).fetchone()[0]
+
+    def lock_cars(self, car_ids: Iterable[UUID]):
+        """Context manager serializing booking writes for the given cars across workers."""
+        return self.car_locks.hold(car_ids)
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
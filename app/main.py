@@ -1,16 +1,57 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
-from app.api.routes import car_routes, booking_routes
+from app.api.middleware import MetricsMiddleware
+from app.api.routes import analytics_routes, car_routes, booking_routes, metrics_routes
+from app.core.config import get_settings
+from app.core.dependencies import build_container
+from app.core.logger.setup_logger import logger
+from app.core.use_cases.booking_use_cases import archive_periodically
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the application container once, unless one was injected (e.g. by tests),
+    and archive expired bookings in the background while the application runs.
+    """
+    settings = get_settings()
+    owns_container = getattr(app.state, "container", None) is None
+    if owns_container:
+        app.state.container = build_container(settings)
+        logger.info("Storage initialised: backend=%s", settings.storage_backend)
+    archiver = None
+    if settings.archive_interval_seconds > 0:
+        archiver = asyncio.create_task(archive_periodically(
+            app.state.container.async_booking_use_cases, settings.archive_interval_seconds
+        ))
+    yield
+    if archiver is not None:
+        archiver.cancel()
+        with suppress(asyncio.CancelledError):
+            await archiver
+    if owns_container:
+        close = getattr(app.state.container.db, "close", None)
+        if close is not None:
+            close()
+        app.state.container = None
+
 
 app = FastAPI(
     title="Car Rental API",
     description="A simple REST API for car rental service",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(car_routes.router)
 app.include_router(booking_routes.router)
+app.include_router(analytics_routes.router)
+app.include_router(metrics_routes.router)
 
 
 @app.get("/")
@@ -20,4 +61,4 @@ def root():
         "status": "active",
         "docs": app.docs_url,
         "redoc": app.redoc_url,
-    }
\ No newline at end of file
+    }
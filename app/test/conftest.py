@@ -8,47 +8,78 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from fastapi.testclient import TestClient
 from app.main import app
 from app.infra.db import JSONDatabase
-import tempfile
+from app.core.config import Settings
+from app.core.dependencies import build_container
 import json
+from datetime import date, timedelta
+from uuid import uuid4
+
+@pytest.fixture(scope="session", autouse=True)
+def app_container(tmp_path_factory):
+    """
+    Point the application at a freshly seeded database instead of app/data/db.json.
+    The backend under test can be chosen with TEST_STORAGE_BACKEND.
+    """
+    data_dir = tmp_path_factory.mktemp("data")
+    app.state.container = build_container(Settings(
+        storage_backend=os.getenv("TEST_STORAGE_BACKEND", "json"),
+        db_path=str(data_dir / "db.json"),
+        sqlite_path=str(data_dir / "db.sqlite3"),
+    ))
+    yield app.state.container
+    app.state.container = None
 
 @pytest.fixture
-def test_db():
+def make_booking():
     """
-    Create a temporary database for tests.
+    Factory for booking dicts as the storage layers take them; dates default to
+    tomorrow and the day after.
     """
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        test_data = {
-            "cars": [
-                {
-                    "id": "test-car-1",
-                    "brand": "Toyota",
-                    "model": "Chaser",
-                    "engine": "1JZ-GTE",
-                    "version": "Tourer V",
-                    "year": "1998",
-                    "status": "available"
-                },
-                {
-                    "id": "test-car-2", 
-                    "brand": "Toyota",
-                    "model": "Supra",
-                    "engine": "2JZ-GTE",
-                    "version": "MK4",
-                    "year": "1996",
-                    "status": "available"
-                }
-            ],
-            "bookings": []
+    def make(car_id, start=None, end=None):
+        start = start or date.today() + timedelta(days=1)
+        return {
+            "id": str(uuid4()),
+            "car_id": car_id,
+            "customer_name": "Test User",
+            "customer_email": "test@example.com",
+            "start_date": start,
+            "end_date": end or start + timedelta(days=1),
         }
-        json.dump(test_data, f)
-        temp_db_path = f.name
-    
-    test_db = JSONDatabase(json_path=temp_db_path)
-    
-    yield test_db
-    
-    import os
-    os.unlink(temp_db_path)
+    return make
+
+@pytest.fixture
+def test_db(tmp_path):
+    """
+    Create a temporary database for tests, in a directory of its own so the lock files
+    created next to it are removed with it.
+    """
+    test_data = {
+        "cars": [
+            {
+                "id": "test-car-1",
+                "brand": "Toyota",
+                "model": "Chaser",
+                "engine": "1JZ-GTE",
+                "version": "Tourer V",
+                "year": "1998",
+                "status": "available"
+            },
+            {
+                "id": "test-car-2", 
+                "brand": "Toyota",
+                "model": "Supra",
+                "engine": "2JZ-GTE",
+                "version": "MK4",
+                "year": "1996",
+                "status": "available"
+            }
+        ],
+        "bookings": []
+    }
+    temp_db_path = tmp_path / "db.json"
+    temp_db_path.write_text(json.dumps(test_data))
+
+    return JSONDatabase(file_path=str(temp_db_path))
 
 @pytest.fixture
 def client():
@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_occupancy_report():
+    """Test that a booking shows in the car's utilization and the daily occupancy."""
+    start = date.today() + timedelta(days=160)
+    end = start + timedelta(days=2)
+    car_id = client.get(
+        f"/cars/available/range?start_date={start.isoformat()}&end_date={end.isoformat()}"
+    ).json()["data"][-1]["id"]
+    response = client.post("/bookings/", json={
+        "car_id": car_id,
+        "customer_name": "Report User",
+        "customer_email": "report@example.com",
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+    })
+    assert response.status_code == 200
+
+    window_start, window_end = start - timedelta(days=1), end + timedelta(days=1)
+    response = client.get(
+        f"/analytics/occupancy?start_date={window_start.isoformat()}&end_date={window_end.isoformat()}&peaks=3"
+    )
+
+    assert response.status_code == 200
+    report = response.json()["data"]
+    assert report["days"] == 5
+    assert report["car_count"] == len(report["cars"])
+    assert [day["date"] for day in report["daily"]] == [
+        (window_start + timedelta(days=offset)).isoformat() for offset in range(5)
+    ]
+    car = next(car for car in report["cars"] if car["car_id"] == car_id)
+    assert car == {"car_id": car_id, "booked_days": 3, "utilization": 0.6}
+    assert all(day["booked_cars"] >= 1 for day in report["daily"][1:4])
+    assert {day["date"] for day in report["peak_days"]} == {day["date"] for day in report["daily"][1:4]}
+    assert 0 < report["fleet_utilization"] <= 1
+
+    etag = response.headers["etag"]
+    cached = client.get(
+        f"/analytics/occupancy?start_date={window_start.isoformat()}&end_date={window_end.isoformat()}&peaks=3",
+        headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+
+
+def test_occupancy_report_invalid_window():
+    """Test that reversed and overlong windows are rejected."""
+    today = date.today()
+
+    reversed_window = client.get(
+        f"/analytics/occupancy?start_date={today.isoformat()}&end_date={(today - timedelta(days=1)).isoformat()}"
+    )
+    overlong_window = client.get(
+        f"/analytics/occupancy?start_date={today.isoformat()}&end_date={(today + timedelta(days=800)).isoformat()}"
+    )
+
+    assert reversed_window.status_code == 400
+    assert reversed_window.json()["detail"]["error_code"] == "INVALID_DATE_RANGE"
+    assert overlong_window.status_code == 400
@@ -0,0 +1,127 @@
+import json
+import threading
+from datetime import date, timedelta
+import anyio
+from app.core.models.booking_model import BookingRequest
+from app.core.models.pagination import BookingFilters
+from app.core.repositories.async_repositories import ThreadedCarRepository, ThreadedBookingRepository
+from app.core.repositories.json_repositories import JSONCarRepository, JSONBookingRepository
+from app.core.use_cases.booking_use_cases import BookingUseCases, AsyncBookingUseCases
+from app.core.use_cases.car_use_cases import AsyncCarUseCases
+from app.infra.db import JSONDatabase
+
+
+def make_use_cases(tmp_path):
+    db = JSONDatabase(str(tmp_path / "db.json"))
+    car_repo, booking_repo = JSONCarRepository(db), JSONBookingRepository(db)
+    limiter = anyio.CapacityLimiter(2)
+    async_booking_repo = ThreadedBookingRepository(booking_repo, limiter)
+    async_car_use_cases = AsyncCarUseCases(ThreadedCarRepository(car_repo, limiter), async_booking_repo)
+    async_booking_use_cases = AsyncBookingUseCases(
+        async_booking_repo, BookingUseCases(booking_repo, car_repo), limiter
+    )
+    return db, async_car_use_cases, async_booking_use_cases
+
+
+def test_async_use_cases_book_and_query(tmp_path):
+    """
+    Test that the async use cases create bookings and see them in availability.
+    """
+    db, car_use_cases, booking_use_cases = make_use_cases(tmp_path)
+    day = date.today() + timedelta(days=1)
+
+    async def scenario():
+        car_id = (await car_use_cases.get_available_cars(day))[0]["id"]
+        await booking_use_cases.create_booking(BookingRequest(
+            car_id=car_id,
+            customer_name="Test User",
+            customer_email="test@example.com",
+            start_date=day,
+            end_date=day,
+        ))
+        available_ids = [car["id"] for car in await car_use_cases.get_available_cars(day)]
+        return car_id, available_ids, await booking_use_cases.get_all_bookings()
+
+    car_id, available_ids, bookings = anyio.run(scenario)
+
+    assert car_id not in available_ids
+    assert [booking["car_id"] for booking in bookings] == [car_id]
+
+
+def test_storage_runs_off_the_event_loop(tmp_path):
+    """
+    Test that blocking storage calls are not made on the event loop thread.
+    """
+    db, car_use_cases, _ = make_use_cases(tmp_path)
+    storage_threads = []
+    get_all_cars = db.get_all_cars
+
+    def recording_get_all_cars():
+        storage_threads.append(threading.get_ident())
+        return get_all_cars()
+
+    db.get_all_cars = recording_get_all_cars
+
+    async def scenario():
+        await car_use_cases.get_all_cars()
+        return threading.get_ident()
+
+    loop_thread = anyio.run(scenario)
+
+    assert storage_threads and loop_thread not in storage_threads
+
+
+def test_export_reads_bookings_in_batches(tmp_path):
+    """
+    Test that the NDJSON export walks every booking one cursor page at a time.
+    """
+    db, _, booking_use_cases = make_use_cases(tmp_path)
+    car_ids = [car["id"] for car in db.get_all_cars()]
+    day = date.today() + timedelta(days=1)
+    for i, car_id in enumerate(car_ids[:5]):
+        db.add_booking({
+            "id": f"booking-{i}",
+            "car_id": car_id,
+            "customer_name": "Test User",
+            "customer_email": "test@example.com",
+            "start_date": day.isoformat(),
+            "end_date": day.isoformat(),
+        })
+
+    async def scenario():
+        return [chunk async for chunk in booking_use_cases.export_bookings(BookingFilters(), batch_size=2)]
+
+    chunks = anyio.run(scenario)
+
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [f"booking-{i}" for i in range(5)]
+
+
+def test_export_resumes_when_its_cursor_is_archived(tmp_path):
+    """
+    Test that archiving the booking an export stopped at neither breaks nor repeats the export.
+    """
+    db, _, booking_use_cases = make_use_cases(tmp_path)
+    car_id = db.get_all_cars()[0]["id"]
+    past, upcoming = date(2020, 1, 1), date.today() + timedelta(days=1)
+    for i, day in enumerate([past, upcoming, past, past, upcoming]):
+        db.add_booking({
+            "id": f"booking-{i}",
+            "car_id": car_id,
+            "customer_name": "Test User",
+            "customer_email": "test@example.com",
+            "start_date": day.isoformat(),
+            "end_date": day.isoformat(),
+        })
+
+    async def scenario():
+        pages = booking_use_cases.export_bookings(BookingFilters(), batch_size=3)
+        chunks = [await pages.__anext__()]
+        db.archive_bookings(date.today())
+        return chunks + [chunk async for chunk in pages]
+
+    lines = b"".join(anyio.run(scenario)).decode().splitlines()
+
+    # booking-2, the cursor, was archived with booking-0 and the not yet exported booking-3.
+    assert [json.loads(line)["id"] for line in lines] == ["booking-0", "booking-1", "booking-2", "booking-4"]
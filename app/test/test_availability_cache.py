@@ -0,0 +1,131 @@
+from datetime import date, timedelta
+from app.core.availability_cache import AvailabilityCache, BookedCar
+from app.core.models.booking_model import BookingRequest
+from app.core.repositories.json_repositories import JSONCarRepository, JSONBookingRepository
+from app.core.use_cases.booking_use_cases import BookingUseCases
+from app.core.use_cases.car_use_cases import CarUseCases
+from app.infra.db import JSONDatabase
+
+DAY = date(2030, 1, 10)
+
+
+def cars(*car_ids):
+    return [{"id": car_id, "status": "available"} for car_id in car_ids]
+
+
+def test_hits_misses_and_lru_eviction():
+    """
+    Test that repeated lookups are hits and the least recently used entry is evicted.
+    """
+    cache = AvailabilityCache(max_entries=2)
+    assert cache.get(DAY, DAY, version=1) is None
+    cache.put(DAY, DAY, 1, cars("a"))
+    cache.put(DAY, DAY + timedelta(days=1), 1, cars("b"))
+
+    assert cache.get(DAY, DAY, version=1) == cars("a")
+    cache.put(DAY, DAY + timedelta(days=2), 1, cars("c"))
+
+    assert cache.get(DAY, DAY + timedelta(days=1), version=1) is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "evictions": 1, "invalidations": 0, "size": 2}
+
+
+def test_bookings_only_drop_affected_entries():
+    """
+    Test that a booking drops the overlapping listings of its car and nothing else.
+    """
+    cache = AvailabilityCache()
+    cache.get(DAY, DAY, version=1)
+    for offset in range(3):
+        cache.put(DAY + timedelta(days=offset), DAY + timedelta(days=offset), 1, cars("a", "b"))
+    cache.put(DAY + timedelta(days=5), DAY + timedelta(days=5), 1, cars("b"))
+
+    cache.record_bookings([BookedCar("a", DAY, DAY + timedelta(days=1), status_changed=False)], 1, 3)
+
+    assert cache.get(DAY, DAY, version=3) is None
+    assert cache.get(DAY + timedelta(days=1), DAY + timedelta(days=1), version=3) is None
+    assert cache.get(DAY + timedelta(days=2), DAY + timedelta(days=2), version=3) == cars("a", "b")
+    assert cache.get(DAY + timedelta(days=5), DAY + timedelta(days=5), version=3) == cars("b")
+
+    cache.record_bookings([BookedCar("b", DAY, DAY, status_changed=True)], 3, 5)
+    assert cache.get(DAY + timedelta(days=5), DAY + timedelta(days=5), version=5) is None
+
+
+def test_unexplained_version_change_clears_cache():
+    """
+    Test that writes from another worker, seen only as a new version, reset the cache.
+    """
+    cache = AvailabilityCache()
+    cache.get(DAY, DAY, version=1)
+    cache.put(DAY, DAY, 1, cars("a"))
+
+    assert cache.get(DAY, DAY, version=2) is None
+
+    cache.put(DAY, DAY, 1, cars("a"))
+    assert cache.stats()["size"] == 0
+
+    cache.put(DAY, DAY, 2, cars("a"))
+    cache.record_bookings([BookedCar("z", DAY, DAY, status_changed=True)], 1, 4)
+    assert cache.get(DAY, DAY, version=4) is None
+
+
+def test_use_cases_share_cache_and_invalidate_on_booking(tmp_path):
+    """
+    Test that hot dates are served from the cache until a booking touches them.
+    """
+    db = JSONDatabase(str(tmp_path / "db.json"))
+    car_repo, booking_repo = JSONCarRepository(db), JSONBookingRepository(db)
+    cache = AvailabilityCache()
+    car_use_cases = CarUseCases(car_repo, booking_repo, cache)
+    booking_use_cases = BookingUseCases(booking_repo, car_repo, cache)
+    day = date.today() + timedelta(days=1)
+
+    first = car_use_cases.get_available_cars(day)
+    assert car_use_cases.get_available_cars(day) == first
+    assert cache.stats()["hits"] == 1
+
+    booking_use_cases.create_booking(BookingRequest(
+        car_id=first[0]["id"],
+        customer_name="Test User",
+        customer_email="test@example.com",
+        start_date=day,
+        end_date=day,
+    ))
+
+    after_booking = car_use_cases.get_available_cars(day)
+    assert first[0]["id"] not in [car["id"] for car in after_booking]
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_overlapping_local_writes_clear_cache():
+    """
+    Test that two writes of this process in flight together reset the cache, even when
+    each one's version step looks like its own.
+    """
+    cache = AvailabilityCache()
+    cache.get(DAY, DAY, version=1)
+    cache.put(DAY + timedelta(days=5), DAY + timedelta(days=5), 1, cars("a"))
+
+    cache.begin_write()
+    cache.begin_write()
+    cache.record_bookings([BookedCar("a", DAY, DAY, status_changed=False)], 1, 2)
+    cache.record_bookings([BookedCar("b", DAY, DAY, status_changed=False)], 1, 2)
+    assert cache.get(DAY + timedelta(days=5), DAY + timedelta(days=5), version=2) is None
+
+    cache.put(DAY + timedelta(days=5), DAY + timedelta(days=5), 2, cars("a"))
+    cache.begin_write()
+    cache.record_bookings([BookedCar("a", DAY, DAY, status_changed=False)], 2, 3)
+    assert cache.get(DAY + timedelta(days=5), DAY + timedelta(days=5), version=3) == cars("a")
+
+
+def test_failed_write_clears_cache():
+    """
+    Test that a write which raised part way resets the cache.
+    """
+    cache = AvailabilityCache()
+    cache.get(DAY, DAY, version=1)
+    cache.put(DAY, DAY, 1, cars("a"))
+
+    cache.begin_write()
+    cache.abort_write()
+
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,45 @@
+import json
+import random
+from collections import defaultdict
+from datetime import date
+from app.benchmarks.data import booking_horizon, generate_bookings, generate_cars
+from app.benchmarks.run import main
+
+
+def test_generated_bookings_never_overlap():
+    """
+    Test that synthetic histories are valid: no car is booked twice on the same day.
+    """
+    rng = random.Random(1)
+    cars = generate_cars(7, rng)
+    bookings = generate_bookings(cars, 100, rng)
+    first_day, last_day = booking_horizon(7, 100)
+
+    by_car = defaultdict(list)
+    for booking in bookings:
+        by_car[booking["car_id"]].append(
+            (date.fromisoformat(booking["start_date"]), date.fromisoformat(booking["end_date"]))
+        )
+    for intervals in by_car.values():
+        intervals.sort()
+        assert all(end < next_start for (_, end), (next_start, _) in zip(intervals, intervals[1:]))
+        assert first_day <= intervals[0][0] and intervals[-1][1] <= last_day
+    assert len(bookings) == 100 and len(by_car) == 7
+
+
+def test_benchmark_run_saves_comparable_results(tmp_path):
+    """
+    Test a tiny benchmark run end to end, including the comparison with a saved run.
+    """
+    first = tmp_path / "first.json"
+    main(["--backend", "json", "sqlite", "--cars", "10", "--bookings", "40", "--requests", "3",
+          "--output", str(first)])
+    result = main(["--backend", "json", "--cars", "10", "--bookings", "40", "--requests", "3",
+                   "--output", str(tmp_path / "second.json"), "--compare", str(first)])
+
+    saved = json.loads(first.read_text())
+    assert [run["backend"] for run in saved["runs"]] == ["json", "sqlite"]
+    scenario = saved["runs"][0]["scenarios"]["POST /bookings/"]
+    assert scenario["requests"] == 3
+    assert scenario["p50_ms"] <= scenario["p99_ms"]
+    assert "GET /cars/available" in result["runs"][0]["scenarios"]
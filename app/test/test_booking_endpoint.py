@@ -1,6 +1,8 @@
+import json
 from uuid import uuid4
 from fastapi.testclient import TestClient
 from app.main import app
+from app.core.models.booking_model import MAX_BATCH_SIZE
 import pytest
 from datetime import date, timedelta
 
@@ -69,6 +71,23 @@ def test_create_booking_invalid_dates():
     assert "cannot be after end date" in data["detail"]["message"].lower()
 
 
+def test_create_booking_too_long():
+    """Test that a booking longer than the maximum length is rejected before anything is stored."""
+
+    car_id = client.get("/cars/available?target_date=" + (date.today() + timedelta(days=5)).isoformat()).json()["data"][0]["id"]
+    response = client.post("/bookings/", json={
+        "car_id": car_id,
+        "customer_name": "Test User",
+        "customer_email": "test@example.com",
+        "start_date": (date.today() + timedelta(days=5)).isoformat(),
+        "end_date": "2099-12-31"
+    })
+
+    assert response.status_code == 400
+    assert "at most 366 days" in response.json()["detail"]["message"]
+    assert client.get(f"/bookings/?car_id={car_id}&start_date=2099-01-01").json()["data"] == []
+
+
 def test_create_booking_with_nonexist_car():
     """Test creating a booking with a non-existent car."""
 
@@ -85,4 +104,238 @@ def test_create_booking_with_nonexist_car():
     assert response.status_code == 400
     data = response.json()
     assert data["detail"]["status"] == "failed"
-    assert "was not found" in data["detail"]["message"].lower()
\ No newline at end of file
+    assert "was not found" in data["detail"]["message"].lower()
+
+def test_create_booking_overlapping_dates():
+    """Test that a car can be booked again only for dates that do not overlap."""
+
+    start = date.today() + timedelta(days=40)
+    car_id = client.get(f"/cars/available?target_date={start.isoformat()}").json()["data"][0]["id"]
+
+    def book(start_offset, end_offset):
+        return client.post("/bookings/", json={
+            "car_id": car_id,
+            "customer_name": "Test User",
+            "customer_email": "test@example.com",
+            "start_date": (start + timedelta(days=start_offset)).isoformat(),
+            "end_date": (start + timedelta(days=end_offset)).isoformat()
+        })
+
+    assert book(0, 2).status_code == 200
+    assert book(3, 4).status_code == 200
+
+    response = book(2, 3)
+    assert response.status_code == 400
+    assert "already booked" in response.json()["detail"]["message"].lower()
+
+
+def test_create_bookings_batch():
+    """Test that a batch reports each booking and rejects conflicts inside the batch."""
+
+    start = date.today() + timedelta(days=90)
+    available_cars = client.get(f"/cars/available?target_date={start.isoformat()}").json()["data"]
+    first_car, second_car = available_cars[0]["id"], available_cars[1]["id"]
+
+    def request(car_id, start_offset, end_offset):
+        return {
+            "car_id": car_id,
+            "customer_name": "Partner User",
+            "customer_email": "partner@example.com",
+            "start_date": (start + timedelta(days=start_offset)).isoformat(),
+            "end_date": (start + timedelta(days=end_offset)).isoformat()
+        }
+
+    response = client.post("/bookings/batch", json={"bookings": [
+        request(first_car, 0, 2),
+        request(first_car, 2, 3),
+        request(second_car, 0, 2),
+        request(first_car, 5, 1),
+        request(uuid4().hex, 0, 1),
+    ]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created_count"] == 2
+    assert data["failed_count"] == 3
+    assert [result["status"] for result in data["data"]] == ["created", "failed", "created", "failed", "failed"]
+    assert "booking 0 of this batch" in data["data"][1]["error"]
+
+    first_car_ids = [b["id"] for b in client.get(f"/bookings/?car_id={first_car}").json()["data"]]
+    second_car_ids = [b["id"] for b in client.get(f"/bookings/?car_id={second_car}").json()["data"]]
+    assert data["data"][0]["data"]["id"] in first_car_ids
+    assert data["data"][2]["data"]["id"] in second_car_ids
+
+
+def test_create_bookings_batch_is_capped():
+    """Test that a batch over the size limit is rejected before anything is locked."""
+
+    day = (date.today() + timedelta(days=1)).isoformat()
+    booking = {
+        "car_id": uuid4().hex,
+        "customer_name": "Partner User",
+        "customer_email": "partner@example.com",
+        "start_date": day,
+        "end_date": day
+    }
+
+    response = client.post("/bookings/batch", json={"bookings": [booking] * (MAX_BATCH_SIZE + 1)})
+
+    assert response.status_code == 422
+
+
+def test_get_bookings_filtered_and_paginated():
+    """Test that bookings can be filtered by car and date window and read page by page."""
+
+    start = date.today() + timedelta(days=110)
+    car_id = client.get(f"/cars/available?target_date={start.isoformat()}").json()["data"][0]["id"]
+
+    created = []
+    for offset in (0, 3, 6):
+        response = client.post("/bookings/", json={
+            "car_id": car_id,
+            "customer_name": "Test User",
+            "customer_email": "test@example.com",
+            "start_date": (start + timedelta(days=offset)).isoformat(),
+            "end_date": (start + timedelta(days=offset + 1)).isoformat()
+        })
+        assert response.status_code == 200
+        created.append(response.json()["data"]["id"])
+
+    query = f"car_id={car_id}&start_date={start.isoformat()}&limit=2"
+    first_page = client.get(f"/bookings/?{query}").json()
+    assert first_page["total_count"] == 2
+    assert first_page["next_cursor"] == first_page["data"][1]["id"]
+
+    second_page = client.get(f"/bookings/?{query}&after={first_page['next_cursor']}").json()
+    assert second_page["next_cursor"] is None
+    assert [b["id"] for b in first_page["data"] + second_page["data"]] == created
+
+    window = f"start_date={(start + timedelta(days=1)).isoformat()}&end_date={(start + timedelta(days=3)).isoformat()}"
+    in_window = client.get(f"/bookings/?car_id={car_id}&{window}").json()["data"]
+    assert [b["id"] for b in in_window] == created[:2]
+    assert [b["id"] for b in client.get(f"/bookings/?{window}").json()["data"]][-2:] == created[:2]
+
+
+def test_get_bookings_invalid_query():
+    """Test that unknown cursors and inverted date windows are rejected."""
+
+    response = client.get(f"/bookings/?after={uuid4()}")
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_CURSOR"
+
+    response = client.get("/bookings/?start_date=2030-01-05&end_date=2030-01-01")
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_DATE_RANGE"
+
+
+def test_export_bookings_as_ndjson():
+    """Test that the export streams one JSON booking per line, filtered by date window."""
+
+    window = f"start_date={(date.today() + timedelta(days=110)).isoformat()}&end_date={(date.today() + timedelta(days=117)).isoformat()}"
+    listed = client.get(f"/bookings/?{window}&limit=1000").json()["data"]
+
+    response = client.get(f"/bookings/export?{window}")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [b["id"] for b in exported] == [b["id"] for b in listed]
+
+    response = client.get("/bookings/export?start_date=2030-01-05&end_date=2030-01-01")
+    assert response.status_code == 400
+
+
+def test_archived_bookings_are_listed_on_request():
+    """Test that archived bookings leave the default listing and can still be read with archived=true."""
+
+    container = app.state.container
+    car_id = client.get("/cars/?limit=1").json()["data"][0]["id"]
+    past_booking = {
+        "id": str(uuid4()),
+        "car_id": car_id,
+        "customer_name": "Past Customer",
+        "customer_email": "past@example.com",
+        "start_date": "2020-03-01",
+        "end_date": "2020-03-02",
+    }
+    container.booking_repo.create(past_booking)
+    window = "start_date=2020-03-01&end_date=2020-03-31"
+    assert [b["id"] for b in client.get(f"/bookings/?{window}").json()["data"]] == [past_booking["id"]]
+
+    assert container.booking_use_cases.archive_expired_bookings() >= 1
+
+    assert client.get(f"/bookings/?{window}").json()["data"] == []
+    archived = client.get(f"/bookings/?{window}&archived=true").json()["data"]
+    assert [b["id"] for b in archived] == [past_booking["id"]]
+    exported = client.get(f"/bookings/export?{window}&archived=true").text.splitlines()
+    assert [json.loads(line)["id"] for line in exported] == [past_booking["id"]]
+    assert client.get(f"/bookings/{past_booking['id']}").json()["data"]["id"] == past_booking["id"]
+
+
+def test_get_booking_by_id():
+    """Test fetching one booking by id, and the 404 for an unknown id."""
+
+    start = (date.today() + timedelta(days=150)).isoformat()
+    car_id = client.get(f"/cars/available?target_date={start}").json()["data"][0]["id"]
+    created = client.post("/bookings/", json={
+        "car_id": car_id,
+        "customer_name": "Test User",
+        "customer_email": "test@example.com",
+        "start_date": start,
+        "end_date": start
+    }).json()["data"]
+
+    response = client.get(f"/bookings/{created['id']}")
+    assert response.status_code == 200
+    assert response.json()["data"] == created
+
+    response = client.get(f"/bookings/{uuid4()}")
+    assert response.status_code == 404
+    assert response.json()["detail"]["error_code"] == "BOOKING_NOT_FOUND"
+
+
+def test_conflict_suggests_alternative_dates():
+    """Test that a rejected booking lists the nearest free windows, which can then be booked."""
+    start = date.today() + timedelta(days=210)
+    car_id = client.get(f"/cars/available?target_date={start.isoformat()}").json()["data"][0]["id"]
+
+    def booking(first, last):
+        return {
+            "car_id": car_id,
+            "customer_name": "Test User",
+            "customer_email": "test@example.com",
+            "start_date": (start + timedelta(days=first)).isoformat(),
+            "end_date": (start + timedelta(days=last)).isoformat()
+        }
+
+    assert client.post("/bookings/", json=booking(0, 2)).status_code == 200
+    response = client.post("/bookings/", json=booking(1, 3))
+
+    assert response.status_code == 400
+    detail = response.json()["detail"]
+    assert detail["error_code"] == "BOOKING_CREATION_FAILED"
+    assert detail["alternatives"][:2] == [
+        {"start_date": booking(3, 5)["start_date"], "end_date": booking(3, 5)["end_date"]},
+        {"start_date": booking(-3, -1)["start_date"], "end_date": booking(-3, -1)["end_date"]},
+    ]
+    assert client.post("/bookings/", json={**booking(1, 3), **detail["alternatives"][0]}).status_code == 200
+
+
+def test_conflict_at_the_end_of_the_calendar_suggests_earlier_dates():
+    """Test that alternatives for a conflict on the last days of the calendar stay within it."""
+    car_id = client.get("/cars/available?target_date=9999-12-30").json()["data"][0]["id"]
+    booking = {
+        "car_id": car_id,
+        "customer_name": "Test User",
+        "customer_email": "test@example.com",
+        "start_date": "9999-12-30",
+        "end_date": "9999-12-31"
+    }
+
+    assert client.post("/bookings/", json=booking).status_code == 200
+    response = client.post("/bookings/", json=booking)
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["alternatives"] == [
+        {"start_date": "9999-12-28", "end_date": "9999-12-29"}
+    ]
@@ -0,0 +1,33 @@
+from app.core.car_calendar import clip_spans, free_spans, merge_spans, nearest_free_windows
+
+
+def test_merge_spans_joins_overlapping_and_adjacent_spans():
+    """
+    Test that overlapping and back-to-back bookings merge into one stretch.
+    """
+    assert merge_spans([(20, 22), (1, 3), (4, 5), (2, 4), (10, 10)]) == [(1, 5), (10, 10), (20, 22)]
+    assert merge_spans([]) == []
+
+
+def test_free_and_clipped_spans_within_window():
+    """
+    Test the booked and free stretches of a window cutting through bookings.
+    """
+    booked = [(1, 5), (10, 10), (20, 22)]
+
+    assert clip_spans(booked, 3, 21) == [(3, 5), (10, 10), (20, 21)]
+    assert free_spans(booked, 3, 21) == [(6, 9), (11, 19)]
+    assert free_spans(booked, 6, 9) == [(6, 9)]
+    assert free_spans(booked, 20, 22) == []
+
+
+def test_nearest_free_windows():
+    """
+    Test that windows are taken from the free stretches closest to the target day.
+    """
+    booked = [(1, 5), (10, 10), (20, 22)]
+
+    # A 3-day stay wanted from day 9 fits from day 7 (distance 2) or day 11 (distance 2).
+    assert nearest_free_windows(booked, 9, 3, 0, 40, 3) == [(7, 9), (11, 13), (23, 25)]
+    assert nearest_free_windows(booked, 9, 5, 0, 40, 1) == [(11, 15)]
+    assert nearest_free_windows(booked, 0, 12, 0, 30, 2) == []
@@ -1,6 +1,8 @@
 from fastapi.testclient import TestClient
 from app.main import app
+from app.core.models.car_model import CarsListResponse
 from datetime import date, timedelta
+from uuid import uuid4
 
 client = TestClient(app)
 
@@ -82,4 +84,241 @@ def test_cars_response_structure():
         for field in expected_fields:
             assert field in car
         
-        assert car["status"] in ["available", "reserved", "maintenance"]
\ No newline at end of file
+        assert car["status"] in ["available", "reserved", "maintenance"]
+
+def test_available_cars_are_date_aware():
+    """
+    Test that a booked car is only unavailable on the dates it is booked.
+    """
+    start = date.today() + timedelta(days=30)
+    end = start + timedelta(days=1)
+    car_id = client.get(f"/cars/available?target_date={start.isoformat()}").json()["data"][0]["id"]
+
+    response = client.post("/bookings/", json={
+        "car_id": car_id,
+        "customer_name": "Test User",
+        "customer_email": "test@example.com",
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat()
+    })
+    assert response.status_code == 200
+
+    for day, expected in [(start, False), (end, False), (end + timedelta(days=1), True)]:
+        response = client.get(f"/cars/available?target_date={day.isoformat()}")
+        available_ids = [car["id"] for car in response.json()["data"]]
+        assert (car_id in available_ids) is expected
+
+
+def test_get_available_cars_for_range():
+    """
+    Test that a range query excludes cars booked on any day of the range.
+    """
+    start = date.today() + timedelta(days=50)
+    car_id = client.get(f"/cars/available?target_date={start.isoformat()}").json()["data"][0]["id"]
+    response = client.post("/bookings/", json={
+        "car_id": car_id,
+        "customer_name": "Test User",
+        "customer_email": "test@example.com",
+        "start_date": (start + timedelta(days=3)).isoformat(),
+        "end_date": (start + timedelta(days=4)).isoformat()
+    })
+    assert response.status_code == 200
+
+    def available_ids(start_offset, end_offset):
+        response = client.get(
+            "/cars/available/range"
+            f"?start_date={(start + timedelta(days=start_offset)).isoformat()}"
+            f"&end_date={(start + timedelta(days=end_offset)).isoformat()}"
+        )
+        assert response.status_code == 200
+        assert response.json()["total_count"] == len(response.json()["data"])
+        return [car["id"] for car in response.json()["data"]]
+
+    assert car_id not in available_ids(0, 13)
+    assert car_id in available_ids(0, 2)
+    assert car_id in available_ids(5, 13)
+
+
+def test_availability_calendar_matches_daily_availability():
+    """
+    Test that the calendar marks booked days and agrees with /cars/available on every day.
+    """
+    start = date.today() + timedelta(days=170)
+    car_id = client.get(f"/cars/available?target_date={start.isoformat()}").json()["data"][0]["id"]
+    response = client.post("/bookings/", json={
+        "car_id": car_id,
+        "customer_name": "Test User",
+        "customer_email": "test@example.com",
+        "start_date": (start + timedelta(days=2)).isoformat(),
+        "end_date": (start + timedelta(days=3)).isoformat()
+    })
+    assert response.status_code == 200
+
+    end = start + timedelta(days=6)
+    response = client.get(f"/cars/available/calendar?start_date={start.isoformat()}&end_date={end.isoformat()}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_count"] == len(body["data"])
+    calendar = {entry["car"]["id"]: entry["free_days"] for entry in body["data"]}
+    assert calendar[car_id] == "1100111"
+    for offset in range(7):
+        day = (start + timedelta(days=offset)).isoformat()
+        available = {car["id"] for car in client.get(f"/cars/available?target_date={day}").json()["data"]}
+        assert available == {car for car, free_days in calendar.items() if free_days[offset] == "1"}
+
+    past = client.get(
+        f"/cars/available/calendar?start_date={(date.today() - timedelta(days=1)).isoformat()}&end_date={end.isoformat()}"
+    )
+    assert past.status_code == 400
+    assert past.json()["detail"]["error_code"] == "INVALID_DATE_RANGE"
+
+
+def test_get_available_cars_for_inverted_range():
+    """
+    Test that a range ending before it starts is rejected.
+    """
+    start = (date.today() + timedelta(days=5)).isoformat()
+    end = (date.today() + timedelta(days=2)).isoformat()
+    response = client.get(f"/cars/available/range?start_date={start}&end_date={end}")
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_DATE_RANGE"
+
+
+def test_get_cars_paginated_and_filtered():
+    """
+    Test walking the car list page by page and filtering it by brand.
+    """
+    everything = client.get("/cars/").json()["data"]
+
+    cars, after = [], None
+    while True:
+        url = "/cars/?limit=3" + (f"&after={after}" if after else "")
+        page = client.get(url).json()
+        assert page["total_count"] <= 3
+        cars.extend(page["data"])
+        after = page["next_cursor"]
+        if after is None:
+            break
+    assert [car["id"] for car in cars] == [car["id"] for car in everything]
+
+    brand = everything[0]["brand"]
+    by_brand = client.get(f"/cars/?brand={brand}").json()["data"]
+    assert by_brand and all(car["brand"] == brand for car in by_brand)
+    assert [car["id"] for car in by_brand] == [car["id"] for car in everything if car["brand"] == brand]
+
+    maintenance = client.get("/cars/?status=maintenance").json()["data"]
+    assert all(car["status"] == "maintenance" for car in maintenance)
+
+
+def test_get_cars_invalid_cursor():
+    """
+    Test that an unknown cursor is rejected.
+    """
+    response = client.get("/cars/?after=not-a-car")
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_CURSOR"
+
+
+def test_cars_response_matches_declared_model():
+    """
+    Test that the directly rendered JSON still matches the declared response model.
+    """
+    response = client.get("/cars/?limit=2")
+
+    assert response.headers["content-type"] == "application/json"
+    parsed = CarsListResponse.model_validate_json(response.content)
+    assert response.json() == parsed.model_dump(mode="json")
+
+
+def test_conditional_get_uses_data_version():
+    """
+    Test that an unchanged car list answers If-None-Match with 304 until data changes.
+    """
+    target_date = (date.today() + timedelta(days=130)).isoformat()
+    url = f"/cars/available?target_date={target_date}"
+    response = client.get(url)
+    etag = response.headers["etag"]
+
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert client.get("/cars/", headers={"If-None-Match": etag}).status_code == 200
+
+    client.post("/bookings/", json={
+        "car_id": response.json()["data"][0]["id"],
+        "customer_name": "Test User",
+        "customer_email": "test@example.com",
+        "start_date": target_date,
+        "end_date": target_date
+    })
+
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_get_car_by_id():
+    """Test fetching one car by id, and the 404 for an unknown id."""
+    car = client.get("/cars/?limit=1").json()["data"][0]
+
+    response = client.get(f"/cars/{car['id']}")
+    assert response.status_code == 200
+    assert response.json()["data"] == car
+
+    response = client.get(f"/cars/{uuid4()}")
+    assert response.status_code == 404
+    assert response.json()["detail"]["error_code"] == "CAR_NOT_FOUND"
+
+
+def test_car_calendar_with_free_window_search():
+    """
+    Test that a car's calendar merges its bookings and finds the next run of free days.
+    """
+    start = date.today() + timedelta(days=190)
+    car_id = client.get(f"/cars/available?target_date={start.isoformat()}").json()["data"][0]["id"]
+    for first, last in [(2, 3), (4, 4), (7, 7)]:
+        response = client.post("/bookings/", json={
+            "car_id": car_id,
+            "customer_name": "Test User",
+            "customer_email": "test@example.com",
+            "start_date": (start + timedelta(days=first)).isoformat(),
+            "end_date": (start + timedelta(days=last)).isoformat()
+        })
+        assert response.status_code == 200
+
+    def day(offset):
+        return (start + timedelta(days=offset)).isoformat()
+
+    response = client.get(f"/cars/{car_id}/calendar?start_date={day(0)}&end_date={day(9)}&free_for=3")
+
+    assert response.status_code == 200
+    calendar = response.json()["data"]
+    assert calendar["booked"] == [
+        {"start_date": day(2), "end_date": day(4)},
+        {"start_date": day(7), "end_date": day(7)},
+    ]
+    assert calendar["free"] == [
+        {"start_date": day(0), "end_date": day(1)},
+        {"start_date": day(5), "end_date": day(6)},
+        {"start_date": day(8), "end_date": day(9)},
+    ]
+    assert calendar["next_free_window"] == {"start_date": day(8), "end_date": day(10)}
+
+    missing = client.get(f"/cars/{uuid4()}/calendar?start_date={day(0)}&end_date={day(9)}")
+    assert missing.status_code == 404
+    assert missing.json()["detail"]["error_code"] == "CAR_NOT_FOUND"
+
+
+def test_car_calendar_search_stops_at_the_end_of_the_calendar():
+    """
+    Test that a free window search starting near the last representable day stays within it.
+    """
+    car_id = client.get("/cars/").json()["data"][-1]["id"]
+
+    response = client.get(f"/cars/{car_id}/calendar?start_date=9999-12-01&end_date=9999-12-31&free_for=10")
+
+    assert response.status_code == 200
+    assert response.json()["data"]["next_free_window"] == {"start_date": "9999-12-01", "end_date": "9999-12-10"}
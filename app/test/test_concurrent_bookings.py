@@ -0,0 +1,99 @@
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import pytest
+from app.core.exceptions import CarNotAvailableError
+from app.core.models.booking_model import BookingRequest
+from app.core.repositories.json_repositories import JSONCarRepository, JSONBookingRepository
+from app.core.use_cases.booking_use_cases import BookingUseCases
+from app.infra.db import JSONDatabase
+from app.infra.journal_db import JournalJSONDatabase
+from app.infra.sharded_db import ShardedJSONDatabase
+
+DATABASES = {"json": JSONDatabase, "journal": JournalJSONDatabase, "sharded": ShardedJSONDatabase}
+
+
+def make_use_cases(backend, db_path):
+    db = DATABASES[backend](db_path)
+    return db, BookingUseCases(JSONBookingRepository(db), JSONCarRepository(db))
+
+
+def make_request(car_id, start_offset, end_offset):
+    return BookingRequest(
+        car_id=car_id,
+        customer_name="Test User",
+        customer_email="test@example.com",
+        start_date=date.today() + timedelta(days=start_offset),
+        end_date=date.today() + timedelta(days=end_offset),
+    )
+
+
+def try_booking(backend, db_path, car_id, start_offset, end_offset):
+    _, use_cases = make_use_cases(backend, db_path)
+    try:
+        use_cases.create_booking(make_request(car_id, start_offset, end_offset))
+        return True
+    except CarNotAvailableError:
+        return False
+
+
+def book_many(backend, db_path, car_id, count):
+    _, use_cases = make_use_cases(backend, db_path)
+    for i in range(count):
+        use_cases.create_booking(make_request(car_id, 2 * i + 1, 2 * i + 1))
+
+
+@pytest.mark.parametrize("backend", DATABASES)
+def test_same_car_is_booked_once_across_threads(backend, tmp_path):
+    """
+    Test that concurrent requests for the same car and dates produce one booking.
+    """
+    db, use_cases = make_use_cases(backend, str(tmp_path / "db.json"))
+    car_id = db.get_all_cars()[0]["id"]
+
+    def attempt(_):
+        try:
+            use_cases.create_booking(make_request(car_id, 1, 3))
+            return True
+        except CarNotAvailableError:
+            return False
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(attempt, range(8)))
+
+    assert results.count(True) == 1
+    assert len(db.get_bookings_by_car_id(car_id)) == 1
+
+
+@pytest.mark.parametrize("backend", DATABASES)
+def test_same_car_is_booked_once_across_processes(backend, tmp_path):
+    """
+    Test that workers with their own database instance cannot double-book a car.
+    """
+    db_path = str(tmp_path / "db.json")
+    db, _ = make_use_cases(backend, db_path)
+    car_id = db.get_all_cars()[0]["id"]
+
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        results = pool.starmap(try_booking, [(backend, db_path, car_id, 1, 3)] * 8)
+
+    assert results.count(True) == 1
+    assert len(make_use_cases(backend, db_path)[0].get_bookings_by_car_id(car_id)) == 1
+
+
+@pytest.mark.parametrize("backend", DATABASES)
+def test_writes_from_processes_are_not_lost(backend, tmp_path):
+    """
+    Test that bookings committed in parallel by several workers are all kept.
+    """
+    db_path = str(tmp_path / "db.json")
+    db, _ = make_use_cases(backend, db_path)
+    car_ids = [car["id"] for car in db.get_all_cars() if car["status"] != "maintenance"][:4]
+
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        pool.starmap(book_many, [(backend, db_path, car_id, 5) for car_id in car_ids])
+
+    reopened = DATABASES[backend](db_path)
+    assert len(reopened.get_all_bookings()) == 20
+    for car_id in car_ids:
+        assert len(reopened.get_bookings_by_car_id(car_id)) == 5
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import Settings
+from app.core.dependencies import build_container
+from app.core import dependencies
+from app.core.models.car_model import CarStatus
+
+client = TestClient(app)
+
+
+def test_database_is_not_rebuilt_per_request():
+    """
+    Test that requests reuse the application-scoped database.
+    """
+    with patch("app.core.dependencies.JSONDatabase") as database_cls:
+        client.get("/cars/")
+        client.get("/bookings/")
+
+    database_cls.assert_not_called()
+
+
+def test_injected_container_is_used(app_container, tmp_path):
+    """
+    Test that a test can inject its own storage through the app state.
+    """
+    container = build_container(Settings(db_path=str(tmp_path / "db.json")))
+    container.db.set_status_car(container.db.get_all_cars()[0]["id"], CarStatus.MAINTENANCE)
+    app.state.container = container
+
+    try:
+        response = client.get("/cars/")
+    finally:
+        app.state.container = app_container
+
+    expected = [car["id"] for car in container.db.get_all_cars() if car["status"] == "available"]
+    assert [car["id"] for car in response.json()["data"]] == expected
+
+
+def test_container_is_built_off_the_event_loop(app_container, tmp_path):
+    """
+    Test that a container built on first use does not block the event loop.
+    """
+    loops = []
+
+    def recording_build_container(settings):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return build_container(Settings(db_path=str(tmp_path / "db.json")))
+
+    app.state.container = None
+    try:
+        with patch.object(dependencies, "build_container", recording_build_container):
+            assert client.get("/cars/").status_code == 200
+            assert client.get("/cars/").status_code == 200
+    finally:
+        app.state.container = app_container
+
+    assert loops == [None]
+
+
+def test_unknown_storage_backend_is_rejected(tmp_path):
+    """
+    Test that a misconfigured backend fails fast.
+    """
+    with pytest.raises(ValueError, match="unknown"):
+        build_container(Settings(storage_backend="unknown", db_path=str(tmp_path / "db.json")))
@@ -0,0 +1,111 @@
+from datetime import date
+from app.infra.indexes import CarIntervalIndex, DailyBookingIndex, PositionIndex
+from app.infra.records import BookingRecord
+
+
+def booking(booking_id, car_id, start, end):
+    return BookingRecord.from_dict({"id": booking_id, "car_id": car_id, "start_date": start, "end_date": end})
+
+
+def test_find_overlapping_in_disjoint_intervals():
+    """
+    Test overlap detection against sorted, non-overlapping bookings.
+    """
+    index = CarIntervalIndex()
+    index.add(booking("b2", "car-1", "2030-01-10", "2030-01-12"))
+    index.add(booking("b1", "car-1", "2030-01-01", "2030-01-03"))
+    index.add(booking("b3", "car-2", "2030-01-05", "2030-01-05"))
+
+    assert index.find_overlapping("car-1", date(2030, 1, 3), date(2030, 1, 4)).id == "b1"
+    assert index.find_overlapping("car-1", date(2030, 1, 4), date(2030, 1, 9)) is None
+    assert index.find_overlapping("car-1", date(2030, 1, 5), date(2030, 1, 20)).id == "b2"
+    assert index.find_overlapping("car-1", date(2029, 12, 1), date(2029, 12, 31)) is None
+    assert index.find_overlapping("car-2", date(2030, 1, 1), date(2030, 1, 4)) is None
+    assert index.find_overlapping("car-3", date(2030, 1, 1), date(2030, 1, 31)) is None
+    assert [b.id for b in index.bookings_for("car-1")] == ["b1", "b2"]
+
+
+def test_find_overlapping_with_overlapping_intervals():
+    """
+    Test overlap detection when stored bookings already overlap each other.
+    """
+    index = CarIntervalIndex()
+    index.add(booking("long", "car-1", "2030-01-01", "2030-01-31"))
+    index.add(booking("short", "car-1", "2030-01-05", "2030-01-06"))
+
+    assert index.find_overlapping("car-1", date(2030, 1, 20), date(2030, 1, 21)).id == "long"
+    assert index.find_overlapping("car-1", date(2030, 2, 1), date(2030, 2, 2)) is None
+
+
+def test_intervals_between():
+    """
+    Test the intervals of one car overlapping a range, for disjoint and overlapping bookings.
+    """
+    index = CarIntervalIndex()
+    index.add(booking("b2", "car-1", "2030-01-10", "2030-01-12"))
+    index.add(booking("b1", "car-1", "2030-01-01", "2030-01-03"))
+    index.add(booking("b3", "car-1", "2030-01-20", "2030-01-25"))
+    day = date(2030, 1, 1).toordinal() - 1
+
+    assert index.intervals_between("car-1", day + 3, day + 20) == [(day + 1, day + 3), (day + 10, day + 12), (day + 20, day + 25)]
+    assert index.intervals_between("car-1", day + 4, day + 9) == []
+    assert index.intervals_between("car-2", day + 1, day + 31) == []
+
+    index.add(booking("long", "car-1", "2029-12-01", "2030-01-31"))
+    assert index.intervals_between("car-1", day + 13, day + 19) == [(day - 30, day + 31)]
+
+
+def test_invalid_bookings_are_skipped():
+    """
+    Test that malformed bookings do not break the index.
+    """
+    index = CarIntervalIndex()
+    index.add(booking("bad", "car-1", "not-a-date", "2030-01-01"))
+
+    assert index.bookings_for("car-1") == []
+
+
+def test_daily_index_merges_positions_between_dates():
+    """
+    Test that a date window yields each overlapping booking once, in position order.
+    """
+    index = DailyBookingIndex()
+    index.add(0, booking("b0", "car-1", "2030-01-01", "2030-01-10"))
+    index.add(1, booking("b1", "car-2", "2030-01-03", "2030-01-04"))
+    index.add(2, booking("b2", "car-3", "2030-01-20", "2030-01-21"))
+    index.add(3, booking("b3", "car-2", "2030-01-05", "2030-01-05"))
+
+    assert list(index.positions_between(date(2030, 1, 4), date(2030, 1, 5))) == [0, 1, 3]
+    assert list(index.positions_between(date(2030, 1, 4), date(2030, 1, 5), after=0)) == [1, 3]
+    assert list(index.positions_between(date(2030, 2, 1), date(2030, 2, 28))) == []
+    assert index.positions_on(date(2030, 1, 20)) == [2]
+
+
+def test_daily_index_keeps_long_bookings_as_intervals():
+    """
+    Test that a booking spanning centuries is indexed as one interval and still found on any day.
+    """
+    index = DailyBookingIndex()
+    index.add(0, booking("b0", "car-1", "2030-01-01", "2030-01-02"))
+    index.add(1, booking("long", "car-2", "2030-01-02", "2999-12-31"))
+    index.add(2, booking("b2", "car-3", "2030-01-02", "2030-01-03"))
+
+    assert len(index._days) == 3
+    assert index.positions_on(date(2030, 1, 2)) == [0, 1, 2]
+    assert index.positions_on(date(2500, 6, 1)) == [1]
+    assert index.positions_on(date(2029, 12, 31)) == []
+    assert list(index.positions_between(date(2030, 1, 1), date(2030, 1, 3), after=0)) == [1, 2]
+    assert index.positions_within(date(2030, 1, 3), date(2031, 1, 1)) == {1, 2}
+
+
+def test_position_index_keeps_positions_sorted():
+    """
+    Test that positions stay ascending whatever order they are added in.
+    """
+    index = PositionIndex()
+    for position in (4, 1, 7, 3):
+        index.add("available", position)
+    index.remove("available", 7)
+
+    assert index.positions("available") == [1, 3, 4]
+    assert index.positions("reserved") == []
@@ -0,0 +1,146 @@
+import json
+from datetime import date
+from app.core.models.car_model import CarStatus
+from app.core.models.pagination import BookingFilters
+from app.infra.journal_db import JournalJSONDatabase
+
+
+def test_writes_append_to_journal(tmp_path, make_booking):
+    """
+    Test that writes go to the journal and leave the snapshot untouched.
+    """
+    db = JournalJSONDatabase(str(tmp_path / "db.json"))
+    snapshot_before = (tmp_path / "db.json").read_text()
+    car_id = db.get_all_cars()[0]["id"]
+
+    db.add_booking(make_booking(car_id))
+    db.set_status_car(car_id, CarStatus.RESERVED)
+
+    assert (tmp_path / "db.json").read_text() == snapshot_before
+    records = [json.loads(line) for line in (tmp_path / "db.journal").read_text().splitlines()]
+    assert [record["op"] for record in records] == ["add_booking", "set_status_car"]
+
+
+def test_restart_replays_journal(tmp_path, make_booking):
+    """
+    Test that a new instance sees the snapshot plus the journal.
+    """
+    db = JournalJSONDatabase(str(tmp_path / "db.json"))
+    car_id = db.get_all_cars()[0]["id"]
+    booking = make_booking(car_id)
+    db.add_booking(booking)
+    db.set_status_car(car_id, CarStatus.MAINTENANCE)
+
+    reopened = JournalJSONDatabase(str(tmp_path / "db.json"))
+
+    assert [b["id"] for b in reopened.get_all_bookings()] == [str(booking["id"])]
+    assert reopened.get_car_by_id(car_id)["status"] == "maintenance"
+
+
+def test_torn_last_record_is_discarded(tmp_path, make_booking):
+    """
+    Test that a partially written last line is dropped on startup.
+    """
+    db = JournalJSONDatabase(str(tmp_path / "db.json"))
+    car_id = db.get_all_cars()[0]["id"]
+    booking = make_booking(car_id)
+    db.add_booking(booking)
+    with open(tmp_path / "db.journal", "ab") as f:
+        f.write(b'{"seq": 2, "op": "add_booking", "booking": {"id": "tor')
+
+    reopened = JournalJSONDatabase(str(tmp_path / "db.json"))
+    reopened.add_booking(make_booking(car_id))
+
+    assert len(reopened.get_all_bookings()) == 2
+    assert len(JournalJSONDatabase(str(tmp_path / "db.json")).get_all_bookings()) == 2
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path, make_booking):
+    """
+    Test that compaction empties the journal without losing or duplicating data.
+    """
+    db = JournalJSONDatabase(str(tmp_path / "db.json"), compact_threshold=3)
+    car_id = db.get_all_cars()[0]["id"]
+    for _ in range(4):
+        db.add_booking(make_booking(car_id))
+
+    snapshot = json.loads((tmp_path / "db.json").read_text())
+    assert len(snapshot["bookings"]) == 3
+    assert len((tmp_path / "db.journal").read_text().splitlines()) == 1
+    assert len(JournalJSONDatabase(str(tmp_path / "db.json")).get_all_bookings()) == 4
+
+
+def test_journal_left_behind_by_compaction_is_not_replayed_twice(tmp_path, make_booking):
+    """
+    Test that records already folded into the snapshot are skipped on replay.
+    """
+    db = JournalJSONDatabase(str(tmp_path / "db.json"))
+    car_id = db.get_all_cars()[0]["id"]
+    db.add_booking(make_booking(car_id))
+    journal = (tmp_path / "db.journal").read_bytes()
+
+    db.compact()
+    (tmp_path / "db.journal").write_bytes(journal)
+
+    assert len(JournalJSONDatabase(str(tmp_path / "db.json")).get_all_bookings()) == 1
+
+
+def test_data_version_survives_replay_and_compaction(tmp_path, make_booking):
+    """
+    Test that every process sees the same, ever-growing data version.
+    """
+    db = JournalJSONDatabase(str(tmp_path / "db.json"), compact_threshold=3)
+    car_id = db.get_all_cars()[0]["id"]
+    start_version = db.data_version()
+
+    db.add_booking(make_booking(car_id))
+    db.set_status_car(car_id, CarStatus.RESERVED)
+    assert db.data_version() == start_version + 2
+    assert JournalJSONDatabase(str(tmp_path / "db.json")).data_version() == start_version + 2
+
+    db.set_status_car(car_id, CarStatus.AVAILABLE)
+    assert JournalJSONDatabase(str(tmp_path / "db.json")).data_version() == start_version + 3
+
+
+def test_archiving_moves_expired_bookings_for_every_process(tmp_path, make_booking):
+    """
+    Test that expired bookings leave the working set, stay readable from the archive,
+    and that other processes replay the archiving from the journal.
+    """
+    db = JournalJSONDatabase(str(tmp_path / "db.json"))
+    other = JournalJSONDatabase(str(tmp_path / "db.json"))
+    car_id = db.get_all_cars()[0]["id"]
+    past = {**make_booking(car_id), "start_date": date(2020, 1, 1), "end_date": date(2020, 1, 3)}
+    current = make_booking(car_id)
+    db.add_bookings([past, current])
+
+    assert db.archive_bookings(date.today()) == 1
+    assert db.archive_bookings(date.today()) == 0
+
+    assert [b["id"] for b in other.get_all_bookings()] == [str(current["id"])]
+    assert other.find_overlapping_booking(car_id, date(2020, 1, 2), date(2020, 1, 2)) is None
+    assert [b["id"] for b in other.find_archived_bookings(BookingFilters(car_id=car_id), None, 10)] == [
+        str(past["id"])
+    ]
+    assert other.find_archived_bookings(BookingFilters(start_date=date(2021, 1, 1)), None, 10) == []
+
+
+def test_reader_loading_during_compaction_catches_up(tmp_path, make_booking):
+    """
+    Test that a worker reading between the snapshot and journal steps of a compaction
+    follows the new journal afterwards instead of replaying it from a stale offset.
+    """
+    writer = JournalJSONDatabase(str(tmp_path / "db.json"), compact_threshold=20)
+    reader = JournalJSONDatabase(str(tmp_path / "db.json"))
+    car_id = writer.get_all_cars()[0]["id"]
+    commit = writer._commit
+
+    def commit_then_read(data):
+        commit(data)
+        reader.get_all_bookings()
+
+    writer._commit = commit_then_read
+    for _ in range(30):
+        writer.add_booking(make_booking(car_id))
+
+    assert len(reader.get_all_bookings()) == len(writer.get_all_bookings()) == 30
@@ -0,0 +1,97 @@
+import json
+import os
+from unittest.mock import patch
+from datetime import date, timedelta
+from app.core.models.car_model import CarStatus
+
+
+def test_reads_are_served_from_snapshot(test_db):
+    """
+    Test that repeated reads parse the file only once.
+    """
+    with patch("app.infra.db.json.load", wraps=json.load) as json_load:
+        test_db.get_all_cars()
+        test_db.get_car_by_id("test-car-1")
+        test_db.get_all_bookings()
+
+    assert json_load.call_count == 1
+
+
+def test_snapshot_reloads_after_external_change(test_db):
+    """
+    Test that a change made to the file on disk is picked up.
+    """
+    assert test_db.get_car_by_id("test-car-1")["status"] == "available"
+
+    with open(test_db.file_path) as f:
+        data = json.load(f)
+    data["cars"][0]["status"] = "maintenance"
+    with open(test_db.file_path, "w") as f:
+        json.dump(data, f, indent=4)
+    stat = os.stat(test_db.file_path)
+    os.utime(test_db.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert test_db.get_car_by_id("test-car-1")["status"] == "maintenance"
+
+
+def test_writes_update_snapshot_and_file(test_db, make_booking):
+    """
+    Test that writes are visible from the cache and persisted to disk.
+    """
+    booking = make_booking("test-car-1")
+    test_db.add_booking(booking)
+    test_db.set_status_car("test-car-1", CarStatus.RESERVED)
+
+    cached_booking = test_db.get_all_bookings()[0]
+    assert cached_booking["id"] == str(booking["id"])
+    assert cached_booking["start_date"] == booking["start_date"].isoformat()
+    assert test_db.get_car_by_id("test-car-1")["status"] == "reserved"
+
+    with open(test_db.file_path) as f:
+        data = json.load(f)
+    assert data["bookings"] == [cached_booking]
+    assert data["cars"][0]["status"] == "reserved"
+
+
+def test_interval_index_tracks_new_bookings(test_db, make_booking):
+    """
+    Test that bookings added through the database are visible to overlap checks.
+    """
+    start = date.today() + timedelta(days=3)
+    end = date.today() + timedelta(days=5)
+    test_db.add_booking(make_booking("test-car-2", start, end))
+
+    assert test_db.find_overlapping_booking("test-car-2", end, end + timedelta(days=1)) is not None
+    assert test_db.find_overlapping_booking("test-car-2", end + timedelta(days=1), end + timedelta(days=2)) is None
+    assert test_db.find_overlapping_booking("test-car-1", start, end) is None
+    assert len(test_db.get_bookings_by_car_id("test-car-2")) == 1
+
+
+def test_booking_intervals_include_archived_bookings(test_db, make_booking):
+    """
+    Test that booking intervals cover active bookings, and archived ones for past windows.
+    """
+    for car_id, start, end in [
+        ("test-car-1", date(2020, 1, 1), date(2020, 1, 3)),
+        ("test-car-2", date.today() + timedelta(days=2), date.today() + timedelta(days=4)),
+    ]:
+        test_db.add_booking(make_booking(car_id, start, end))
+    assert test_db.archive_bookings(date.today()) == 1
+
+    upcoming = (date.today() + timedelta(days=2)).toordinal(), (date.today() + timedelta(days=4)).toordinal()
+    assert test_db.get_booking_intervals(date.today(), date.today() + timedelta(days=2)) == [("test-car-2", *upcoming)]
+    assert test_db.get_booking_intervals(date(2020, 1, 3), date(2020, 1, 9)) == [
+        ("test-car-1", date(2020, 1, 1).toordinal(), date(2020, 1, 3).toordinal())
+    ]
+
+
+def test_car_locks_use_a_bounded_number_of_files(test_db):
+    """
+    Test that locking a large batch of cars holds a fixed number of lock files.
+    """
+    car_ids = [f"car-{i}" for i in range(400)]
+
+    with test_db.lock_cars(car_ids):
+        lock_files = list(test_db.car_locks.directory.iterdir())
+
+    assert 0 < len(lock_files) <= 64
@@ -0,0 +1,84 @@
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+from app.core.logger.setup_logger import DeferredQueueHandler, JsonFormatter
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+class CountingArg:
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "counted"
+
+
+def make_logger(name, handler, level=logging.INFO):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(level)
+    return logger
+
+
+def test_queue_handler_formats_on_listener_thread():
+    """
+    Test that records reach the file handler through the queue, with arguments merged.
+    """
+    log_queue = queue.SimpleQueue()
+    target = ListHandler()
+    target.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    listener = QueueListener(log_queue, target)
+    logger = make_logger("test_queue_logger", DeferredQueueHandler(log_queue))
+    items = ["a"]
+
+    listener.start()
+    logger.info("Booked %s for %s", "car-1", items)
+    items.append("b")
+    listener.stop()
+
+    assert target.lines == ["INFO Booked car-1 for ['a']"]
+
+
+def test_disabled_levels_do_not_format_arguments():
+    """
+    Test that a message below the configured level never formats its arguments.
+    """
+    arg = CountingArg()
+    target = ListHandler()
+    logger = make_logger("test_level_logger", target, level=logging.WARNING)
+
+    logger.info("Value: %s", arg)
+    logger.warning("Value: %s", arg)
+
+    assert arg.calls == 1
+    assert target.lines == ["Value: counted"]
+
+
+def test_json_formatter_includes_exception():
+    """
+    Test that the JSON formatter writes one parseable object per record.
+    """
+    target = ListHandler()
+    target.setFormatter(JsonFormatter())
+    logger = make_logger("test_json_logger", target)
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.error("Failed for %s", "car-1", exc_info=True)
+
+    entry = json.loads(target.lines[0])
+    assert entry["level"] == "ERROR"
+    assert entry["message"] == "Failed for car-1"
+    assert "ValueError: boom" in entry["exception"]
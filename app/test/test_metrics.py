@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.metrics import MetricsRegistry
+
+client = TestClient(app)
+
+
+def test_registry_renders_prometheus_text():
+    """
+    Test the exposition format of counters, gauges and cumulative histogram buckets.
+    """
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    in_flight = registry.gauge("in_flight", "In flight.")
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+
+    requests.inc("/cars/")
+    requests.inc("/cars/")
+    in_flight.inc()
+    latency.observe("/cars/", value=0.05)
+    latency.observe("/cars/", value=0.5)
+    latency.observe("/cars/", value=3)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/cars/"} 2' in lines
+    assert "in_flight 1" in lines
+    assert 'latency_seconds_bucket{route="/cars/",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/cars/",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/cars/",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/cars/"} 3.55' in lines
+    assert 'latency_seconds_count{route="/cars/"} 3' in lines
+
+
+def test_metrics_endpoint_reports_requests_and_bookings():
+    """
+    Test that requests, storage work and booking conflicts show up on /metrics.
+    """
+    start = date.today() + timedelta(days=140)
+    car_id = client.get(f"/cars/available?target_date={start.isoformat()}").json()["data"][0]["id"]
+    booking = {
+        "car_id": car_id,
+        "customer_name": "Test User",
+        "customer_email": "test@example.com",
+        "start_date": start.isoformat(),
+        "end_date": start.isoformat()
+    }
+    assert client.post("/bookings/", json=booking).status_code == 200
+    assert client.post("/bookings/", json=booking).status_code == 400
+    client.get("/no-such-route")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/cars/available",status="200"}' in body
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in body
+    assert 'http_request_duration_seconds_bucket{method="POST",route="/bookings/",le="+Inf"}' in body
+    assert 'booking_attempts_total{outcome="conflict"}' in body
+    assert 'booking_attempts_total{outcome="created"}' in body
+    assert "storage_operations_total{" in body
+    assert 'availability_cache{stat="misses"}' in body
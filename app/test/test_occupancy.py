@@ -0,0 +1,43 @@
+from app.core.occupancy import compute_occupancy, free_day_bitmaps
+
+CARS = ["car-1", "car-2", "car-3"]
+INTERVALS = [
+    ("car-1", 8, 11),     # clipped to the window start
+    ("car-1", 12, 12),
+    ("car-1", 14, 15),
+    ("car-1", 15, 16),    # overlaps the previous booking of the same car
+    ("car-2", 13, 30),    # clipped to the window end
+    ("car-4", 10, 19),    # not one of the reported cars
+    ("car-3", 1, 5),      # outside the window
+]
+
+
+def test_occupancy_counts_each_car_once_per_day():
+    """
+    Test booked days per car and booked cars per day over a window of days 10 to 19.
+    """
+    result = compute_occupancy(CARS, INTERVALS, 10, 19)
+
+    assert result.first_day == 10
+    assert result.booked_days == [6, 7, 0]
+    assert result.booked_cars == [1, 1, 1, 1, 2, 2, 2, 1, 1, 1]
+    assert result.peak_days(2) == [4, 5]
+
+
+def test_occupancy_without_bookings():
+    """
+    Test that a window without bookings reports nothing booked.
+    """
+    result = compute_occupancy(CARS, [], 10, 12)
+
+    assert result.booked_days == [0, 0, 0]
+    assert result.booked_cars == [0, 0, 0]
+    assert result.peak_days(5) == [0, 1, 2]
+
+
+def test_free_day_bitmaps():
+    """
+    Test that each car's bitmap clears the days its bookings cover within the window.
+    """
+    assert free_day_bitmaps(CARS, INTERVALS, 10, 19) == ["0001000111", "1110000000", "1111111111"]
+    assert free_day_bitmaps(CARS, [], 10, 10) == ["1", "1", "1"]
@@ -0,0 +1,57 @@
+from datetime import date
+from uuid import uuid4
+from app.infra.records import BookingRecord, CarRecord
+
+
+def test_booking_record_round_trips_stored_shape():
+    """
+    Test that a booking converts to records and back to the dict stored on disk.
+    """
+    car_id = uuid4()
+    booking_id = uuid4()
+    record = BookingRecord.from_dict({
+        "car_id": car_id,
+        "customer_name": "Test User",
+        "customer_email": "test@example.com",
+        "start_date": date(2030, 1, 1),
+        "end_date": "2030-01-03",
+        "id": booking_id,
+        "created_at": "2029-12-01T10:00:00",
+        "note": "kept",
+    })
+
+    assert (record.start, record.end) == (date(2030, 1, 1).toordinal(), date(2030, 1, 3).toordinal())
+    assert record.to_dict() == {
+        "car_id": str(car_id),
+        "customer_name": "Test User",
+        "customer_email": "test@example.com",
+        "start_date": "2030-01-01",
+        "end_date": "2030-01-03",
+        "id": str(booking_id),
+        "created_at": "2029-12-01T10:00:00",
+        "note": "kept",
+    }
+
+
+def test_malformed_booking_dates_are_preserved():
+    """
+    Test that unparseable dates are kept as they were instead of being lost.
+    """
+    stored = {"car_id": "car-1", "customer_name": "A", "customer_email": "a@example.com",
+              "start_date": "not-a-date", "end_date": "2030-01-01", "id": "bad"}
+    record = BookingRecord.from_dict(stored)
+
+    assert record.start is None and record.end is None
+    assert record.to_dict() == stored
+
+
+def test_car_ids_are_shared_with_their_bookings():
+    """
+    Test that car ids are interned, so bookings reference the car's own id string.
+    """
+    car = CarRecord.from_dict({"id": uuid4(), "brand": "Toyota", "model": "Supra", "engine": "2JZ-GTE",
+                               "version": "MK4", "year": "1996", "status": "available"})
+    booking = BookingRecord.from_dict({"car_id": "".join(list(car.id)), "start_date": "2030-01-01",
+                                       "end_date": "2030-01-01", "id": "b1"})
+
+    assert booking.car_id is car.id
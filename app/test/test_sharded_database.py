@@ -0,0 +1,174 @@
+import json
+from datetime import date
+from uuid import uuid4
+import pytest
+from app.core.exceptions import InvalidCursorError
+from app.core.models.car_model import CarStatus
+from app.core.models.pagination import BookingFilters
+from app.infra.sharded_db import ShardedJSONDatabase, months_between
+
+
+def shard_ids(tmp_path, month):
+    path = tmp_path / "db" / "bookings" / f"{month}.json"
+    return [booking["id"] for booking in json.loads(path.read_text())["bookings"]]
+
+
+def test_months_between_crosses_years():
+    """
+    Test that month keys cover the whole range, across a year boundary.
+    """
+    assert months_between(date(2030, 11, 30).toordinal(), date(2031, 2, 1).toordinal()) == [
+        "2030-11", "2030-12", "2031-01", "2031-02"
+    ]
+
+
+def test_bookings_are_written_to_the_shards_they_span(tmp_path, make_booking):
+    """
+    Test that a write only touches the months of its booking, and that a booking
+    spanning two months is found from either of them.
+    """
+    db = ShardedJSONDatabase(str(tmp_path / "db.json"))
+    car_id = db.get_all_cars()[0]["id"]
+    january = make_booking(car_id, date(2030, 1, 10), date(2030, 1, 12))
+    spanning = make_booking(car_id, date(2030, 1, 30), date(2030, 2, 2))
+    db.add_booking(january)
+    db.add_booking(spanning)
+
+    assert shard_ids(tmp_path, "2030-01") == [january["id"], spanning["id"]]
+    assert shard_ids(tmp_path, "2030-02") == [spanning["id"]]
+    assert sorted(path.name for path in (tmp_path / "db" / "bookings").glob("*.json")) == [
+        "2030-01.json", "2030-02.json"
+    ]
+
+    reopened = ShardedJSONDatabase(str(tmp_path / "db.json"))
+    assert reopened.find_overlapping_booking(car_id, date(2030, 2, 1), date(2030, 2, 5))["id"] == spanning["id"]
+    assert reopened.get_booked_car_ids(date(2030, 2, 2), date(2030, 2, 2)) == {car_id}
+    assert reopened.get_booked_car_ids(date(2030, 2, 3), date(2035, 1, 1)) == set()
+    assert [b["id"] for b in reopened.get_all_bookings()] == [january["id"], spanning["id"]]
+    assert reopened.get_booking_by_id(spanning["id"])["end_date"] == "2030-02-02"
+    assert reopened.get_car_intervals(car_id, date(2030, 1, 1), date(2030, 2, 28)) == [
+        (date(2030, 1, 10).toordinal(), date(2030, 1, 12).toordinal()),
+        (date(2030, 1, 30).toordinal(), date(2030, 2, 2).toordinal()),
+    ]
+
+
+def test_listing_visits_each_booking_once(tmp_path, make_booking):
+    """
+    Test that pages of a window listing neither skip nor repeat bookings spanning shards.
+    """
+    db = ShardedJSONDatabase(str(tmp_path / "db.json"))
+    car_ids = [car["id"] for car in db.get_all_cars()[:3]]
+    bookings = [
+        make_booking(car_ids[0], date(2030, 1, 28), date(2030, 2, 3)),
+        make_booking(car_ids[1], date(2030, 2, 10), date(2030, 2, 10)),
+        make_booking(car_ids[2], date(2030, 2, 27), date(2030, 3, 2)),
+        make_booking(car_ids[0], date(2030, 3, 5), date(2030, 3, 6)),
+    ]
+    db.add_bookings(bookings)
+    window = BookingFilters(start_date=date(2030, 2, 1), end_date=date(2030, 3, 31))
+
+    listed, after = [], None
+    while True:
+        page = db.find_bookings(window, after, 1)
+        if not page:
+            break
+        listed += [booking["id"] for booking in page]
+        after = page[-1]["id"]
+
+    assert listed == [booking["id"] for booking in bookings]
+    assert [b["id"] for b in db.find_bookings(BookingFilters(car_id=car_ids[0]), None, 10)] == [
+        bookings[0]["id"], bookings[3]["id"]
+    ]
+    with pytest.raises(InvalidCursorError):
+        db.find_bookings(window, str(uuid4()), 10)
+
+
+def test_archiving_and_versions(tmp_path, make_booking):
+    """
+    Test that expired bookings leave their shards, and that every write bumps the version.
+    """
+    db = ShardedJSONDatabase(str(tmp_path / "db.json"))
+    car_id = db.get_all_cars()[0]["id"]
+    version = db.data_version()
+    past = make_booking(car_id, date(2020, 1, 30), date(2020, 2, 1))
+    db.add_booking(past)
+    db.set_status_car(car_id, CarStatus.RESERVED)
+    assert db.data_version() == version + 2
+
+    assert db.archive_bookings(date.today()) == 1
+    assert db.get_all_bookings() == []
+    assert not (tmp_path / "db" / "bookings" / "2020-01.json").exists()
+    assert [b["id"] for b in db.get_archived_bookings()] == [past["id"]]
+    assert db.get_booking_by_id(past["id"])["id"] == past["id"]
+    assert db.get_booking_intervals(date(2020, 2, 1), date(2020, 2, 5)) == [
+        (car_id, date(2020, 1, 30).toordinal(), date(2020, 2, 1).toordinal())
+    ]
+    assert db.get_car_intervals(car_id, date(2020, 1, 1), date(2020, 3, 1)) == [
+        (date(2020, 1, 30).toordinal(), date(2020, 2, 1).toordinal())
+    ]
+    assert db.data_version() == version + 3
+
+
+def test_booking_lookup_by_id_reads_one_shard(tmp_path, make_booking):
+    """
+    Test that looking a booking up by id opens only its shard once the id index is
+    built, and that bookings written by another worker are found.
+    """
+    db = ShardedJSONDatabase(str(tmp_path / "db.json"))
+    car_id = db.get_all_cars()[0]["id"]
+    bookings = [make_booking(car_id, date(2030, month, 1), date(2030, month, 2)) for month in range(1, 7)]
+    db.add_bookings(bookings)
+    reader = ShardedJSONDatabase(str(tmp_path / "db.json"))
+    assert reader.get_booking_by_id(bookings[0]["id"])["id"] == bookings[0]["id"]
+
+    later = make_booking(car_id, date(2030, 3, 10), date(2030, 3, 11))
+    db.add_booking(later)
+    read_shard = reader._read_shard
+    read = []
+
+    def recording_read_shard(shard):
+        read.append(shard.month)
+        return read_shard(shard)
+
+    reader._read_shard = recording_read_shard
+
+    assert reader.get_booking_by_id(bookings[4]["id"])["id"] == bookings[4]["id"]
+    assert read == []
+    assert reader.get_booking_by_id(later["id"])["id"] == later["id"]
+    assert read == ["2030-03"]
+    assert reader.get_booking_by_id(uuid4()) is None
+
+
+def test_write_interrupted_between_shards_is_completed(tmp_path, make_booking):
+    """
+    Test that a booking left in only some of its months by a failed write is completed
+    before the next write checks for conflicts, and on startup.
+    """
+    db = ShardedJSONDatabase(str(tmp_path / "db.json"))
+    car_ids = [car["id"] for car in db.get_all_cars()[:2]]
+    write_shard = db._write_shard
+
+    def failing_write_shard(shard, bookings):
+        if shard.month == "2030-02":
+            raise OSError("disk full")
+        write_shard(shard, bookings)
+
+    def add_interrupted(car_id):
+        booking = make_booking(car_id, date(2030, 1, 30), date(2030, 2, 1))
+        db._write_shard = failing_write_shard
+        with pytest.raises(OSError):
+            db.add_booking(booking)
+        db._write_shard = write_shard
+        assert db.find_overlapping_booking(car_id, date(2030, 2, 1), date(2030, 2, 1)) is None
+        return booking["id"]
+
+    first = add_interrupted(car_ids[0])
+    with db.lock_cars([car_ids[0]]):
+        assert db.find_overlapping_booking(car_ids[0], date(2030, 2, 1), date(2030, 2, 1))["id"] == first
+
+    second = add_interrupted(car_ids[1])
+    reopened = ShardedJSONDatabase(str(tmp_path / "db.json"))
+
+    assert reopened.find_overlapping_booking(car_ids[1], date(2030, 2, 1), date(2030, 2, 1))["id"] == second
+    assert shard_ids(tmp_path, "2030-01") == shard_ids(tmp_path, "2030-02") == [first, second]
+    assert list((tmp_path / "db" / "pending").iterdir()) == []
@@ -0,0 +1,180 @@
+from uuid import uuid4
+from datetime import date, timedelta
+import pytest
+from app.core.exceptions import InvalidCursorError
+from app.core.models.car_model import CarStatus
+from app.core.models.pagination import BookingFilters, CarFilters
+from app.core.repositories.sqlite_repositories import SQLiteCarRepository, SQLiteBookingRepository
+from app.infra.db import JSONDatabase
+from app.infra.journal_db import JournalJSONDatabase
+from app.infra.migrate_json_to_sqlite import migrate
+from app.infra.sqlite_db import SQLiteDatabase
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    db = SQLiteDatabase(str(tmp_path / "db.sqlite3"), pool_size=2)
+    yield db
+    db.close()
+
+
+def test_new_database_is_seeded_in_wal_mode(sqlite_db):
+    """
+    Test that a new SQLite database starts with the default fleet in WAL mode.
+    """
+    cars = SQLiteCarRepository(sqlite_db).get_all()
+
+    assert len(cars) == 12
+    with sqlite_db.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_car_status_updates(sqlite_db):
+    """
+    Test car lookups and status updates.
+    """
+    repo = SQLiteCarRepository(sqlite_db)
+    car_id = repo.get_all()[0]["id"]
+
+    repo.update_status(car_id, CarStatus.MAINTENANCE)
+
+    assert repo.get_by_id(car_id)["status"] == "maintenance"
+    assert repo.get_by_id(uuid4()) is None
+
+
+def test_booking_queries(sqlite_db, make_booking):
+    """
+    Test the date and car queries used by the use cases.
+    """
+    car_id = SQLiteCarRepository(sqlite_db).get_all()[0]["id"]
+    repo = SQLiteBookingRepository(sqlite_db)
+    start = date.today() + timedelta(days=10)
+    booking = make_booking(car_id, start, start + timedelta(days=2))
+    repo.create_many([booking])
+
+    assert [b["id"] for b in repo.get_all()] == [str(booking["id"])]
+    assert len(repo.get_by_car_id(car_id)) == 1
+    assert len(repo.get_by_date(start + timedelta(days=2))) == 1
+    assert repo.get_by_date(start + timedelta(days=3)) == []
+    assert repo.get_booked_car_ids(start - timedelta(days=5), start) == {car_id}
+    assert repo.find_overlapping(car_id, start + timedelta(days=2), start + timedelta(days=4)) is not None
+    assert repo.find_overlapping(car_id, start + timedelta(days=3), start + timedelta(days=4)) is None
+
+
+def test_archive_expired_bookings(sqlite_db, make_booking):
+    """
+    Test that expired bookings move to the archive table and out of the active queries.
+    """
+    car_id = SQLiteCarRepository(sqlite_db).get_all()[0]["id"]
+    repo = SQLiteBookingRepository(sqlite_db)
+    past = make_booking(car_id, date(2020, 1, 1), date(2020, 1, 3))
+    current = make_booking(car_id, date.today(), date.today())
+    repo.create_many([past, current])
+    version = sqlite_db.data_version()
+
+    assert repo.archive_expired(date.today()) == 1
+    assert repo.archive_expired(date.today()) == 0
+    assert sqlite_db.data_version() == version + 1
+
+    assert [b["id"] for b in repo.get_all()] == [str(current["id"])]
+    assert repo.get_booked_car_ids(date(2020, 1, 1), date(2020, 1, 3)) == set()
+    assert [b["id"] for b in repo.find_archived(BookingFilters(car_id=car_id), None, 10)] == [str(past["id"])]
+    assert [b["id"] for b in repo.get_archived()] == [str(past["id"])]
+    assert repo.get_booking_intervals(date(2019, 12, 1), date.today()) == [
+        (car_id, date.today().toordinal(), date.today().toordinal()),
+        (car_id, date(2020, 1, 1).toordinal(), date(2020, 1, 3).toordinal()),
+    ]
+    assert repo.get_car_intervals(car_id, date(2019, 12, 1), date.today()) == [
+        (date(2020, 1, 1).toordinal(), date(2020, 1, 3).toordinal()),
+        (date.today().toordinal(), date.today().toordinal()),
+    ]
+
+
+def test_writes_bump_data_version(sqlite_db, make_booking):
+    """
+    Test that each write transaction increases the data version.
+    """
+    car_repo = SQLiteCarRepository(sqlite_db)
+    car_id = car_repo.get_all()[0]["id"]
+    version = car_repo.data_version()
+
+    car_repo.update_status(car_id, CarStatus.RESERVED)
+    SQLiteBookingRepository(sqlite_db).create(make_booking(car_id, date.today(), date.today()))
+
+    assert car_repo.data_version() == version + 2
+
+
+def test_find_pages_with_filters(sqlite_db, make_booking):
+    """
+    Test keyset pagination and filters over cars and bookings.
+    """
+    car_repo = SQLiteCarRepository(sqlite_db)
+    cars = car_repo.get_all()
+    first_page = car_repo.find(CarFilters(), None, 5)
+    second_page = car_repo.find(CarFilters(), first_page[-1]["id"], 5)
+    assert [c["id"] for c in first_page + second_page] == [c["id"] for c in cars[:10]]
+
+    year = cars[0]["year"]
+    by_year = car_repo.find(CarFilters(year=year, status=CarStatus(cars[0]["status"])), None, 100)
+    assert by_year and all(c["year"] == year for c in by_year)
+
+    car_id = cars[0]["id"]
+    repo = SQLiteBookingRepository(sqlite_db)
+    start = date.today() + timedelta(days=10)
+    bookings = [make_booking(car_id, start + timedelta(days=3 * i), start + timedelta(days=3 * i + 1)) for i in range(3)]
+    repo.create_many(bookings)
+
+    window = BookingFilters(car_id=car_id, start_date=start + timedelta(days=1), end_date=start + timedelta(days=3))
+    assert [b["id"] for b in repo.find(window, None, 10)] == [str(b["id"]) for b in bookings[:2]]
+    assert [b["id"] for b in repo.find(window, str(bookings[0]["id"]), 10)] == [str(bookings[1]["id"])]
+    with pytest.raises(InvalidCursorError):
+        repo.find(BookingFilters(), str(uuid4()), 10)
+
+
+def test_migrate_json_database(tmp_path, make_booking):
+    """
+    Test that the migration imports cars and bookings and can be re-run.
+    """
+    json_db = JSONDatabase(str(tmp_path / "db.json"))
+    car_id = json_db.get_all_cars()[0]["id"]
+    start = date.today() + timedelta(days=1)
+    json_db.add_booking(make_booking(car_id, start, start))
+
+    assert migrate(str(tmp_path / "db.json"), str(tmp_path / "db.sqlite3")) == (12, 1, 0)
+    migrate(str(tmp_path / "db.json"), str(tmp_path / "db.sqlite3"))
+
+    db = SQLiteDatabase(str(tmp_path / "db.sqlite3"))
+    try:
+        assert len(SQLiteCarRepository(db).get_all()) == 12
+        assert SQLiteBookingRepository(db).get_all()[0]["car_id"] == car_id
+    finally:
+        db.close()
+
+
+def test_migrate_reads_the_source_without_changing_it(tmp_path, make_booking):
+    """
+    Test that the migration replays the journal read-only and skips bookings without dates.
+    """
+    json_db = JournalJSONDatabase(str(tmp_path / "db.json"))
+    car_id = json_db.get_all_cars()[0]["id"]
+    start = date.today() + timedelta(days=1)
+    json_db.add_booking(make_booking(car_id, start, start))
+    json_db.add_booking({**make_booking(car_id, start, start), "start_date": "not a date"})
+    json_db.set_status_car(car_id, CarStatus.RESERVED)
+    with open(json_db.journal_path, "ab") as file:
+        file.write(b'{"seq": 99, "op": "add_bo')
+    before = {path.name: path.read_bytes() for path in tmp_path.iterdir() if path.is_file()}
+
+    cars, bookings, skipped = migrate(str(tmp_path / "db.json"), str(tmp_path / "db.sqlite3"))
+
+    assert (cars, bookings, skipped) == (12, 1, 1)
+    after = {
+        path.name: path.read_bytes()
+        for path in tmp_path.iterdir() if path.is_file() and not path.name.startswith("db.sqlite3")
+    }
+    assert after == before
+    db = SQLiteDatabase(str(tmp_path / "db.sqlite3"))
+    try:
+        assert SQLiteCarRepository(db).get_by_id(car_id)["status"] == CarStatus.RESERVED
+    finally:
+        db.close()